@@ -0,0 +1,202 @@
+"""
+Requests/second and memory per concurrent connection: the DRF views behind a
+threaded WSGI server (gunicorn --threads N), the same views behind an ASGI
+server, and the async views of /api/async/tasks/ behind an ASGI server.
+
+    python -m benchmarks.asgi_vs_wsgi --requests 2000 --concurrency 1 10 50
+
+The Django handlers are driven in-process, so the numbers leave out the
+server's socket and HTTP parsing work. WSGI requests run on a pool of
+`concurrency` threads, ASGI requests as `concurrency` tasks on one event loop.
+Memory per connection is the tracemalloc peak of a burst of `concurrency`
+simultaneous requests, divided by `concurrency`; thread stacks are not
+included (each WSGI thread reserves one, resident only as far as it is used).
+
+The task list cache is disabled, so every list request reads the database.
+Under ASGI, Django runs the sync parts of each request on a thread of its own;
+connections are not reused across requests there (CONN_MAX_AGE = 0), as
+Django recommends for async deployments.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from .harness import print_table, setup_django, summarize, test_database
+
+CASES = {
+    "detail": ("/api/tasks/{id}/", "/api/async/tasks/{id}/"),
+    "list": ("/api/tasks/", "/api/async/tasks/"),
+}
+
+
+class WSGIDeployment:
+    def __init__(self, path, token):
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.test import RequestFactory
+
+        self.handler = WSGIHandler()
+        self.environ = RequestFactory().get(path, HTTP_AUTHORIZATION=f"Bearer {token}").environ
+
+    def request(self):
+        start = time.perf_counter()
+        response = self.handler(dict(self.environ), lambda status, headers: None)
+        response.close()  # fires request_finished, which closes or keeps the connection
+        elapsed = (time.perf_counter() - start) * 1000
+        assert response.status_code == 200, response.status_code
+        return elapsed
+
+    def run(self, total, concurrency):
+        from django.db import connections
+
+        def worker(count):
+            try:
+                return [self.request() for _ in range(count)]
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            return sum(executor.map(worker, [total // concurrency] * concurrency), [])
+
+    def burst(self, concurrency):
+        from django.db import connections
+
+        def request(_):
+            try:
+                return self.request()
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(request, range(concurrency)))
+
+
+class ASGIDeployment:
+    def __init__(self, path, token):
+        from django.core.handlers.asgi import ASGIHandler
+
+        self.handler = ASGIHandler()
+        self.scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+    async def request(self):
+        status = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        start = time.perf_counter()
+        await self.handler(dict(self.scope), receive, send)
+        elapsed = (time.perf_counter() - start) * 1000
+        assert status == [200], status
+        return elapsed
+
+    def run(self, total, concurrency):
+        async def worker(count):
+            return [await self.request() for _ in range(count)]
+
+        async def main():
+            return await asyncio.gather(*(worker(total // concurrency) for _ in range(concurrency)))
+
+        return sum(asyncio.run(main()), [])
+
+    def burst(self, concurrency):
+        async def main():
+            await asyncio.gather(*(self.request() for _ in range(concurrency)))
+
+        asyncio.run(main())
+
+
+def measure(deployment, total, concurrency):
+    deployment.run(concurrency * 5, concurrency)  # warm up
+    started = time.perf_counter()
+    samples = deployment.run(total, concurrency)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        deployment.burst(concurrency)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return len(samples) / elapsed, peak / concurrency / 1024, summarize(samples)
+
+
+def run(total, concurrencies, cases):
+    from django.conf import settings
+    from django.db import connections
+    from django.test import override_settings
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from tasks.models import Task
+
+    from .factories import seed
+
+    _, user_ids = seed(users=3, tasks=3000)
+    task = Task.objects.filter(user_id=user_ids[0]).first()
+    token = str(RefreshToken.for_user(task.user).access_token)
+    connections["default"].close()
+
+    settings_dict = connections.settings["default"]
+    persistent = settings_dict["CONN_MAX_AGE"]
+    caches = {**settings.CACHES, "tasks": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    with override_settings(CACHES=caches):
+        for case in cases:
+            sync_path, async_path = (path.format(id=task.id) for path in CASES[case])
+            deployments = [
+                ("WSGI, DRF views", WSGIDeployment, sync_path, persistent),
+                ("ASGI, DRF views", ASGIDeployment, sync_path, 0),
+                ("ASGI, async views", ASGIDeployment, async_path, 0),
+            ]
+            rows = []
+            for concurrency in concurrencies:
+                for label, deployment, path, max_age in deployments:
+                    settings_dict["CONN_MAX_AGE"] = max_age
+                    rate, per_connection, stats = measure(deployment(path, token), total, concurrency)
+                    rows.append((f"{label} x{concurrency}: {rate:.0f} req/s, {per_connection:.0f} KiB/conn", stats))
+            settings_dict["CONN_MAX_AGE"] = persistent
+            print_table(f"GET {sync_path} vs {async_path}", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--case", choices=CASES, nargs="+", default=list(CASES))
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connections
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_dict = connections.settings["default"]
+        if settings_dict["ENGINE"] == "django.db.backends.sqlite3":
+            # Shared by the request threads; in-memory databases are per connection.
+            settings_dict["TEST"]["NAME"] = os.path.join(tmp, "bench.sqlite3")
+        with test_database():
+            run(args.requests, args.concurrency, args.case)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Per-request cost of opening database connections: a connection per request
+(CONN_MAX_AGE = 0, the previous settings), persistent connections
+(CONN_MAX_AGE > 0 with health checks) and, on PostgreSQL, the pooled backend.
+
+    python -m benchmarks.db_connections --requests 2000 --threads 4
+
+Requests go through Django's WSGI handler, so connections are closed (or
+kept) at the end of each request exactly as under a real server. On SQLite
+the test database is a temporary file, since in-memory databases are never
+closed.
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .harness import print_table, setup_django, summarize, test_database
+
+
+def modes(vendor, options):
+    yield "new connection per request", {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False}
+    yield "persistent, health checks", {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True}
+    if vendor == "postgresql":
+        yield "pooled (4 connections)", {
+            "ENGINE": "task_management.pooled_postgresql",
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {**options, "pool": {"max_size": 4, "timeout": 10}},
+        }
+
+
+def run(total, threads):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from django.contrib.auth import get_user_model
+    from django.test import RequestFactory
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from tasks.models import Task
+
+    User = get_user_model()
+    user = User.objects.create_user(username="bench-user", password="x", role="USER")
+    task = Task.objects.create(user=user, title="Bench", description="d", due_date="2030-01-01")
+    token = str(RefreshToken.for_user(user).access_token)
+    environ = RequestFactory().get(f"/api/tasks/{task.id}/", HTTP_AUTHORIZATION=f"Bearer {token}").environ
+    handler = WSGIHandler()
+    connections["default"].close()
+
+    opened = []
+    connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+
+    def request():
+        start = time.perf_counter()
+        response = handler(dict(environ), lambda status, headers: None)
+        response.close()  # fires request_finished, which closes or keeps the connection
+        elapsed = (time.perf_counter() - start) * 1000
+        assert response.status_code == 200, response.status_code
+        return elapsed
+
+    def worker(count):
+        try:
+            return [request() for _ in range(count)]
+        finally:
+            connections.close_all()
+
+    settings_dict = connections.settings["default"]
+    original = {key: settings_dict.get(key) for key in ("ENGINE", "CONN_MAX_AGE", "CONN_HEALTH_CHECKS", "OPTIONS")}
+    rows = []
+    for label, overrides in modes(connections["default"].vendor, original["OPTIONS"]):
+        settings_dict.update(overrides)
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(worker, [5] * threads))  # warm up
+            opened.clear()
+            started = time.perf_counter()
+            samples = sum(executor.map(worker, [total // threads] * threads), [])
+            elapsed = time.perf_counter() - started
+            if "pool" in settings_dict["OPTIONS"]:
+                executor.submit(lambda: connections["default"].close_pool()).result()
+        settings_dict.update(original)
+        rows.append((f"{label}: {len(opened)} conns, {len(samples) / elapsed:.0f} req/s", summarize(samples)))
+    print_table(f"GET /api/tasks/<id>/, {threads} threads", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connections
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_dict = connections.settings["default"]
+        if settings_dict["ENGINE"] == "django.db.backends.sqlite3":
+            settings_dict["TEST"]["NAME"] = os.path.join(tmp, "bench.sqlite3")
+        with test_database():
+            run(args.requests, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Query count, latency (p50/p95/p99) and peak memory for every API route.
+
+    python -m benchmarks.endpoints --users 10000 --tasks 1000000 --output results.json
+    python -m benchmarks.endpoints --save-baseline     # rewrite benchmarks/baseline.json
+    pytest --benchmark tests/test_benchmarks.py        # fail on regressions against it
+
+Requests go through the test client with real JWTs, so middleware,
+authentication and rendering are included. Query counts leave out
+transaction control (BEGIN, SAVEPOINT...), which differs between backends.
+Peak memory is measured by tracemalloc on a separate call, so it does not
+slow down the timed ones.
+"""
+import argparse
+import itertools
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from .harness import setup_django, summarize, test_database
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# Allowed growth over the baseline, as a fraction of it plus an absolute slack
+# (ms or KiB) so that sub-millisecond endpoints don't fail on jitter.
+TOLERANCE = {"p50": 0.5, "p95": 1.0, "peak_kib": 0.5}
+SLACK = {"p50": 1.0, "p95": 3.0, "peak_kib": 64}
+
+TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK", "COMMIT")
+
+# Routes with a benchmark of their own: a task event stream never returns (benchmarks/task_events.py).
+BENCHMARKED_ELSEWHERE = {"async-task-events"}
+
+
+@dataclass
+class Endpoint:
+    name: str
+    route: str
+    method: str
+    path: Callable
+    data: Optional[Callable] = None
+    client: str = "user"  # "user", "admin", "anonymous" or "session"
+    status: int = 200
+    prepare: Optional[Callable] = None  # Runs before every call, outside the measurement.
+    format: str = "json"
+
+
+class Fixture:
+    """The users, tokens and rows the endpoints run against."""
+
+    def __init__(self, admin_ids, user_ids):
+        from django.contrib.auth import get_user_model
+        from rest_framework.test import APIClient
+        from tasks.models import Task
+        from users.serializers import CustomTokenObtainPairSerializer
+
+        User = get_user_model()
+        self.admin = User.objects.get(id=admin_ids[0])
+        # The first user owns a typical share of the tasks; two more serve as assignees.
+        self.user, self.assignee, self.other = User.objects.filter(id__in=user_ids[:3]).order_by("id")
+        self.task_id = Task.objects.filter(user_id=self.user.id).values_list("id", flat=True).first()
+        self.refresh = str(CustomTokenObtainPairSerializer.get_token(self.user))
+        self.counter = itertools.count()
+
+        self.clients = {"anonymous": APIClient(), "session": APIClient()}
+        self.clients["session"].force_login(self.admin)
+        for name, user in (("user", self.user), ("admin", self.admin)):
+            client = APIClient()
+            token = CustomTokenObtainPairSerializer.get_token(user).access_token
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            self.clients[name] = client
+
+    def payload(self):
+        return {"title": f"Benchmark {next(self.counter)}", "description": "Created by the benchmark", "due_date": "2030-01-01"}
+
+    def create_tasks(self, count, owner=None):
+        from tasks.models import Task
+
+        owner = owner or self.user
+        tasks = Task.objects.bulk_create(Task(user_id=owner.id, **self.payload()) for _ in range(count))
+        return [task.id for task in tasks]
+
+    def own_task_ids(self, count):
+        from tasks.models import Task
+
+        return list(Task.objects.filter(user_id=self.user.id).values_list("id", flat=True)[:count])
+
+
+def import_file(fixture, rows=50):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    lines = "".join(json.dumps(fixture.payload()) + "\n" for _ in range(rows))
+    return {"file": SimpleUploadedFile("tasks.ndjson", lines.encode())}
+
+
+def clear_list_cache(fixture):
+    from tasks.cache import task_list_cache
+
+    task_list_cache.backend.clear()
+
+
+def caught_up_cursor(fixture):
+    """A changes cursor as a client that polled a moment ago holds it."""
+    import datetime
+
+    from django.conf import settings
+    from django.utils import timezone
+    from tasks.changes import encode_cursor
+
+    position = timezone.now() - datetime.timedelta(seconds=settings.TASK_CHANGES_SETTLE_SECONDS), 0
+    return encode_cursor(position, position)
+
+
+ENDPOINTS = [
+    Endpoint("GET /api/tasks/", "task-list-create", "get", lambda f, t: "/api/tasks/", prepare=clear_list_cache),
+    Endpoint("GET /api/tasks/ (cached)", "task-list-create", "get", lambda f, t: "/api/tasks/"),
+    Endpoint(
+        "GET /api/tasks/?status&ordering&fields", "task-list-create", "get",
+        lambda f, t: "/api/tasks/?status=PENDING,IN_PROGRESS&ordering=-due_date&fields=id,title,due_date",
+        prepare=clear_list_cache,
+    ),
+    Endpoint("GET /api/tasks/ as ADMIN", "task-list-create", "get", lambda f, t: "/api/tasks/",
+             client="admin", prepare=clear_list_cache),
+    Endpoint("POST /api/tasks/", "task-list-create", "post", lambda f, t: "/api/tasks/",
+             data=lambda f, t: f.payload(), status=201),
+    Endpoint("GET /api/tasks/<id>/", "task-detail", "get", lambda f, t: f"/api/tasks/{f.task_id}/"),
+    Endpoint("PUT /api/tasks/<id>/", "task-detail", "put", lambda f, t: f"/api/tasks/{f.task_id}/",
+             data=lambda f, t: f.payload()),
+    Endpoint("PATCH /api/tasks/<id>/", "task-detail", "patch", lambda f, t: f"/api/tasks/{f.task_id}/",
+             data=lambda f, t: {"status": "IN_PROGRESS"}),
+    Endpoint("DELETE /api/tasks/<id>/", "task-detail", "delete", lambda f, t: f"/api/tasks/{t[0]}/",
+             status=204, prepare=lambda f: f.create_tasks(1)),
+    Endpoint("PATCH /api/tasks/<id>/assign/", "assign-task", "patch", lambda f, t: f"/api/tasks/{t[0]}/assign/",
+             data=lambda f, t: {"username": f.assignee.username}, client="admin",
+             prepare=lambda f: f.create_tasks(1, owner=f.other)),
+    Endpoint("GET /api/tasks/export/", "task-export", "get", lambda f, t: "/api/tasks/export/"),
+    Endpoint("GET /api/tasks/export/?type=csv as ADMIN", "task-export", "get",
+             lambda f, t: "/api/tasks/export/?type=csv", client="admin"),
+    Endpoint("GET /api/tasks/search/?q", "task-search", "get", lambda f, t: "/api/tasks/search/?q=production"),
+    Endpoint("GET /api/tasks/search/?q as ADMIN", "task-search", "get", lambda f, t: "/api/tasks/search/?q=production",
+             client="admin"),
+    Endpoint("GET /api/tasks/stats/", "task-stats", "get", lambda f, t: "/api/tasks/stats/"),
+    Endpoint("GET /api/tasks/stats/ as ADMIN", "task-stats", "get", lambda f, t: "/api/tasks/stats/", client="admin"),
+    Endpoint("GET /api/tasks/changes/ (first download)", "task-changes", "get", lambda f, t: "/api/tasks/changes/"),
+    Endpoint("GET /api/tasks/changes/?since (caught up)", "task-changes", "get",
+             lambda f, t: f"/api/tasks/changes/?since={t}", prepare=caught_up_cursor),
+    Endpoint("POST /api/tasks/bulk/ (50)", "task-bulk", "post", lambda f, t: "/api/tasks/bulk/",
+             data=lambda f, t: [f.payload() for _ in range(50)], status=201),
+    Endpoint("PATCH /api/tasks/bulk/ (50)", "task-bulk", "patch", lambda f, t: "/api/tasks/bulk/",
+             data=lambda f, t: [{"id": pk, "status": "PENDING"} for pk in t], prepare=lambda f: f.own_task_ids(50)),
+    Endpoint("DELETE /api/tasks/bulk/ (50)", "task-bulk", "delete", lambda f, t: "/api/tasks/bulk/",
+             data=lambda f, t: t, prepare=lambda f: f.create_tasks(50)),
+    Endpoint("POST /api/tasks/import/ (50)", "task-import", "post", lambda f, t: "/api/tasks/import/",
+             data=lambda f, t: import_file(f), format="multipart", status=201),
+    Endpoint("PATCH /api/tasks/assign/ (50)", "bulk-assign-tasks", "patch", lambda f, t: "/api/tasks/assign/",
+             data=lambda f, t: {"username": f.assignee.username, "task_ids": t}, client="admin",
+             prepare=lambda f: f.create_tasks(50, owner=f.other)),
+    Endpoint("GET /api/async/tasks/", "async-task-list-create", "get", lambda f, t: "/api/async/tasks/"),
+    Endpoint("POST /api/async/tasks/", "async-task-list-create", "post", lambda f, t: "/api/async/tasks/",
+             data=lambda f, t: f.payload(), status=201),
+    Endpoint("GET /api/async/tasks/<id>/", "async-task-detail", "get", lambda f, t: f"/api/async/tasks/{f.task_id}/"),
+    Endpoint("PATCH /api/async/tasks/<id>/", "async-task-detail", "patch",
+             lambda f, t: f"/api/async/tasks/{f.task_id}/", data=lambda f, t: {"status": "IN_PROGRESS"}),
+    Endpoint("DELETE /api/async/tasks/<id>/", "async-task-detail", "delete", lambda f, t: f"/api/async/tasks/{t[0]}/",
+             status=204, prepare=lambda f: f.create_tasks(1)),
+    Endpoint("PATCH /api/async/tasks/<id>/assign/", "async-assign-task", "patch",
+             lambda f, t: f"/api/async/tasks/{t[0]}/assign/", data=lambda f, t: {"username": f.assignee.username},
+             client="admin", prepare=lambda f: f.create_tasks(1, owner=f.other)),
+    Endpoint("POST /api/auth/register/", "register", "post", lambda f, t: "/api/auth/register/",
+             data=lambda f, t: {"username": f"bench-new-{next(f.counter)}", "password": "bench-pass", "email": ""},
+             client="anonymous", status=201),
+    Endpoint("POST /api/auth/login/", "token_obtain_pair", "post", lambda f, t: "/api/auth/login/",
+             data=lambda f, t: {"username": f.user.username, "password": "bench-pass"}, client="anonymous"),
+    Endpoint("POST /api/auth/token/refresh/", "token_refresh", "post", lambda f, t: "/api/auth/token/refresh/",
+             data=lambda f, t: {"refresh": f.refresh}, client="anonymous"),
+    Endpoint("GET /api/auth/admin-only/", "admin_only", "get", lambda f, t: "/api/auth/admin-only/", client="admin"),
+    Endpoint("GET /api/auth/admin-only/?role&task_count", "admin_only", "get",
+             lambda f, t: "/api/auth/admin-only/?role=USER&task_count=true", client="admin"),
+    Endpoint("GET /admin/", "admin:index", "get", lambda f, t: "/admin/", client="session"),
+]
+
+
+def api_routes():
+    """Names of every route under /api/ but BENCHMARKED_ELSEWHERE, which the suite must cover."""
+    from django.urls import URLPattern, URLResolver, get_resolver
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            path = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, path)
+            elif isinstance(pattern, URLPattern) and path.startswith("api/"):
+                yield pattern.name
+
+    return set(walk(get_resolver().url_patterns, "")) - BENCHMARKED_ELSEWHERE
+
+
+def data_queries(captured):
+    return [query for query in captured if query["sql"].split()[0].upper() not in TRANSACTION_CONTROL]
+
+
+def measure(endpoint, fixture, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    client = fixture.clients[endpoint.client]
+
+    def call():
+        target = endpoint.prepare(fixture) if endpoint.prepare else None
+        kwargs = {"format": endpoint.format}
+        if endpoint.data:
+            kwargs["data"] = endpoint.data(fixture, target)
+        path = endpoint.path(fixture, target)
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, endpoint.method)(path, **kwargs)
+            if response.streaming:
+                for _ in response.streaming_content:  # rows are read while the body is sent
+                    pass
+            elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code != endpoint.status:
+            raise AssertionError(f"{endpoint.name}: expected {endpoint.status}, got {response.status_code}")
+        return elapsed, len(data_queries(queries.captured_queries))
+
+    for _ in range(min(3, repeat)):
+        call()  # warm up
+    samples, counts = zip(*(call() for _ in range(repeat)))
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    stats = summarize(samples)
+    return {
+        "route": endpoint.route,
+        "queries": max(counts),
+        "p50": round(stats["p50"], 3),
+        "p95": round(stats["p95"], 3),
+        "p99": round(stats["p99"], 3),
+        "mean": round(stats["mean"], 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_suite(users, tasks, repeat, progress=None):
+    """Seed the current database and measure every endpoint."""
+    from django.conf import settings
+    from django.db import connection
+    from django.test import override_settings
+
+    from .factories import seed
+
+    admin_ids, user_ids = seed(max(users, 3), tasks, progress=progress)
+    fixture = Fixture(admin_ids, user_ids)
+    missing = api_routes() - {endpoint.route for endpoint in ENDPOINTS}
+    if missing:
+        raise AssertionError(f"Routes without a benchmark: {', '.join(sorted(missing))}")
+
+    # Every call comes from the same few clients: keep the throttles in the
+    # measured path, but with buckets they cannot empty. The token check reads
+    # the user row once per TOKEN_REVOCATION_CACHE_SECONDS; keep that read, one
+    # per user and period, out of the per-request query counts.
+    rates = {scope: "1000000/s" for scope in settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {})}
+    results = {}
+    with override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates},
+        TOKEN_REVOCATION_CACHE_SECONDS=3600,
+    ):
+        for endpoint in ENDPOINTS:
+            results[endpoint.name] = measure(endpoint, fixture, repeat)
+            if progress:
+                progress(f"{endpoint.name}: {results[endpoint.name]['p50']} ms")
+    return {
+        "config": {"users": users, "tasks": tasks, "repeat": repeat, "database": connection.vendor},
+        "endpoints": results,
+    }
+
+
+def compare(results, baseline, tolerance=1.0):
+    """
+    Regressions of `results` against `baseline`, as messages. Any extra query
+    counts; latency and memory may grow by TOLERANCE (scaled by `tolerance`)
+    plus SLACK, and are only compared when both ran on the same database.
+    """
+    problems = []
+    same_database = results["config"].get("database") == baseline["config"].get("database")
+    for name, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(name)
+        if current is None:
+            problems.append(f"{name}: no longer measured")
+            continue
+        if current["queries"] > base["queries"]:
+            problems.append(f"{name}: {current['queries']} queries (baseline {base['queries']})")
+        if not same_database:
+            continue
+        for metric, allowed in TOLERANCE.items():
+            limit = base[metric] * (1 + allowed * tolerance) + SLACK[metric]
+            if current[metric] > limit:
+                problems.append(f"{name}: {metric} {current[metric]} (baseline {base[metric]}, limit {limit:.1f})")
+    return problems
+
+
+def print_results(results):
+    config = results["config"]
+    print(f"\n{config['users']} users, {config['tasks']} tasks, {config['repeat']} calls each, {config['database']}")
+    print(f"{'endpoint':<42} {'queries':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak KiB':>9}")
+    for name, row in results["endpoints"].items():
+        print(f"{name:<42} {row['queries']:>7} {row['p50']:>8.2f} {row['p95']:>8.2f} {row['p99']:>8.2f} {row['peak_kib']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write the results to {BASELINE.name}.")
+    parser.add_argument("--compare", action="store_true", help=f"Exit non-zero on regressions against {BASELINE.name}.")
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        results = run_suite(args.users, args.tasks, args.repeat, progress=lambda message: print(f"  {message}"))
+    print_results(results)
+
+    for path in filter(None, (args.output, BASELINE if args.save_baseline else None)):
+        path.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Wrote {path}")
+    if args.compare:
+        problems = compare(results, json.loads(BASELINE.read_text()))
+        print("\n".join(problems) or "No regressions.")
+        raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+factory_boy factories for benchmark data.
+
+`seed()` builds rows in memory with the factories and writes them with
+bulk_create, which is what makes a million tasks feasible.
+"""
+import functools
+
+import factory
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from factory.django import DjangoModelFactory
+
+from tasks.models import Task, TaskStatus
+from tasks.stats import reconcile_counters
+from users.models import Role
+
+User = get_user_model()
+
+PASSWORD = "bench-pass"
+
+
+@functools.lru_cache(maxsize=None)
+def password_hash():
+    # Hashing once instead of per user keeps seeding fast; every user logs in with PASSWORD.
+    return make_password(PASSWORD)
+
+
+class UserFactory(DjangoModelFactory):
+    class Meta:
+        model = User
+
+    username = factory.Sequence(lambda n: f"bench-user-{n}")
+    email = factory.LazyAttribute(lambda user: f"{user.username}@example.com")
+    first_name = factory.Faker("first_name")
+    last_name = factory.Faker("last_name")
+    role = Role.USER
+    password = factory.LazyFunction(password_hash)
+
+
+class TaskFactory(DjangoModelFactory):
+    class Meta:
+        model = Task
+
+    user = factory.SubFactory(UserFactory)
+    title = factory.Faker("sentence", nb_words=5)
+    description = factory.Faker("paragraph", nb_sentences=3)
+    status = factory.Iterator(TaskStatus.values)
+    due_date = factory.Faker("date_between", start_date="-90d", end_date="+1y")
+
+
+def seed(users, tasks, admins=1, chunk=5000, progress=None):
+    """
+    Create `users` USERs, `admins` ADMINs and `tasks` tasks spread evenly
+    over the USERs. Returns (admin ids, user ids).
+    """
+    admin_users = User.objects.bulk_create(
+        UserFactory.build_batch(admins, role=Role.ADMIN, is_staff=True, is_superuser=True)
+    )
+    regular_users = []
+    for start in range(0, users, chunk):
+        regular_users += User.objects.bulk_create(UserFactory.build_batch(min(chunk, users - start)))
+    if progress:
+        progress(f"{len(admin_users) + len(regular_users)} users")
+
+    owners = factory.Iterator(regular_users or admin_users)
+    for start in range(0, tasks, chunk):
+        batch = TaskFactory.build_batch(min(chunk, tasks - start), user=owners)
+        Task.objects.bulk_create(batch)
+        if progress:
+            progress(f"{start + len(batch)} tasks")
+    reconcile_counters()  # bulk_create() does not go through the task statistics counters.
+    return [user.id for user in admin_users], [user.id for user in regular_users]
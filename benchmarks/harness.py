@@ -0,0 +1,64 @@
+"""
+Shared plumbing for the scripts in this package.
+
+Every benchmark runs against a throwaway test database created from the
+configured `DATABASES['default']`, so it never touches real data.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_management.settings")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment(debug=False)  # As in production, and as the test runner does.
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def timed(func, repeat):
+    """Call `func` `repeat` times and return the wall-clock samples in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    return {
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "mean": statistics.fmean(samples),
+    }
+
+
+def print_table(title, rows):
+    print(f"\n{title}")
+    print(f"{'case':<56} {'p50 ms':>10} {'p99 ms':>10} {'mean ms':>10}")
+    for name, stats in rows:
+        print(f"{name:<56} {stats['p50']:>10.2f} {stats['p99']:>10.2f} {stats['mean']:>10.2f}")
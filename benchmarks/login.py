@@ -0,0 +1,103 @@
+"""
+POST /api/auth/login/ under each password hashing profile, the first login
+after switching profiles (which rehashes), and POST /api/auth/token/refresh/
+with simplejwt's serializer against StatelessTokenRefreshSerializer.
+
+    python -m benchmarks.login --repeat 20
+
+Profiles whose library (argon2-cffi, bcrypt) is not installed are skipped.
+Throttles are lifted for the run.
+"""
+import argparse
+import importlib.util
+
+from .harness import print_table, setup_django, summarize, test_database, timed
+
+PROFILES = [
+    ("pbkdf2, 600 000 iterations", "pbkdf2", None, {"PASSWORD_PBKDF2_ITERATIONS": 600000}),
+    ("argon2id, 19 MiB, t=2, p=1", "argon2", "argon2", {}),
+    ("bcrypt, 12 rounds", "bcrypt", "bcrypt", {"PASSWORD_BCRYPT_ROUNDS": 12}),
+    ("bcrypt, 10 rounds", "bcrypt", "bcrypt", {"PASSWORD_BCRYPT_ROUNDS": 10}),
+]
+
+
+def hashers(profile):
+    from django.conf import settings
+
+    first = settings.PASSWORD_HASHER_PROFILES[profile]
+    return [first, *(path for path in settings.PASSWORD_HASHERS if path != first)]
+
+
+def run(repeat):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+    from django.db import connection
+    from django.test import override_settings
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient, APIRequestFactory
+    from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+    from rest_framework_simplejwt.views import TokenRefreshView
+    from users.serializers import StatelessTokenRefreshSerializer
+
+    User = get_user_model()
+    client = APIClient()
+    credentials = {"username": "bench-login", "password": "a long enough password"}
+    user = User.objects.create_user(**credentials, role="USER")
+    # What a password hashed before the profile was switched looks like.
+    legacy = make_password(credentials["password"], hasher=PBKDF2PasswordHasher())
+
+    def login():
+        response = client.post("/api/auth/login/", credentials, format="json")
+        assert response.status_code == 200, response.status_code
+        return response.data
+
+    rows = []
+    for label, profile, library, costs in PROFILES:
+        if library and not importlib.util.find_spec(library):
+            print(f"skipping {label}: {library} is not installed")
+            continue
+        with override_settings(PASSWORD_HASHERS=hashers(profile), **costs):
+            rehash = []
+            if profile != "pbkdf2":
+                for _ in range(max(3, repeat // 5)):
+                    User.objects.filter(pk=user.pk).update(password=legacy)
+                    rehash += timed(login, 1)
+            samples = timed(login, repeat)
+        stats = summarize(samples)
+        rows.append((f"login, {label}", stats))
+        if rehash:
+            rows.append(("  first login from a pbkdf2 hash (rehash)", summarize(rehash)))
+        print(f"{label}: {1000 / stats['p50']:.1f} logins/s per core")
+
+    refresh = login()["refresh"]
+    factory = APIRequestFactory()
+    for serializer in (TokenRefreshSerializer, StatelessTokenRefreshSerializer):
+        view = TokenRefreshView.as_view(serializer_class=serializer)
+
+        def call():
+            response = view(factory.post("/api/auth/token/refresh/", {"refresh": refresh}, format="json"))
+            assert response.status_code == 200, response.status_code
+
+        with CaptureQueriesContext(connection) as queries:
+            call()
+        rows.append((f"refresh, {serializer.__name__} ({len(queries)} queries)", summarize(timed(call, repeat * 10))))
+    print_table("Login and token refresh", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        from django.conf import settings
+        from django.test import override_settings
+
+        rates = {scope: None for scope in settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {})}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}):
+            run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
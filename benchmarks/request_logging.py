@@ -0,0 +1,108 @@
+"""
+Request latency with logging off, with the previous synchronous FileHandler
+setup, and with the queue-based setup from settings.LOGGING.
+
+    python -m benchmarks.request_logging --repeat 500
+
+Console handlers write to os.devnull so the terminal doesn't skew the numbers;
+log files go to a temporary directory.
+"""
+import argparse
+import copy
+import logging
+import logging.config
+import os
+import tempfile
+
+from .harness import print_table, setup_django, summarize, test_database, timed
+
+
+def synchronous_config(log_dir, devnull):
+    """The LOGGING setup this project used before the queue handlers."""
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {"verbose": {"format": "{levelname} {asctime} {module} {message}", "style": "{"}},
+        "handlers": {
+            "file_errors": {"level": "ERROR", "class": "logging.FileHandler",
+                            "filename": os.path.join(log_dir, "sync-errors.log"), "formatter": "verbose"},
+            "file_app": {"level": "INFO", "class": "logging.FileHandler",
+                         "filename": os.path.join(log_dir, "sync-app.log"), "formatter": "verbose"},
+            "console": {"level": "DEBUG", "class": "logging.StreamHandler", "stream": devnull, "formatter": "verbose"},
+        },
+        "loggers": {
+            "django": {"handlers": ["file_errors", "console"], "level": "ERROR"},
+            "tasks": {"handlers": ["file_app", "console"], "level": "DEBUG", "propagate": False},
+            "users": {"handlers": ["file_app", "console"], "level": "DEBUG", "propagate": False},
+        },
+    }
+
+
+def queue_config(log_dir, devnull):
+    from django.conf import settings
+
+    config = copy.deepcopy(settings.LOGGING)
+    config["handlers"]["file_errors"]["filename"] = os.path.join(log_dir, "queue-errors.log")
+    config["handlers"]["file_app"]["filename"] = os.path.join(log_dir, "queue-app.log")
+    config["handlers"]["console"]["stream"] = devnull
+    return config
+
+
+def reset_logging():
+    for name in ("django", "tasks", "users"):
+        for handler in logging.getLogger(name).handlers:
+            handler.flush()
+            handler.close()
+
+
+def run(repeat):
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+    from tasks.models import Task
+
+    User = get_user_model()
+    user = User.objects.create_user(username="bench-user", password="x", role="USER")
+    task = Task.objects.create(user=user, title="Bench", description="d", due_date="2030-01-01")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    payload = {"title": "Bench", "description": "d", "due_date": "2030-01-01"}
+
+    def update():
+        response = client.put(f"/api/tasks/{task.id}/", payload, format="json")
+        assert response.status_code == 200, response.status_code
+
+    def create():
+        response = client.post("/api/tasks/", payload, format="json")
+        assert response.status_code == 201, response.status_code
+
+    rows = []
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        for label, configure in (
+            ("logging off", None),
+            ("synchronous FileHandlers", synchronous_config),
+            ("queue handlers", queue_config),
+        ):
+            if configure is None:
+                logging.disable(logging.CRITICAL)
+            else:
+                logging.disable(logging.NOTSET)
+                logging.config.dictConfig(configure(log_dir, devnull))
+            for name, call in (("PUT", update), ("POST", create)):
+                timed(call, 20)  # warm up
+                rows.append((f"{name}, {label}", summarize(timed(call, repeat))))
+            reset_logging()
+    print_table("Request latency by logging setup", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
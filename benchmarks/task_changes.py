@@ -0,0 +1,118 @@
+"""
+What a client polling for changes pays: downloading the whole task list
+again against GET /api/tasks/changes/ with the cursor from its last poll.
+
+    python -m benchmarks.task_changes --tasks 1000000 --repeat 20
+
+One user owns --own tasks among --tasks. Between two polls, --edits of their
+tasks are updated and --deletes deleted. Response sizes are the JSON bodies.
+Throttles are lifted and the settle delay is set to 0 for the run.
+"""
+import argparse
+import datetime
+
+from .harness import print_table, setup_django, summarize, test_database, timed
+
+USERS = 100
+
+
+def add_tasks(owners, count, chunk=10000):
+    from tasks.models import Task
+
+    for start in range(0, count, chunk):
+        Task.objects.bulk_create(
+            Task(user=owners[i % len(owners)], title=f"Task {i}", description="Seeded by the benchmark",
+                 due_date=datetime.date(2030, 1, 1))
+            for i in range(start, min(start + chunk, count))
+        )
+
+
+def download(client, page_size=500):
+    """Every page of /api/tasks/, past the list cache; returns the bytes received."""
+    from tasks.cache import task_list_cache
+
+    task_list_cache.backend.clear()
+    size, url = 0, f"/api/tasks/?page_size={page_size}"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+        size += len(response.content)
+        link = response.headers.get("Link", "")
+        url = next((part.split(";")[0][1:-1] for part in link.split(", ") if 'rel="next"' in part), None)
+    return size
+
+
+def poll(client, cursor):
+    response = client.get("/api/tasks/changes/", {"since": cursor, "page_size": 500})
+    assert response.status_code == 200, response.status_code
+    return response
+
+
+def run(count, own, edits, deletes, repeat):
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+    from tasks.models import Task
+
+    User = get_user_model()
+    owners = User.objects.bulk_create(User(username=f"bench-owner-{i}", role="USER") for i in range(USERS))
+    user = User.objects.create_user(username="bench-syncer", password="x", role="USER")
+    admin = User.objects.create_user(username="bench-sync-admin", password="x", role="ADMIN")
+    add_tasks(owners, count - own)
+    add_tasks([user], own)
+    clients = {}
+    for name, owner in (("user", user), ("admin", admin)):
+        clients[name] = APIClient()
+        clients[name].force_authenticate(user=owner)
+    client = clients["user"]
+
+    rows = []
+    size = download(client)
+    rows.append((f"full download, {own} tasks ({size // 1024} KiB)", summarize(timed(lambda: download(client), max(3, repeat // 5)))))
+
+    cursor = client.get("/api/tasks/changes/", {"page_size": 1}).data["cursor"]
+    while True:
+        data = poll(client, cursor).data
+        cursor = data["cursor"]
+        if not data["has_more"]:
+            break
+    size = len(poll(client, cursor).content)
+    rows.append((f"changes, caught up ({size} B)", summarize(timed(lambda: poll(client, cursor), repeat))))
+
+    ids = list(Task.objects.filter(user=user).values_list("id", flat=True)[:edits + deletes])
+    for pk in ids[:edits]:
+        client.patch(f"/api/tasks/{pk}/", {"status": "IN_PROGRESS"}, format="json")
+    client.delete("/api/tasks/bulk/", ids[edits:], format="json")
+    response = poll(client, cursor)
+    assert len(response.data["tasks"]) == edits and len(response.data["removed"]) == deletes
+    rows.append((f"changes, {edits} updated + {deletes} deleted ({len(response.content)} B)",
+                 summarize(timed(lambda: poll(client, cursor), repeat))))
+
+    admin_cursor = clients["admin"].get("/api/tasks/changes/", {"page_size": 1}).data["cursor"]
+    rows.append((f"changes as ADMIN, first page of {count} tasks",
+                 summarize(timed(lambda: poll(clients["admin"], admin_cursor), repeat))))
+    print_table(f"{count} tasks, the user owns {own}", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--own", type=int, default=2000)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--deletes", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        from django.conf import settings
+        from django.test import override_settings
+
+        rates = {scope: None for scope in settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {})}
+        with override_settings(
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}, TASK_CHANGES_SETTLE_SECONDS=0,
+        ):
+            run(args.tasks, args.own, args.edits, args.deletes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Memory per idle task event stream (tasks/streams.py) and the latency of
+fanning an event out to the open streams.
+
+    python -m benchmarks.task_events --connections 1000 10000 20000 --events 200
+
+TaskEventStream is driven in-process on one event loop, as a worker serves
+it: the numbers leave out the server's socket and HTTP parsing state. Of the
+streams, --admins are ADMINs and the rest are spread over --users users.
+Memory per connection is the tracemalloc growth with all of them open and
+idle, divided by their number. Latency runs from the broker's publish(), in a
+thread as after a write's commit, to the last stream that wrote the event.
+Throttles are lifted and keepalives are off for the run.
+"""
+import argparse
+import asyncio
+import gc
+import random
+import time
+import tracemalloc
+
+from .harness import print_table, setup_django, summarize, test_database
+
+
+class Streams:
+    """`count` open streams to `app`, with a send() that timestamps task events."""
+
+    def __init__(self, app):
+        self.app = app
+        self.closed = asyncio.Event()
+        self.tasks = []
+        self.pending = 0
+        self.done = None
+        self.last = None
+
+    async def open(self, headers):
+        from tasks.streams import EVENTS_PATH
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": EVENTS_PATH, "root_path": "", "query_string": b"", "headers": headers,
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        }
+        started = False
+
+        async def receive():
+            nonlocal started
+            if not started:
+                started = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await self.closed.wait()
+            return {"type": "http.disconnect"}
+
+        self.tasks.append(asyncio.ensure_future(self.app(scope, receive, self.send)))
+
+    async def send(self, message):
+        if message.get("body", b"").startswith(b"event: task"):
+            self.last = time.perf_counter()
+            self.pending -= 1
+            if self.pending == 0:
+                self.done.set_result(None)
+
+    async def publish(self, message, expected):
+        """Seconds from publishing `message` to its `expected`-th delivery."""
+        from tasks.events import broker
+
+        loop = asyncio.get_running_loop()
+        self.pending, self.done = expected, loop.create_future()
+        started = time.perf_counter()
+        await loop.run_in_executor(None, broker().publish, message)
+        await asyncio.wait_for(self.done, 30)
+        return self.last - started
+
+    async def close(self):
+        self.closed.set()
+        await asyncio.gather(*self.tasks)
+
+
+async def measure(count, users, admins, events):
+    from tasks.events import hub
+    from tasks.streams import TaskEventStream
+
+    async def app(scope, receive, send):
+        raise AssertionError(scope["path"])
+
+    streams = Streams(TaskEventStream(app))
+    owners = [(user.id, [(b"authorization", f"Bearer {token}".encode())]) for user, token in users]
+    admin_headers = [(b"authorization", f"Bearer {admins[1]}".encode())]
+    admin_count = min(admins[0], count)
+    per_user = {}
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        for i in range(count):
+            if i < admin_count:
+                await streams.open(admin_headers)
+            else:
+                user_id, headers = owners[i % len(owners)]
+                per_user[user_id] = per_user.get(user_id, 0) + 1
+                await streams.open(headers)
+            if i % 500 == 499:
+                await asyncio.sleep(0)  # let the handshakes run
+        while hub.open < count:
+            await asyncio.sleep(0.01)
+        opened = time.perf_counter() - started
+        gc.collect()
+        per_connection = (tracemalloc.get_traced_memory()[0] - baseline) / count
+    finally:
+        tracemalloc.stop()
+
+    rng = random.Random(7)
+    one_user = []
+    for _ in range(events):
+        user_id = rng.choice(list(per_user))
+        message = {"action": "updated", "user_ids": [user_id], "task_ids": [1]}
+        one_user.append(await streams.publish(message, per_user[user_id] + admin_count) * 1000)
+    everyone = [
+        await streams.publish({"action": "updated", "user_ids": list(per_user), "task_ids": None}, count) * 1000
+        for _ in range(max(3, events // 20))
+    ]
+    await streams.close()
+    return opened * 1000 / count, per_connection / 1024, one_user, everyone
+
+
+def run(connections, user_count, admin_count, events):
+    from django.contrib.auth import get_user_model
+
+    from users.serializers import CustomTokenObtainPairSerializer
+
+    User = get_user_model()
+    users = User.objects.bulk_create(User(username=f"bench-listener-{i}", role="USER") for i in range(user_count))
+    admin = User.objects.create_user(username="bench-listener-admin", password="x", role="ADMIN")
+    tokens = [(user, CustomTokenObtainPairSerializer.get_token(user).access_token) for user in users]
+    admins = (admin_count, CustomTokenObtainPairSerializer.get_token(admin).access_token)
+
+    rows = []
+    for count in connections:
+        handshake, per_connection, one_user, everyone = asyncio.run(measure(count, tokens, admins, events))
+        label = f"{count} streams, {handshake:.2f} ms/handshake, {per_connection:.1f} KiB/conn"
+        rows.append((f"{label}: to one user", summarize(one_user)))
+        rows.append((f"{label}: to every stream", summarize(everyone)))
+    print_table(f"Publish to last delivery, {min(admin_count, min(connections))}+ ADMIN streams", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--admins", type=int, default=10)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        from django.conf import settings
+        from django.test import override_settings
+
+        rates = {scope: None for scope in settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {})}
+        with override_settings(
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates},
+            TASK_EVENTS_KEEPALIVE=3600, TASK_EVENTS_MAX_CONNECTIONS=10 ** 6,
+        ):
+            run(args.connections, args.users, args.admins, args.events)
+
+
+if __name__ == "__main__":
+    main()
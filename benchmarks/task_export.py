@@ -0,0 +1,98 @@
+"""
+Time to first byte, total time and peak memory of exporting every task as
+ADMIN: the streaming export against the unpaginated list (the whole table
+serialized into one JSON body, as GET /api/tasks/ used to do).
+
+    python -m benchmarks.task_export --tasks 10000 50000 100000
+
+Memory is the tracemalloc peak of a separate run, so it does not slow down
+the timed one.
+"""
+import argparse
+import datetime
+import time
+import tracemalloc
+
+from .harness import setup_django, test_database
+
+
+def add_tasks(owner, count):
+    from tasks.models import Task
+
+    due = datetime.date(2030, 1, 1)
+    Task.objects.bulk_create(
+        (Task(user=owner, title=f"Task {i}", description="Benchmark task " * 8, due_date=due) for i in range(count)),
+        batch_size=5000,
+    )
+
+
+def list_body(view, request):
+    from tasks.cache import task_list_cache
+
+    task_list_cache.backend.clear()
+    response = view(request).render()
+    yield response.content
+
+
+def export_body(view, request):
+    yield from view(request).streaming_content
+
+
+def measure(body):
+    start = time.perf_counter()
+    chunks = body()
+    size = len(next(chunks))
+    first_byte = time.perf_counter() - start
+    size += sum(len(chunk) for chunk in chunks)
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        for _ in body():
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return first_byte * 1000, total * 1000, peak / 2**20, size / 2**20
+
+
+def run(sizes):
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from tasks.views import TaskExportView, TaskListCreateView
+
+    admin = get_user_model().objects.create_user(username="bench-admin", password="x", role="ADMIN")
+    factory = APIRequestFactory()
+    cases = [
+        ("unpaginated list (JSON)", list_body, TaskListCreateView.as_view(pagination_class=None), "/api/tasks/"),
+        ("export, NDJSON", export_body, TaskExportView.as_view(), "/api/tasks/export/"),
+        ("export, CSV", export_body, TaskExportView.as_view(), "/api/tasks/export/?type=csv"),
+    ]
+
+    print(f"{'tasks':>8} {'case':<26} {'first byte ms':>14} {'total ms':>10} {'peak MiB':>9} {'body MiB':>9}")
+    seeded = 0
+    for size in sorted(sizes):
+        add_tasks(admin, size - seeded)
+        seeded = size
+        for label, body, view, url in cases:
+            def call():
+                request = factory.get(url)
+                force_authenticate(request, user=admin)
+                return body(view, request)
+
+            first_byte, total, peak, megabytes = measure(call)
+            print(f"{size:>8} {label:<26} {first_byte:>14.1f} {total:>10.1f} {peak:>9.1f} {megabytes:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.tasks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Throughput and peak memory of the task importer against one POST /api/tasks/
+per row (the only way to load tasks before).
+
+    python -m benchmarks.task_import --rows 10000 100000
+
+Rows are NDJSON with a `username` spread over 100 owners, read from a file on
+disk as `manage.py import_tasks` does. Memory is the tracemalloc peak of a
+second import of the same file, and should not grow with the number of rows.
+"""
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+
+from .harness import setup_django, test_database
+
+OWNERS = 100
+
+
+def write_file(path, rows):
+    with open(path, "w") as file:
+        for i in range(rows):
+            row = {
+                "title": f"Imported task {i}",
+                "description": "Benchmark task " * 8,
+                "due_date": "2030-01-01",
+                "status": "PENDING",
+                "username": f"bench-owner-{i % OWNERS}",
+            }
+            file.write(json.dumps(row) + "\n")
+
+
+def run(sizes, chunk_size, per_row):
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+    from tasks.importer import TaskImporter, read_rows
+
+    User = get_user_model()
+    User.objects.bulk_create(User(username=f"bench-owner-{i}", role="USER") for i in range(OWNERS))
+    admin = User.objects.create_user(username="bench-admin", password="x", role="ADMIN")
+
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    payload = {"title": "Posted task", "description": "Benchmark task " * 8, "due_date": "2030-01-01"}
+    start = time.perf_counter()
+    for _ in range(per_row):
+        assert client.post("/api/tasks/", payload, format="json").status_code == 201
+    print(f"POST /api/tasks/ per row: {per_row / (time.perf_counter() - start):,.0f} rows/s")
+
+    print(f"\n{'rows':>8} {'rows/s':>10} {'seconds':>8} {'peak MiB':>9}")
+    for size in sizes:
+        with tempfile.NamedTemporaryFile(suffix=".ndjson") as file:
+            write_file(file.name, size)
+
+            def load():
+                with open(file.name, "rb") as stream:
+                    importer = TaskImporter(owner=admin, chunk_size=chunk_size).run(read_rows(stream, "ndjson"))
+                assert importer.created == size, importer.report()
+                return importer
+
+            importer = load()
+            tracemalloc.start()  # On a second run, so that it does not slow down the timed one.
+            try:
+                load()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        print(f"{size:>8} {importer.rows_per_second:>10,.0f} {importer.seconds:>8.2f} {peak / 2**20:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--per-row", type=int, default=500, help="Rows to POST one at a time for comparison.")
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.rows, args.chunk_size, args.per_row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Latency of GET /api/tasks/ with and without keyset pagination.
+
+    python -m benchmarks.task_list --tasks 100000 --repeat 50
+
+The unpaginated case mounts the same view with `pagination_class=None`,
+which is how the endpoint behaved before pagination was introduced.
+"""
+import argparse
+import datetime
+
+from .harness import print_table, setup_django, summarize, test_database, timed
+
+
+def seed(tasks):
+    from django.contrib.auth import get_user_model
+    from tasks.models import Task
+
+    User = get_user_model()
+    admin = User.objects.create_user(username="bench-admin", password="x", role="ADMIN")
+    due = datetime.date(2030, 1, 1)
+    batch = [
+        Task(user=admin, title=f"Task {i}", description="Benchmark task " * 8, due_date=due)
+        for i in range(tasks)
+    ]
+    Task.objects.bulk_create(batch, batch_size=5000)
+    return admin
+
+
+def run(tasks, repeat, page_size):
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from tasks.views import TaskListCreateView
+
+    admin = seed(tasks)
+    factory = APIRequestFactory()
+    paginated = TaskListCreateView.as_view()
+    unpaginated = TaskListCreateView.as_view(pagination_class=None)
+
+    def call(view, url):
+        def request():
+            req = factory.get(url)
+            force_authenticate(req, user=admin)
+            return view(req).render()
+        return request
+
+    # Walk to the last page once so the deep-page case uses a real cursor.
+    url = f"/api/tasks/?page_size={page_size}"
+    last_url = url
+    while url:
+        last_url = url
+        response = call(paginated, url)()
+        link = response.headers.get("Link", "")
+        url = next((part.split(";")[0][1:-1] for part in link.split(", ") if 'rel="next"' in part), None)
+
+    rows = [
+        ("paginated, first page", summarize(timed(call(paginated, f"/api/tasks/?page_size={page_size}"), repeat))),
+        ("paginated, last page", summarize(timed(call(paginated, last_url), repeat))),
+        ("unpaginated (full list)", summarize(timed(call(unpaginated, "/api/tasks/"), max(3, repeat // 10)))),
+    ]
+    print_table(f"GET /api/tasks/ as ADMIN, {tasks} tasks, page_size={page_size}", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.tasks, args.repeat, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
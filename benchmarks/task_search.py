@@ -0,0 +1,115 @@
+"""
+Latency of the ranked task search (tasks/search.py) at a large task count,
+against an unranked `icontains` scan of titles and descriptions.
+
+    python -m benchmarks.task_search --tasks 1000000 --repeat 20
+
+Titles and descriptions are drawn from a 5 000-word vocabulary with a Zipf
+distribution: the "common" word is in almost every task, the "rare" one in
+about 1 in 1 500. Each query is timed for one user's tasks (as a USER sees
+them) and for all tasks (as an ADMIN does), on the first page and on the
+tenth, whose cursor is worked out beforehand.
+"""
+import argparse
+import datetime
+import itertools
+import random
+
+from .harness import percentile, setup_django, test_database, timed
+
+USERS = 100
+VOCABULARY = 5000
+PAGE_SIZE = 50
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "do", "gu", "fe", "ha", "bi"]
+
+
+def vocabulary(rng):
+    words = set()
+    while len(words) < VOCABULARY:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words, key=lambda word: rng.random())
+
+
+def add_tasks(owners, count, words, rng, chunk=10000):
+    from tasks.models import Task
+
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    due = datetime.date(2030, 1, 1)
+    for start in range(0, count, chunk):
+        Task.objects.bulk_create(
+            Task(
+                user=owners[i % len(owners)],
+                title=" ".join(rng.choices(words, cum_weights=weights, k=5)).capitalize(),
+                description=" ".join(rng.choices(words, cum_weights=weights, k=20)),
+                due_date=due,
+            )
+            for i in range(start, min(start + chunk, count))
+        )
+
+
+def cursor_position(text, user_id, number):
+    """The `(rank, id)` position the cursor to the `number`th page of results points at."""
+    from tasks.search import ranked_ids
+
+    position = None
+    for _ in range(number - 1):
+        rows = ranked_ids(text, user_id, position, limit=PAGE_SIZE + 1)
+        if len(rows) <= PAGE_SIZE:
+            break
+        position = [rows[PAGE_SIZE - 1]["rank"], rows[PAGE_SIZE - 1]["id"]]
+    return position
+
+
+def scan(text, user_id):
+    from django.db.models import Q
+    from tasks.models import Task
+
+    tasks = Task.objects.filter(Q(title__icontains=text) | Q(description__icontains=text))
+    if user_id is not None:
+        tasks = tasks.filter(user_id=user_id)
+    return list(tasks.values_list("id", flat=True)[:PAGE_SIZE + 1])
+
+
+def run(count, repeat):
+    from django.contrib.auth import get_user_model
+    from tasks.search import ranked_ids
+
+    rng = random.Random(7)
+    User = get_user_model()
+    owners = User.objects.bulk_create(User(username=f"bench-owner-{i}", role="USER") for i in range(USERS))
+    words = vocabulary(rng)
+    add_tasks(owners, count, words, rng)
+
+    queries = [("common", words[0]), ("medium", words[99]), ("rare", words[3999]), ("two words", f"{words[0]} {words[99]}")]
+    print(f"{count} tasks, {USERS} users\n")
+    print(f"{'query':<10} {'scope':<6} {'matches':>8} {'case':<22} {'p50 ms':>8} {'p95 ms':>8}")
+    for label, text in queries:
+        for scope, user_id in (("user", owners[0].id), ("all", None)):
+            matches = len(ranked_ids(text, user_id, limit=count))
+            tenth = cursor_position(text, user_id, 10)
+            cases = [
+                ("search, page 1", lambda: ranked_ids(text, user_id, limit=PAGE_SIZE + 1)),
+                ("search, page 10", lambda: ranked_ids(text, user_id, tenth, limit=PAGE_SIZE + 1)),
+                ("icontains, unranked", lambda: scan(text, user_id)),
+            ]
+            for case, func in cases:
+                samples = timed(func, repeat)
+                print(
+                    f"{label:<10} {scope:<6} {matches:>8} {case:<22} "
+                    f"{percentile(samples, 50):>8.1f} {percentile(samples, 95):>8.1f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.tasks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Rows per second of the task read path: TaskSerializer over model instances
+(how lists were rendered before) against TaskReadSerializer over `.values()`
+rows, with and without the query and the JSON rendering.
+
+    python -m benchmarks.task_serializer --tasks 5000 --repeat 5
+
+Both paths are checked to render byte-identical JSON before being timed.
+"""
+import argparse
+import datetime
+
+from .harness import setup_django, test_database, timed
+
+
+def best_rate(func, rows, repeat):
+    return rows / min(timed(func, repeat)) * 1000
+
+
+def run(count, repeat):
+    from django.contrib.auth import get_user_model
+    from rest_framework.renderers import JSONRenderer
+    from tasks.models import Task
+    from tasks.serializers import TaskReadSerializer, TaskSerializer
+
+    owner = get_user_model().objects.create_user(username="bench-owner", password="x", role="USER")
+    due = datetime.date(2030, 1, 1)
+    Task.objects.bulk_create(
+        (Task(user=owner, title=f"Task {i}", description="Benchmark task " * 8, due_date=due) for i in range(count)),
+        batch_size=5000,
+    )
+    queryset = Task.objects.order_by("id")
+    fields = TaskSerializer.Meta.fields
+    renderer = JSONRenderer()
+    tasks, rows = list(queryset), list(queryset.values(*fields))
+
+    def before():
+        return TaskSerializer(tasks, many=True).data
+
+    def after():
+        return TaskReadSerializer().many(rows)
+
+    def before_query():
+        return renderer.render(TaskSerializer(queryset.all(), many=True).data)
+
+    def after_query():
+        return renderer.render(TaskReadSerializer().many(queryset.values(*fields)))
+
+    assert before_query() == after_query(), "TaskReadSerializer output differs from TaskSerializer"
+
+    print(f"{'case':<34} {'TaskSerializer':>15} {'TaskReadSerializer':>19} {'speed-up':>9}")
+    cases = [
+        ("serialize", before, after),
+        ("serialize + render", lambda: renderer.render(before()), lambda: renderer.render(after())),
+        ("query + serialize + render", before_query, after_query),
+    ]
+    for label, old, new in cases:
+        old_rate, new_rate = best_rate(old, count, repeat), best_rate(new, count, repeat)
+        print(f"{label:<34} {old_rate:>10,.0f} rows/s {new_rate:>12,.0f} rows/s {new_rate / old_rate:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.tasks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+GET /api/tasks/stats/ (read from the TaskCounter rows) against computing the
+same numbers with a GROUP BY over tasks_task, as the number of tasks grows.
+
+    python -m benchmarks.task_stats --tasks 10000 100000 --repeat 20
+
+Tasks are bulk-created with due dates spread over two years and the
+counters rebuilt with reconcile_counters(), as after a data load.
+"""
+import argparse
+import datetime
+
+from .harness import percentile, setup_django, test_database, timed
+
+USERS = 20
+
+
+def add_tasks(owners, count):
+    from tasks.models import Task, TaskStatus
+
+    start = datetime.date.today() - datetime.timedelta(days=365)
+    statuses = TaskStatus.values
+    Task.objects.bulk_create(
+        (
+            Task(user=owners[i % len(owners)], title=f"Task {i}", description="", status=statuses[i % len(statuses)],
+                 due_date=start + datetime.timedelta(days=i % 730))
+            for i in range(count)
+        ),
+        batch_size=5000,
+    )
+
+
+def group_by(user_ids):
+    """The numbers of read_stats(), counted from the tasks themselves."""
+    from django.db.models import Count, Q
+    from django.utils import timezone
+    from tasks.models import Task, TaskStatus
+
+    today = timezone.localdate()
+    overdue = Q(due_date__lt=today) & ~Q(status=TaskStatus.COMPLETED)
+    stats = {}
+    for user_id in user_ids:
+        tasks = Task.objects.all() if user_id is None else Task.objects.filter(user_id=user_id)
+        stats[user_id] = tasks.aggregate(
+            **{status: Count("id", filter=Q(status=status)) for status in TaskStatus.values},
+            overdue=Count("id", filter=overdue),
+        )
+    return stats
+
+
+def run(sizes, repeat):
+    from django.contrib.auth import get_user_model
+    from tasks.stats import read_stats, reconcile_counters
+
+    User = get_user_model()
+    owners = User.objects.bulk_create(User(username=f"bench-owner-{i}", role="USER") for i in range(USERS))
+    scopes = [owners[0].id, None]
+
+    print(f"{'tasks':>8} {'case':<30} {'p50 ms':>8} {'p95 ms':>8}")
+    seeded = 0
+    for size in sorted(sizes):
+        add_tasks(owners, size - seeded)
+        seeded = size
+        reconcile_counters()
+        counters, grouped = read_stats(scopes), group_by(scopes)
+        for user_id in scopes:
+            assert counters[user_id]["by_status"] == {k: v for k, v in grouped[user_id].items() if k != "overdue"}
+            assert counters[user_id]["overdue"] == grouped[user_id]["overdue"]
+        for label, func in (("counters (user + all)", lambda: read_stats(scopes)),
+                            ("GROUP BY (user + all)", lambda: group_by(scopes))):
+            samples = timed(func, repeat)
+            print(f"{size:>8} {label:<30} {percentile(samples, 50):>8.2f} {percentile(samples, 95):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.tasks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
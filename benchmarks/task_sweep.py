@@ -0,0 +1,112 @@
+"""
+Cost of a daily overdue/due-soon reminder sweep (tasks/reminders.py) at a
+large task count, against a scan for every open task due by the horizon,
+which is what a sweep without saved positions has to read.
+
+    python -m benchmarks.task_sweep --tasks 1000000 --days 7
+
+Due dates are spread over two years around today and a fifth of the tasks
+are completed. Between two simulated days, --edits tasks get a new due date,
+half of them in the past. The first sweep reports the whole backlog and is
+timed on its own; the rest are one per simulated day.
+"""
+import argparse
+import datetime
+import random
+
+from .harness import percentile, setup_django, test_database, timed
+
+USERS = 100
+
+
+class CountingSink:
+    def __init__(self):
+        self.count = 0
+
+    def send(self, events):
+        self.count += len(events)
+
+
+def add_tasks(owners, count, today, rng, chunk=10000):
+    from tasks.models import Task, TaskStatus
+
+    for start in range(0, count, chunk):
+        Task.objects.bulk_create(
+            Task(
+                user=owners[i % len(owners)],
+                title=f"Task {i}",
+                description="d",
+                due_date=today + datetime.timedelta(days=rng.randint(-365, 365)),
+                status=TaskStatus.COMPLETED if rng.random() < 0.2 else TaskStatus.PENDING,
+            )
+            for i in range(start, min(start + chunk, count))
+        )
+
+
+def edit_tasks(ids, edits, today, written_at, rng):
+    from tasks.models import Task
+
+    for task_id in rng.sample(ids, edits):
+        Task.objects.filter(id=task_id).update(
+            due_date=today + datetime.timedelta(days=rng.randint(-30, 30)), updated_at=written_at,
+        )
+
+
+def scan(horizon):
+    from tasks.models import Task, TaskStatus
+    from tasks.reminders import EVENT_FIELDS
+
+    return list(Task.objects.exclude(status=TaskStatus.COMPLETED).filter(due_date__lte=horizon).values(*EVENT_FIELDS))
+
+
+def run(count, days, edits, repeat):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+    from tasks.models import Task
+    from tasks.reminders import DueSweeper
+
+    rng = random.Random(7)
+    User = get_user_model()
+    owners = User.objects.bulk_create(User(username=f"bench-owner-{i}", role="USER") for i in range(USERS))
+    start = timezone.now()
+    today = timezone.localdate(start)
+    add_tasks(owners, count, today, rng)
+    Task.objects.update(updated_at=start - datetime.timedelta(days=1))
+    ids = list(Task.objects.values_list("id", flat=True))
+
+    sink = CountingSink()
+    sweeper = DueSweeper(sink, days=2)
+    [first] = timed(lambda: sweeper.run(now=start), 1)
+    print(f"{count} tasks, {edits} edits a day\n")
+    print(f"first sweep: {sink.count} reminders in {first:.0f} ms\n")
+    print(f"{'day':>3} {'sent':>6} {'sweep ms':>9} {'scan rows':>10} {'scan p50 ms':>12}")
+
+    sweeps = []
+    for day in range(1, days + 1):
+        now = start + datetime.timedelta(days=day)
+        today = timezone.localdate(now)
+        edit_tasks(ids, edits, today, now - datetime.timedelta(hours=1), rng)
+        sink.count = 0
+        [elapsed] = timed(lambda: sweeper.run(now=now), 1)
+        sweeps.append(elapsed)
+        rows = len(scan(today + datetime.timedelta(days=2)))
+        scans = timed(lambda: scan(today + datetime.timedelta(days=2)), repeat)
+        print(f"{day:>3} {sink.count:>6} {elapsed:>9.1f} {rows:>10} {percentile(scans, 50):>12.1f}")
+    print(f"\nsweep p50 {percentile(sweeps, 50):.1f} ms over {days} days")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--edits", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.tasks, args.days, args.edits, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
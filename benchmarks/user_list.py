@@ -0,0 +1,96 @@
+"""
+Latency of GET /api/auth/admin-only/ against the unpaginated list of full
+user rows it used to return.
+
+    python -m benchmarks.user_list --users 50000 --tasks-per-user 10 --repeat 30
+
+The previous behaviour is reproduced by mounting the view with
+`User.objects.all()`, CustomUserSerializer and no pagination or filters.
+"""
+import argparse
+
+from .harness import print_table, setup_django, summarize, test_database, timed
+
+
+def seed(users, tasks_per_user):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from tasks.models import Task
+
+    User = get_user_model()
+    password = make_password("x")
+    User.objects.bulk_create(
+        (
+            User(username=f"bench-user-{i}", email=f"bench-user-{i}@example.com", password=password,
+                 role="ADMIN" if i % 1000 == 0 else "USER")
+            for i in range(users)
+        ),
+        batch_size=5000,
+    )
+    owners = list(User.objects.values_list("id", flat=True))
+    Task.objects.bulk_create(
+        (
+            Task(user_id=owner, title=f"Task {n}", description="Benchmark task", due_date="2030-01-01")
+            for owner in owners
+            for n in range(tasks_per_user)
+        ),
+        batch_size=5000,
+    )
+    return User.objects.filter(role="ADMIN").first()
+
+
+def run(users, tasks_per_user, repeat):
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from users.serializers import CustomUserSerializer
+    from users.views import AdminOnlyView, User
+
+    class PreviousAdminOnlyView(AdminOnlyView):
+        queryset = User.objects.all()
+        serializer_class = CustomUserSerializer
+        pagination_class = None
+        filter_backends = []
+
+        def get_queryset(self):
+            return User.objects.all()
+
+    admin = seed(users, tasks_per_user)
+    factory = APIRequestFactory()
+    view, previous = AdminOnlyView.as_view(), PreviousAdminOnlyView.as_view()
+
+    def call(view, url):
+        def request():
+            req = factory.get(url)
+            force_authenticate(req, user=admin)
+            return view(req).render()
+        return request
+
+    last_id = User.objects.order_by("-id").values_list("id", flat=True)[50]
+    paginator = view.view_class.pagination_class()
+    paginator.fields = paginator.ordering
+    last_page = f"/api/auth/admin-only/?cursor={paginator.encode_cursor([last_id])}"
+
+    rows = [
+        ("first page", summarize(timed(call(view, "/api/auth/admin-only/"), repeat))),
+        ("last page", summarize(timed(call(view, last_page), repeat))),
+        ("first page, task_count=true", summarize(timed(call(view, "/api/auth/admin-only/?task_count=true"), repeat))),
+        ("last page, task_count=true", summarize(timed(call(view, f"{last_page}&task_count=true"), repeat))),
+        ("role=ADMIN", summarize(timed(call(view, "/api/auth/admin-only/?role=ADMIN"), repeat))),
+        ("unpaginated (previous behaviour)", summarize(timed(call(previous, "/api/auth/admin-only/"), max(3, repeat // 10)))),
+    ]
+    print_table(f"GET /api/auth/admin-only/, {users} users, {users * tasks_per_user} tasks", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--tasks-per-user", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.users, args.tasks_per_user, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
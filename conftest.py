@@ -0,0 +1,32 @@
+import pytest
+from django.core.cache import caches
+
+from task_management.throttling import bucket_store
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark", action="store_true", help="Run the endpoint benchmarks and compare them to benchmarks/baseline.json."
+    )
+    parser.addoption(
+        "--benchmark-tolerance", type=float, default=1.0,
+        help="Scale the allowed latency/memory growth over the baseline (default: 1.0).",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Caches and throttle buckets outlive the per-test transaction rollback, so start every test empty."""
+    for cache in caches.all():
+        cache.clear()
+    bucket_store().clear()
+    yield
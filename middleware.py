@@ -1,15 +1,77 @@
 import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from django.http import JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from task_management.metrics import QueryTimer, current_timer, observe_request
+from task_management.profiling import SlowestRequestProfiler
 
 logger = logging.getLogger('django')
 
-class ExceptionLoggingMiddleware:
+class ExceptionLoggingMiddleware(MiddlewareMixin):
+    def process_exception(self, request, exception):
+        logger.error("Unhandled Exception: %s", exception, exc_info=True)
+        return JsonResponse({"error": "An unexpected error occurred"}, status=500)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL query count/time, response size and status per
+    resolved URL name (see task_management/metrics.py), and optionally
+    profiles a sample of requests (PROFILE_SLOWEST).
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        keep = getattr(settings, "PROFILE_SLOWEST", 0)
+        self.profiler = None
+        if keep:
+            self.profiler = SlowestRequestProfiler(
+                keep, getattr(settings, "PROFILE_SAMPLE_RATE", 0.1), settings.PROFILE_DIR
+            )
 
     def __call__(self, request):
-        return self.get_response(request)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            if self.profiler is not None and self.profiler.should_profile():
+                response = self.profiler.profile(self.get_response, request)
+            else:
+                response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        self.observe(request, response, time.perf_counter() - start, timer)
+        return response
 
-    def process_exception(self, request, exception):
-        logger.error(f"Unhandled Exception: {exception}", exc_info=True)
-        return JsonResponse({"error": "An unexpected error occurred"}, status=500)
+    async def __acall__(self, request):
+        # No profiling here: cProfile only sees the event loop thread, where
+        # other requests run interleaved with this one.
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        self.observe(request, response, time.perf_counter() - start, timer)
+        return response
+
+    def observe(self, request, response, seconds, timer):
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        size = None if response.streaming else len(response.content)
+        observe_request(view, request.method, response.status_code, seconds, timer, size)
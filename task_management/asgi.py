@@ -2,6 +2,8 @@
 ASGI config for task_management project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The task event stream (tasks/streams.py) is served in front of Django's
+application, so it is only available when the project runs under ASGI.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +15,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_management.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from tasks.streams import TaskEventStream  # noqa: E402  (needs the app registry loaded above)
+
+application = TaskEventStream(django_application)
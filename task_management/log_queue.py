@@ -0,0 +1,175 @@
+"""
+Non-blocking logging: request threads only put records on a bounded queue,
+and a background listener thread writes them out in batches.
+
+Configured from settings.LOGGING, e.g.::
+
+    'queue_app': {
+        '()': 'task_management.log_queue.BoundedQueueHandler',
+        'handlers': ['file_app', 'console'],
+        'maxsize': 10000,
+        'batch_size': 200,
+        'drop': 'newest',
+    }
+
+`handlers` names other entries of LOGGING['handlers'] that are not attached
+to any logger themselves. dictConfig creates handlers in name order, so the
+queue handler's name must sort after its targets'.
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+DROP_POLICIES = ("newest", "oldest")
+
+
+class BatchFileHandler(logging.FileHandler):
+    """A FileHandler that leaves flushing to the listener, once per batch."""
+
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class BatchingQueueListener(QueueListener):
+    """Drains up to `batch_size` records per wake-up and flushes the targets once."""
+
+    def __init__(self, queue_, *handlers, batch_size=100, on_batch=None):
+        super().__init__(queue_, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+
+    def enqueue_sentinel(self):
+        # The queue is bounded: wait for room instead of failing on shutdown.
+        self.queue.put(self._sentinel)
+
+    def _monitor(self):
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            stop = self._sentinel in batch
+            for record in batch:
+                if record is not self._sentinel:
+                    self.handle(record)
+            if self.on_batch is not None:
+                self.on_batch()
+            for handler in self.handlers:
+                try:
+                    handler.flush()
+                except (OSError, ValueError):
+                    pass  # e.g. a console stream already closed at interpreter exit
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                return
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Puts records on a bounded in-process queue without ever blocking the
+    caller. When the queue is full, `drop="newest"` discards the incoming
+    record and `drop="oldest"` evicts the oldest queued one; the number of
+    dropped records is reported through the targets after the next batch.
+    """
+
+    def __init__(self, handlers, maxsize=10000, batch_size=100, drop="newest"):
+        if drop not in DROP_POLICIES:
+            raise ValueError(f"drop must be one of {DROP_POLICIES}, not {drop!r}")
+        super().__init__(queue.Queue(maxsize))
+        # Hold strong references: the logging module only keeps weak ones to
+        # handlers that no logger uses.
+        self.targets = [self._resolve(name) for name in handlers]
+        self.batch_size = batch_size
+        self.drop = drop
+        self.dropped = 0
+        self.listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.drop == "oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Merge the %-style args now, since they may be mutated later. The
+        # formatting itself is left to the target handlers on the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def start(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked (e.g. gunicorn --preload): the parent's listener thread
+                # did not survive, so start over with a fresh queue.
+                self.queue = queue.Queue(self.queue.maxsize)
+            self._pid = os.getpid()
+            self.listener = BatchingQueueListener(
+                self.queue, *self.targets, batch_size=self.batch_size, on_batch=self._report_drops
+            )
+            self.listener.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        with self._start_lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+            self._pid = None
+
+    def flush(self):
+        """Block until every queued record has been written."""
+        if self.listener is not None and self._pid == os.getpid():
+            self.queue.join()
+
+    def close(self):
+        self.stop()
+        super().close()
+
+    def _report_drops(self):
+        dropped, self.dropped = self.dropped, 0
+        if dropped:
+            record = logging.LogRecord(
+                self.name or "logging", logging.WARNING, __file__, 0,
+                "%d log records dropped: logging queue full", (dropped,), None,
+            )
+            for handler in self.listener.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+    @staticmethod
+    def _resolve(name):
+        get_handler = getattr(logging, "getHandlerByName", None)  # Python 3.12+
+        handler = get_handler(name) if get_handler else logging._handlers.get(name)
+        if handler is None:
+            raise ValueError(f"Unknown logging handler {name!r}")
+        return handler
@@ -0,0 +1,216 @@
+"""
+In-process request metrics, rendered in the Prometheus text format.
+
+Metrics live in the memory of each worker process: with several workers,
+scrape each one (or run a single worker per container).
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotFound
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, format_labels(self.labels, labels), value
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help, buckets, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [count per bucket..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 1) + [0]
+            row[index] += 1
+            row[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {labels: list(row) for labels, row in self._values.items()}
+        for labels, row in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), row):
+                cumulative += count
+                le = bound if bound == "+Inf" else format_value(bound)
+                yield f"{self.name}_bucket", format_labels(self.labels, labels, [("le", le)]), cumulative
+            yield f"{self.name}_count", format_labels(self.labels, labels), cumulative
+            yield f"{self.name}_sum", format_labels(self.labels, labels), row[-1]
+
+
+class Callback:
+    """A value read when the metrics are rendered, e.g. a counter kept elsewhere."""
+
+    def __init__(self, name, help, type, func):
+        self.name, self.help, self.type, self.func = name, help, type, func
+
+    def samples(self):
+        yield self.name, "", self.func()
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self.register(Counter(name, help, labels))
+
+    def histogram(self, name, help, buckets, labels=()):
+        return self.register(Histogram(name, help, buckets, labels))
+
+    def callback(self, name, help, func, type="gauge"):
+        return self.register(Callback(name, help, type, func))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(f"{name}{labels} {format_value(value)}" for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.counter(
+    "http_requests_total", "Requests by view, method and status code.", ["view", "method", "status"]
+)
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Time spent handling a request.", LATENCY_BUCKETS, ["view", "method"]
+)
+REQUEST_QUERIES = registry.histogram(
+    "http_request_db_queries", "SQL queries per request.", QUERY_COUNT_BUCKETS, ["view", "method"]
+)
+REQUEST_DB_DURATION = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL queries per request.", LATENCY_BUCKETS, ["view", "method"]
+)
+RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes", "Response body size (streaming responses excluded).", SIZE_BUCKETS, ["view", "method"]
+)
+
+
+class QueryTimer:
+    """A database execute_wrapper counting the queries and the time they take."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+# The QueryTimer of the request being handled. A context variable rather than a
+# per-request execute_wrapper, because under ASGI the queries of a request run on
+# the connections of worker threads, which the context is copied to.
+current_timer = ContextVar("query_timer", default=None)
+
+
+def time_queries(execute, sql, params, many, context):
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+def observe_request(view, method, status, seconds, timer, size=None):
+    labels = (view, method)
+    REQUESTS.inc((view, method, str(status)))
+    REQUEST_DURATION.observe(labels, seconds)
+    REQUEST_QUERIES.observe(labels, timer.count)
+    REQUEST_DB_DURATION.observe(labels, timer.seconds)
+    if size is not None:
+        RESPONSE_SIZE.observe(labels, size)
+
+
+def client_ip(request):
+    """
+    The client address as the throttles see it: from X-Forwarded-For as far
+    as NUM_PROXIES allows. None for a request forwarded by a proxy that
+    NUM_PROXIES does not account for, whose REMOTE_ADDR is the proxy's.
+    """
+    if not api_settings.NUM_PROXIES and "HTTP_X_FORWARDED_FOR" in request.META:
+        return None
+    return BaseThrottle().get_ident(request)
+
+
+def metrics_allowed(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        return hmac.compare_digest(request.META.get("HTTP_AUTHORIZATION", "").encode(), f"Bearer {token}".encode())
+    return client_ip(request) in getattr(settings, "METRICS_ALLOWED_IPS", ())
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Looks like a 404 unless the request carries
+    `Authorization: Bearer <METRICS_TOKEN>`, or, without a token configured,
+    comes from METRICS_ALLOWED_IPS.
+    """
+    if not metrics_allowed(request):
+        return HttpResponseNotFound()
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,102 @@
+"""
+PostgreSQL backend that keeps a per-process pool of open connections.
+
+Enabled with ``ENGINE = "task_management.pooled_postgresql"`` and a ``pool``
+entry in ``OPTIONS`` (see ``DB_POOL_*`` in settings)::
+
+    "OPTIONS": {"pool": {"max_size": 10, "timeout": 5}}
+
+Django still "closes" its connection at the end of every request
+(``CONN_MAX_AGE = 0``); here that rolls back anything left open and hands the
+connection back to the pool, so threads of a threaded or ASGI worker share a
+bounded set of connections instead of each opening its own. Django 5.1+ has
+this built in for psycopg 3 (``OPTIONS["pool"]``), which this mirrors.
+"""
+import os
+import threading
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import ConnectionPool
+
+TRANSACTION_STATUS_IDLE = 0  # Same value in psycopg2 and psycopg 3.
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would make DROP DATABASE fail.
+        self.connection.close_pool()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @property
+    def pool(self):
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if not options or self.alias == NO_DB_ALIAS:
+            return None
+        # One pool per process (workers forked after a connection was opened
+        # must not share its socket) and per database (the test database).
+        key = (os.getpid(), self.alias, self.settings_dict["NAME"])
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(**options)
+        return pool
+
+    def close_pool(self):
+        with _pools_lock:
+            keys = [key for key in _pools if key[:2] == (os.getpid(), self.alias)]
+            pools = [_pools.pop(key) for key in keys]
+        for pool in pools:
+            pool.close()
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        check = self.check_pooled_connection if self.settings_dict["CONN_HEALTH_CHECKS"] else None
+        connection = pool.checkout(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params), check)
+        # Normally set while connecting; a reused connection skips that.
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        self.isolation_level = (
+            IsolationLevel.READ_COMMITTED if isolation_level is None else IsolationLevel(isolation_level)
+        )
+        return connection
+
+    def check_pooled_connection(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not connection.autocommit:
+                connection.rollback()
+        except self.Database.Error:
+            return False
+        return True
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        # Closed inside atomic(): Django keeps referencing the connection until
+        # the block exits, so it must not be handed to anyone else.
+        connection, reuse = self.connection, not self.in_atomic_block
+        with self.wrap_database_errors:
+            try:
+                if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except self.Database.Error:
+                reuse = False
+            pool.checkin(connection, reuse=reuse)
@@ -0,0 +1,63 @@
+import threading
+
+from django.db.utils import OperationalError
+
+
+class ConnectionPool:
+    """A bounded LIFO pool of open DB-API connections."""
+
+    def __init__(self, max_size=10, timeout=5):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def checkout(self, connect, check=None):
+        """
+        Reuse an idle connection (the most recently returned one, which is the
+        least likely to have been dropped server side) or open a new one with
+        `connect()`. Waits up to `timeout` seconds when `max_size` connections
+        are already checked out.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise OperationalError(
+                f"No database connection available within {self.timeout}s "
+                f"({self.max_size} connections in use)."
+            )
+        try:
+            while True:
+                with self._lock:
+                    connection = self._idle.pop() if self._idle else None
+                if connection is None:
+                    return connect()
+                if not connection.closed and (check is None or check(connection)):
+                    return connection
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def checkin(self, connection, reuse=True):
+        try:
+            if reuse and not connection.closed:
+                with self._lock:
+                    self._idle.append(connection)
+            else:
+                self._discard(connection)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Close the idle connections; checked out ones are closed on check-in."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -0,0 +1,67 @@
+"""
+Sampling request profiler: runs a fraction of requests under cProfile and
+keeps the dumps of the slowest `keep` of them on disk.
+
+Dumps are standard pstats files, named ``<ms>ms-<view>-<time>.prof``; open
+them with ``python -m pstats``, snakeviz, or turn them into a flame graph
+with flameprof / gprof2dot.
+"""
+import cProfile
+import heapq
+import logging
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger("django")
+
+
+class SlowestRequestProfiler:
+    def __init__(self, keep, sample_rate, directory):
+        self.keep = keep
+        self.sample_rate = sample_rate
+        self.directory = Path(directory)
+        self.slowest = []  # min-heap of (seconds, path of the dump)
+        # cProfile cannot profile two threads at once, so one request at a time.
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+
+    def should_profile(self):
+        return random.random() < self.sample_rate and self._active.acquire(blocking=False)
+
+    def profile(self, get_response, request):
+        """Call `get_response(request)` under cProfile; only after should_profile() returned True."""
+        profiler = cProfile.Profile()
+        try:
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = get_response(request)
+            finally:
+                profiler.disable()
+                seconds = time.perf_counter() - start
+        finally:
+            self._active.release()
+        self.record(seconds, request, profiler)
+        return response
+
+    def record(self, seconds, request, profiler):
+        with self._lock:
+            if len(self.slowest) >= self.keep and seconds <= self.slowest[0][0]:
+                return
+            match = getattr(request, "resolver_match", None)
+            view = re.sub(r"[^\w.-]", "_", match.view_name if match else "unmatched")
+            path = self.directory / f"{seconds * 1000:.0f}ms-{view}-{time.time_ns()}.prof"
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(path)
+            except OSError as e:
+                logger.error("Could not write request profile %s: %s", path, e)
+                return
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, (seconds, path))
+            else:
+                _, evicted = heapq.heapreplace(self.slowest, (seconds, path))
+                evicted.unlink(missing_ok=True)
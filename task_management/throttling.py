@@ -0,0 +1,212 @@
+"""
+Token-bucket request throttles for the REST_FRAMEWORK config.
+
+A bucket holds up to `capacity` tokens and refills continuously at
+`capacity / period` tokens per second; a request takes one token or is
+rejected with 429 and a `Retry-After` of the time until the next token.
+Rates use DRF's format, so `"10/min"` allows bursts of 10 and then one request
+every 6 seconds. A scope whose rate is None is not throttled.
+
+Buckets live in the store named by `THROTTLE_STORE`:
+- "memory": a dict behind a lock in each process, for single-process runs;
+- "cache": the `THROTTLE_CACHE_ALIAS` cache, shared by every worker. Each
+  take runs under a short per-bucket lock taken with `cache.add()`, which is
+  atomic on the shared backends Django ships (Redis, Memcached, database).
+  Only keys under `throttle:` are written, so the alias can be shared.
+"""
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+BUCKET_KEY = "throttle:{}"
+LOCK_KEY = "throttle:{}:lock"
+
+
+def parse_rate(rate):
+    """`"10/min"` -> `(10, 60)`: the bucket capacity and the seconds to refill it."""
+    count, period = rate.split("/")
+    return int(count), PERIODS[period[0]]
+
+
+def refill(tokens, stamp, now, capacity, refill_rate):
+    """Take one token from a bucket last seen at `stamp`: `(allowed, tokens left, seconds to wait)`."""
+    tokens = min(capacity, tokens + (now - stamp) * refill_rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0
+    return False, tokens, (1 - tokens) / refill_rate
+
+
+class MemoryBucketStore:
+    """Buckets of this process. Full buckets are dropped once the dict has grown past `sweep_at`."""
+
+    def __init__(self, sweep_at=10000, clock=time.monotonic):
+        self.clock = clock
+        self.min_sweep_at = self.sweep_at = sweep_at
+        self._buckets = {}  # key -> (tokens, stamp, full_at)
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate):
+        now = self.clock()
+        with self._lock:
+            tokens, stamp, _ = self._buckets.get(key, (capacity, now, now))
+            allowed, tokens, wait = refill(tokens, stamp, now, capacity, refill_rate)
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / refill_rate)
+            if len(self._buckets) > self.sweep_at:
+                self._sweep(now)
+        return allowed, wait
+
+    async def atake(self, key, capacity, refill_rate):
+        return self.take(key, capacity, refill_rate)
+
+    def _sweep(self, now):
+        # A bucket that has refilled is the same as no bucket.
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        self.sweep_at = max(self.min_sweep_at, 2 * len(self._buckets))
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Buckets in a Django cache, shared by every worker using it. A request that
+    finds a bucket's lock held (a holder that died, or a pile-up of the same
+    client's requests) does not wait for it: it is decided on the bucket as it
+    stands, without taking a token, and only throttled if the bucket is empty.
+    """
+
+    lock_timeout = 1
+
+    def __init__(self, alias="default", clock=time.time):
+        self.alias = alias
+        self.clock = clock
+        self.keys = set()  # The buckets taken from, for clear().
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def take(self, key, capacity, refill_rate):
+        cache = self.cache
+        bucket_key, lock = BUCKET_KEY.format(key), LOCK_KEY.format(key)
+        self.keys.add(key)
+        if not cache.add(lock, 1, self.lock_timeout):
+            now = self.clock()
+            tokens, stamp = cache.get(bucket_key) or (capacity, now)
+            allowed, _, wait = refill(tokens, stamp, now, capacity, refill_rate)
+            return allowed, wait
+        try:
+            now = self.clock()
+            tokens, stamp = cache.get(bucket_key) or (capacity, now)
+            allowed, tokens, wait = refill(tokens, stamp, now, capacity, refill_rate)
+            # Expire with the refill: a missing bucket is a full one.
+            cache.set(bucket_key, (tokens, now), int((capacity - tokens) / refill_rate) + 1)
+        finally:
+            cache.delete(lock)
+        return allowed, wait
+
+    async def atake(self, key, capacity, refill_rate):
+        # Not thread-sensitive: the cache round trips must not hold up the other requests' sync code.
+        return await sync_to_async(self.take, thread_sensitive=False)(key, capacity, refill_rate)
+
+    def clear(self):
+        """Drop the buckets this store has taken from; the rest of the cache (revocation cutoffs included) stays."""
+        self.cache.delete_many([name.format(key) for key in self.keys for name in (BUCKET_KEY, LOCK_KEY)])
+        self.keys.clear()
+
+
+_memory_store = MemoryBucketStore()
+
+
+def bucket_store():
+    if getattr(settings, "THROTTLE_STORE", "memory") == "cache":
+        return CacheBucketStore(getattr(settings, "THROTTLE_CACHE_ALIAS", "default"))
+    return _memory_store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttles on the bucket named by get_bucket(); the rate comes from `DEFAULT_THROTTLE_RATES[scope]`."""
+
+    scope = None
+
+    def get_scope(self, view):
+        return self.scope
+
+    def get_bucket(self, request, view):
+        """The bucket key of the request, or None to let it through."""
+        raise NotImplementedError(".get_bucket() must be overridden")
+
+    def get_ident(self, request):
+        user = request.user
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{super().get_ident(request)}"
+
+    def prepare(self, request, view):
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        bucket = self.get_bucket(request, view) if rate else None
+        if bucket is None:
+            return None
+        capacity, period = parse_rate(rate)
+        return f"{scope}:{bucket}", capacity, capacity / period
+
+    def allow_request(self, request, view):
+        bucket = self.prepare(request, view)
+        if bucket is None:
+            return True
+        allowed, self.retry_after = bucket_store().take(*bucket)
+        return allowed
+
+    async def aallow_request(self, request, view):
+        bucket = self.prepare(request, view)
+        if bucket is None:
+            return True
+        allowed, self.retry_after = await bucket_store().atake(*bucket)
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per authenticated user, across every endpoint."""
+
+    scope = "user"
+
+    def get_bucket(self, request, view):
+        if request.user is not None and request.user.is_authenticated:
+            return self.get_ident(request)
+        return None
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per client IP for unauthenticated requests, across every endpoint."""
+
+    scope = "anon"
+
+    def get_bucket(self, request, view):
+        if request.user is not None and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class EndpointTokenBucketThrottle(TokenBucketThrottle):
+    """
+    One bucket per user (or IP when anonymous) for each view that sets
+    `throttle_scope`, on top of the global buckets: expensive endpoints such as
+    login get a rate of their own.
+    """
+
+    def get_scope(self, view):
+        return getattr(view, "throttle_scope", None)
+
+    def get_bucket(self, request, view):
+        return self.get_ident(request)
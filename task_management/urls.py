@@ -17,9 +17,13 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path ,include
 
+from task_management.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/auth/", include("users.urls")),
     path("api/tasks/", include("tasks.urls")),  # Include tasks URLs
+    path("api/async/tasks/", include("tasks.async_urls")),  # The same endpoints as async views, for ASGI
+    path("metrics", metrics_view, name="metrics"),
 
 ]
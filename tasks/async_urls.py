@@ -0,0 +1,10 @@
+from django.urls import path
+from .async_views import AssignTaskAsyncView, TaskDetailAsyncView, TaskListCreateAsyncView
+from .streams import TaskEventsView
+
+urlpatterns = [
+    path("", TaskListCreateAsyncView.as_view(), name="async-task-list-create"),
+    path("<int:pk>/", TaskDetailAsyncView.as_view(), name="async-task-detail"),
+    path("<int:pk>/assign/", AssignTaskAsyncView.as_view(), name="async-assign-task"),
+    path("events/", TaskEventsView.as_view(), name="async-task-events"),  # Served by TaskEventStream (ASGI)
+]
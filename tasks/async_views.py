@@ -0,0 +1,285 @@
+"""
+Async versions of the task list, detail and assign endpoints, served under
+/api/async/tasks/.
+
+DRF views are synchronous, so under ASGI each request to them runs in a worker
+thread. These views run on the event loop instead and reach the database
+through Django's async ORM. They reuse the serializers, filters, paginator and
+conditional request handling of the sync views, but:
+
+- the list is not served from the task list cache and carries no ETag;
+- tasks outside the caller's scope are a 404 on every method, and invalid
+  data is a 400;
+- updates and deletes take no row lock: the write is conditional on the
+  version that was checked against If-Match / If-Unmodified-Since.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException, AuthenticationFailed, NotAuthenticated, NotFound, PermissionDenied, Throttled,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from users.authentication import StatelessJWTAuthentication
+
+from .conditional import evaluate_preconditions, task_validators
+from .filters import TaskFilterBackend, get_projected_fields, read_columns
+from .models import Task
+from .pagination import TaskCursorPagination
+from .serializers import TaskReadSerializer, TaskSerializer
+from .signals import task_changed
+from .stats import count_changes, counter_key
+
+logger = logging.getLogger('tasks')
+User = get_user_model()
+
+renderer = JSONRenderer()
+
+# Each write runs in a thread together with its task_changed, in one transaction:
+# the receivers write the counter rows and tombstones, and use transaction.on_commit,
+# which is sync-only. A failed receiver undoes the write, as in the sync views.
+
+
+@sync_to_async
+def create_task(user_id, data):
+    with transaction.atomic():
+        task = Task.objects.create(user_id=user_id, **data)
+        counts = count_changes(after=[counter_key(task)])
+        task_changed.send(sender=Task, action="created", user_ids={user_id}, counts=counts, task_ids=[task.id])
+    return task
+
+
+@sync_to_async
+def update_task(rows, task, changes):
+    """Write `changes` to `rows` (the version of `task` that may be written); False if none matched."""
+    with transaction.atomic():
+        if not rows.update(**changes):
+            return False
+        before = counter_key(task)
+        for name, value in changes.items():
+            setattr(task, name, value)
+        counts = count_changes([before], [counter_key(task)])
+        task_changed.send(sender=Task, action="updated", user_ids={task.user_id}, counts=counts, task_ids=[task.id])
+    return True
+
+
+@sync_to_async
+def delete_task(rows, task):
+    """Delete `rows` (the version of `task` that may be deleted); False if none matched."""
+    with transaction.atomic():
+        deleted, _ = rows.delete()
+        if not deleted:
+            return False
+        counts = count_changes(before=[counter_key(task)])
+        task_changed.send(sender=Task, action="deleted", user_ids={task.user_id}, counts=counts,
+                          task_ids=[task.id], removed={task.id: task.user_id})
+    return True
+
+
+@sync_to_async
+def assign_task(task, user):
+    previous_owner, before = task.user_id, counter_key(task)
+    task.user = user
+    with transaction.atomic():
+        task.save(update_fields=["user", "updated_at"])
+        counts = count_changes([before], [counter_key(task)])
+        removed = {task.id: previous_owner} if previous_owner != user.id else {}
+        task_changed.send(sender=Task, action="assigned", user_ids={previous_owner, user.id}, counts=counts,
+                          task_ids=[task.id], removed=removed)
+
+
+def json_response(data=None, status=status.HTTP_200_OK, headers=None):
+    """A plain HttpResponse rendered like DRF's Response, which Django would render in a thread."""
+    if data is None:
+        response = HttpResponse(status=status, headers=headers)
+        del response["Content-Type"]
+        return response
+    return HttpResponse(renderer.render(data), status=status, headers=headers, content_type="application/json")
+
+
+def as_json_response(response):
+    """json_response() for a DRF Response (errors, the 412 of evaluate_preconditions()); others pass through."""
+    if not hasattr(response, "data"):
+        return response
+    headers = {name: value for name, value in response.items() if name.lower() != "content-type"}
+    return json_response(response.data, response.status_code, headers)
+
+
+def is_conditional(request):
+    return "HTTP_IF_MATCH" in request.META or "HTTP_IF_UNMODIFIED_SINCE" in request.META
+
+
+class AsyncAPIView(View):
+    """
+    The parts of APIView the task API relies on, for async handlers: request
+    parsing, JWT authentication (every endpoint requires it), the default
+    throttles, and DRF exceptions turned into responses by the configured
+    exception handler.
+    """
+
+    authentication = StatelessJWTAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True  # Authenticated by bearer token, never by cookie.
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        if method not in self.http_method_names or not hasattr(self, method):
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+        self.request = request
+        try:
+            await self.authenticate(request)
+            await self.check_throttles(request)
+            return await getattr(self, method)(request, *args, **kwargs)
+        except APIException as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        result = await self.authentication.aauthenticate(request)
+        if result is None:
+            raise NotAuthenticated()
+        request.user, request.auth = result
+
+    async def check_throttles(self, request):
+        waits = []
+        for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+            throttle = throttle_class()
+            if not await throttle.aallow_request(request, self):
+                waits.append(throttle.wait())
+        if waits:
+            raise Throttled(max(waits))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            exc.auth_header = self.authentication.authenticate_header(self.request)
+        context = {"view": self, "args": self.args, "kwargs": self.kwargs, "request": self.request}
+        response = api_settings.EXCEPTION_HANDLER(exc, context)
+        if response is None:
+            raise exc
+        return as_json_response(response)
+
+
+class TaskListCreateAsyncView(AsyncAPIView):
+    @cached_property
+    def paginator(self):
+        return TaskCursorPagination()
+
+    async def get(self, request, *args, **kwargs):
+        queryset = TaskFilterBackend().filter_queryset(request, Task.objects.visible_to(request.user), self)
+        serializer = TaskReadSerializer(get_projected_fields(request))
+        rows = queryset.values(*read_columns(queryset, serializer.fields, self.paginator))
+        page = await self.paginator.apaginate_queryset(rows, request, self)
+        return json_response(serializer.many(page), headers=self.paginator.get_headers())
+
+    async def post(self, request, *args, **kwargs):
+        serializer = TaskSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        task = await create_task(request.user.id, serializer.validated_data)
+        logger.info("Task created successfully by user %s", request.user)
+        return json_response(TaskSerializer(task).data, status=status.HTTP_201_CREATED)
+
+
+class TaskDetailAsyncView(AsyncAPIView):
+    http_method_names = ["get", "put", "patch", "delete", "options"]
+
+    async def get_task(self, request, pk):
+        try:
+            return await Task.objects.visible_to(request.user).aget(pk=pk)
+        except Task.DoesNotExist:
+            logger.warning("Task %s not found for user %s", pk, request.user)
+            raise NotFound({"error": "Task not found"})
+
+    def version_filter(self, request, task):
+        """
+        Rows to write: the task as long as the caller can see it, and when the
+        request is conditional, only in the version the preconditions passed on.
+        """
+        rows = Task.objects.visible_to(request.user).filter(pk=task.pk)
+        return rows.filter(updated_at=task.updated_at) if is_conditional(request) else rows
+
+    def lost_race(self, request):
+        if is_conditional(request):
+            return json_response(
+                {"error": "The task has changed since it was fetched."}, status.HTTP_412_PRECONDITION_FAILED
+            )
+        raise NotFound({"error": "Task not found"})
+
+    async def get(self, request, pk):
+        task = await self.get_task(request, pk)
+        validators = task_validators(task.id, task.updated_at)
+        not_modified = evaluate_preconditions(request, validators)
+        if not_modified is not None:
+            return as_json_response(not_modified)
+        return json_response(TaskReadSerializer().instance_representation(task), headers=validators.headers)
+
+    async def put(self, request, pk):
+        return await self.update(request, pk)
+
+    async def patch(self, request, pk):
+        return await self.update(request, pk, partial=True)
+
+    async def update(self, request, pk, partial=False):
+        task = await self.get_task(request, pk)
+        failed = evaluate_preconditions(request, task_validators(task.id, task.updated_at))
+        if failed is not None:
+            return as_json_response(failed)
+        serializer = TaskSerializer(task, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+
+        changes = {**serializer.validated_data, "updated_at": timezone.now()}
+        if not await update_task(self.version_filter(request, task), task, changes):
+            return self.lost_race(request)
+        logger.info("Task %s updated by user %s (Role: %s)", task.id, request.user, request.user.role)
+        return json_response(TaskSerializer(task).data, headers=task_validators(task.id, task.updated_at).headers)
+
+    async def delete(self, request, pk):
+        task = await self.get_task(request, pk)
+        failed = evaluate_preconditions(request, task_validators(task.id, task.updated_at))
+        if failed is not None:
+            return as_json_response(failed)
+        if not await delete_task(self.version_filter(request, task), task):
+            return self.lost_race(request)
+        logger.info("Task %s deleted by user %s (Role: %s)", task.id, request.user, request.user.role)
+        return json_response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AssignTaskAsyncView(AsyncAPIView):
+    http_method_names = ["put", "patch", "options"]
+
+    async def put(self, request, pk):
+        return await self.patch(request, pk)
+
+    async def patch(self, request, pk):
+        if request.user.role != "ADMIN":
+            logger.warning("Unauthorized access attempt by %s", request.user)
+            raise PermissionDenied({"error": "Only admins can assign tasks"})
+
+        username = request.data.get("username")
+        try:
+            task = await Task.objects.only("id", "title", "user_id", "status", "due_date").aget(pk=pk)
+        except Task.DoesNotExist:
+            logger.error("Task with ID %s not found", pk)
+            raise NotFound({"error": "Task not found"})
+        try:
+            user = await User.objects.only("id", "username").aget(username=username)
+        except User.DoesNotExist:
+            logger.error("User '%s' not found", username)
+            raise NotFound({"error": "User not found"})
+
+        await assign_task(task, user)
+        logger.info("Task '%s' assigned to %s by %s", task.title, user.username, request.user)
+        return json_response({"message": f"Task '{task.title}' assigned to {user.username}"})
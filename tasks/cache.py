@@ -0,0 +1,121 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from task_management.metrics import registry
+
+from .models import Task
+from .signals import task_changed
+
+GENERATION_KEY = "tasks:gen:{}"
+LIST_KEY = "tasks:list:{}:{}:{}"
+ALL = "all"
+
+
+class TaskListCache:
+    """
+    Caches rendered task list pages per scope: one scope per user, plus a
+    shared "all" scope for ADMIN listings, each page keyed by its full URL.
+
+    Invalidation is generational: every scope has a generation stamp that is
+    part of the page keys, and a write replaces the stamp of the affected
+    owners (and of "all"), which orphans their pages at once. Orphaned pages
+    age out through the TTL / LRU eviction of the backing cache, which is the
+    `TASK_CACHE_ALIAS` entry of CACHES. Stamps expire with the same TTL as the
+    pages: list ETags are derived from them, and must not outlive a write the
+    stamp never saw.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        return caches[getattr(settings, "TASK_CACHE_ALIAS", "default")]
+
+    def scope(self, user):
+        return ALL if user.role == "ADMIN" else str(user.id)
+
+    def generation(self, scope):
+        key = GENERATION_KEY.format(scope)
+        value = self.backend.get(key)
+        if value is None:
+            # A fresh stamp rather than a counter, so an evicted stamp can
+            # never come back with a value that matches stale pages.
+            value = time.time_ns()
+            self.backend.add(key, value, timeout=self.timeout)
+            value = self.backend.get(key, value)
+        return value
+
+    def version(self, request):
+        """`(scope, generation)` of the caller's task lists."""
+        scope = self.scope(request.user)
+        return scope, self.generation(scope)
+
+    def key(self, request, version=None):
+        scope, generation = version or self.version(request)
+        digest = hashlib.sha1(request.build_absolute_uri().encode()).hexdigest()
+        return LIST_KEY.format(scope, generation, digest)
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    @property
+    def timeout(self):
+        return getattr(settings, "TASK_CACHE_TIMEOUT", 60)
+
+    def set(self, key, value):
+        self.backend.set(key, value, timeout=self.timeout)
+
+    def invalidate(self, user_ids):
+        stamp = time.time_ns()
+        self.backend.set_many(
+            {GENERATION_KEY.format(scope): stamp for scope in [ALL, *map(str, user_ids)]}, timeout=self.timeout
+        )
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+task_list_cache = TaskListCache()
+
+registry.callback(
+    "task_list_cache_hits_total", "Task list responses served from the cache.",
+    lambda: task_list_cache.stats()["hits"], type="counter",
+)
+registry.callback(
+    "task_list_cache_misses_total", "Task list responses rendered from the database.",
+    lambda: task_list_cache.stats()["misses"], type="counter",
+)
+
+
+@receiver(task_changed)
+def invalidate_task_lists(sender, user_ids=(), **kwargs):
+    user_ids = set(user_ids)
+    task_list_cache.invalidate(user_ids)
+    # Readers may have re-cached pre-commit rows in the meantime; drop them again once committed.
+    transaction.on_commit(lambda: task_list_cache.invalidate(user_ids))
+
+
+@receiver(post_save, sender=Task)
+def invalidate_on_save(sender, instance, raw=False, **kwargs):
+    # Saves made outside the API (admin, shell) don't send task_changed. There is
+    # deliberately no post_delete receiver: it would stop queryset.delete() from
+    # issuing a single DELETE. Deletes outside the API expire with the TTL.
+    if not raw:
+        invalidate_task_lists(sender, user_ids={instance.user_id})
@@ -0,0 +1,143 @@
+"""
+The changes feed behind `GET /api/tasks/changes/`: what happened to the
+caller's tasks since a cursor, instead of the whole list.
+
+It merges two streams, each read from its own position on an index:
+- tasks written since then, by `(updated_at, id)`;
+- TaskTombstone rows, by `(removed_at, id)`. Every API delete, and every
+  reassignment away from a user, records one through `task_changed`.
+ADMINs see every task, so reassignments are not removals for them.
+
+A page is the next `limit` entries of both streams in time order. A task
+that occurs twice in a page keeps only its latest entry. The cursor holds
+both positions. Rows written in the last TASK_CHANGES_SETTLE_SECONDS are
+held back, so that a write committing late does not land behind a cursor
+already handed out. Once a client is caught up, both positions move to that
+cutoff.
+
+Tombstones are kept for TASK_TOMBSTONE_RETENTION_DAYS (`manage.py
+prune_task_tombstones`); an older cursor gets a 410. Deletes outside the API
+(admin, shell, cascades) leave no tombstone.
+"""
+import base64
+import binascii
+import datetime
+import heapq
+import json
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from .models import Task, TaskTombstone
+from .reminders import after
+from .signals import task_changed
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = {"error": "This cursor is older than the change history. Download the tasks again."}
+    default_code = "cursor_expired"
+
+
+@receiver(task_changed)
+def record_tombstones(sender, action=None, removed=None, **kwargs):
+    if removed:
+        now = timezone.now()
+        TaskTombstone.objects.bulk_create(
+            [
+                TaskTombstone(task_id=task_id, user_id=user_id, deleted=action == "deleted", removed_at=now)
+                for task_id, user_id in removed.items()
+            ],
+            batch_size=1000,
+        )
+
+
+def encode_cursor(tasks, removed):
+    payload = {"t": tasks and [tasks[0].isoformat(), tasks[1]], "r": [removed[0].isoformat(), removed[1]]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(encoded):
+    """The `(tasks, removed)` positions in `encoded`; the task position is None before the first task."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+        tasks = None if payload["t"] is None else parse_position(payload["t"])
+        return tasks, parse_position(payload["r"])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise NotFound("Invalid cursor")
+
+
+def parse_position(value):
+    at, pk = value
+    at = parse_datetime(at)
+    if at is None or timezone.is_naive(at):
+        raise ValueError(value)
+    return at, int(pk)
+
+
+def read_changes(user, since, limit, columns):
+    """
+    `(tasks, removed_ids, next_cursor, has_more)` for `user` after the cursor
+    `since` (None for a first download). `tasks` are `.values(*columns)` rows.
+    """
+    now = timezone.now()
+    cutoff = now - datetime.timedelta(seconds=getattr(settings, "TASK_CHANGES_SETTLE_SECONDS", 5))
+    if since:
+        task_position, removed_position = decode_cursor(since)
+        retention = datetime.timedelta(days=getattr(settings, "TASK_TOMBSTONE_RETENTION_DAYS", 30))
+        if removed_position[0] < now - retention:
+            raise CursorExpired()
+    else:
+        # A first download has nothing to remove.
+        task_position, removed_position = None, (cutoff, 0)
+
+    tasks = Task.objects.visible_to(user).filter(updated_at__lt=cutoff)
+    tombstones = TaskTombstone.objects.filter(removed_at__lt=cutoff)
+    if user.role == "ADMIN":
+        tombstones = tombstones.filter(deleted=True)
+    else:
+        tombstones = tombstones.filter(user_id=user.id)
+    columns = list(dict.fromkeys([*columns, "updated_at", "id"]))
+    if task_position is not None:
+        tasks = tasks.filter(after(task_position, "updated_at"))
+    task_rows = tasks.order_by("updated_at", "id").values(*columns)[:limit + 1]
+    removed_rows = (
+        tombstones.filter(after(removed_position, "removed_at"))
+        .order_by("removed_at", "id")
+        .values_list("removed_at", "id", "task_id")[:limit + 1]
+    )
+
+    # Both streams are in time order and hold at least `limit` + 1 entries
+    # unless exhausted, so the first `limit` merged entries come next.
+    entries = list(heapq.merge(
+        ((row["updated_at"], 0, row["id"], row) for row in task_rows),
+        ((removed_at, 1, pk, task_id) for removed_at, pk, task_id in removed_rows),
+        key=lambda entry: entry[:3],
+    ))
+    has_more = len(entries) > limit
+    latest = {}
+    for at, kind, pk, item in entries[:limit]:
+        if kind == 0:
+            task_position, task_id, row = (at, pk), pk, item
+        else:
+            removed_position, task_id, row = (at, pk), item, None
+        latest.pop(task_id, None)
+        latest[task_id] = row
+    if not has_more:
+        task_position = removed_position = cutoff, 0
+
+    changed = [row for row in latest.values() if row is not None]
+    removed = [task_id for task_id, row in latest.items() if row is None]
+    return changed, removed, encode_cursor(task_position, removed_position), has_more
+
+
+def prune_tombstones():
+    """Delete the tombstones older than TASK_TOMBSTONE_RETENTION_DAYS; returns how many."""
+    retention = datetime.timedelta(days=getattr(settings, "TASK_TOMBSTONE_RETENTION_DAYS", 30))
+    deleted, _ = TaskTombstone.objects.filter(removed_at__lt=timezone.now() - retention).delete()
+    return deleted
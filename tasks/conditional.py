@@ -0,0 +1,61 @@
+import calendar
+import hashlib
+
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class Validators:
+    """The ETag / Last-Modified pair describing a task resource."""
+
+    def __init__(self, etag, last_modified=None):
+        self.etag = quote_etag(etag)
+        self.last_modified = calendar.timegm(last_modified.utctimetuple()) if last_modified else None
+
+    @property
+    def headers(self):
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = http_date(self.last_modified)
+        return headers
+
+
+def list_validators(request, scope, generation):
+    """
+    Validators for a task list page, without a query: its URL in the caller's
+    cache scope and that scope's generation, which every write, delete and
+    reassignment through the API replaces (tasks/cache.py). The generation
+    expires with the cached pages, which bounds how long a write the stamp
+    missed (another worker's, one made outside the API) can be answered with
+    a 304. `overdue` lists also change at midnight, so the date is part of
+    theirs. There is no Last-Modified: a delete moves no timestamp.
+    """
+    seed = f"{scope}|{generation}|{request.get_full_path()}"
+    if "overdue" in request.GET:
+        seed += f"|{timezone.localdate().isoformat()}"
+    return Validators(hashlib.md5(seed.encode()).hexdigest())
+
+
+def task_validators(task_id, updated_at):
+    return Validators(f"{task_id}-{updated_at.timestamp():.6f}", updated_at)
+
+
+def evaluate_preconditions(request, validators):
+    """
+    Apply If-None-Match / If-Modified-Since (304 on GET) and If-Match /
+    If-Unmodified-Since (412) to `validators`. Returns the short-circuit
+    response, or None when the request should be processed normally.
+    """
+    response = get_conditional_response(request, etag=validators.etag, last_modified=validators.last_modified)
+    if response is None:
+        return None
+    if response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+        response = Response(
+            {"error": "The task has changed since it was fetched."}, status=status.HTTP_412_PRECONDITION_FAILED
+        )
+    for name, value in validators.headers.items():
+        response[name] = value
+    return response
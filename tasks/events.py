@@ -0,0 +1,269 @@
+"""
+Task change events for the server-sent event stream (tasks/streams.py).
+
+Every `task_changed` is published, once the write has committed, as
+`{"action", "user_ids", "task_ids"}` through the broker chosen by
+TASK_EVENTS_BROKER:
+- "local": delivers to the streams of this process only. It is enough for a
+  single ASGI worker, and it is what the tests use;
+- "postgres": NOTIFY on a channel that every worker LISTENs to, so an event
+  reaches the streams of all workers, whichever process made the write;
+- a dotted path to a class with `publish(message)` and `subscribe(deliver)`.
+
+The broker hands messages to the EventHub of each process. The hub fans them
+out on the event loop to the subscriptions of the owners, and to every ADMIN
+subscription. Each subscription buffers at most TASK_EVENTS_BUFFER encoded
+events. A client that falls further behind loses its buffer and gets one
+`resync` event instead, after which it should catch up with
+/api/tasks/changes/. Publishers never wait for slow clients.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from task_management.metrics import registry
+
+from .signals import task_changed
+
+logger = logging.getLogger("tasks")
+
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+def encode_event(message):
+    """The SSE frame sent for `message`, encoded once for every subscriber."""
+    data = json.dumps({"action": message["action"], "task_ids": message.get("task_ids")}, separators=(",", ":"))
+    return f"event: task\ndata: {data}\n\n".encode()
+
+
+class LocalBroker:
+    """Delivers each message to the subscribers of this process, synchronously."""
+
+    def __init__(self):
+        self.listeners = []
+
+    def publish(self, message):
+        for deliver in self.listeners:
+            deliver(message)
+
+    def subscribe(self, deliver):
+        self.listeners.append(deliver)
+
+
+class PostgresBroker:
+    """
+    PostgreSQL NOTIFY/LISTEN on `channel`. Each subscribing process listens on
+    its own psycopg2 connection in a daemon thread. After a lost connection
+    it reconnects and tells every stream to resync, since notifications sent
+    in between are gone.
+    """
+
+    channel = "task_events"
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    def publish(self, message):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, json.dumps(message)])
+
+    def subscribe(self, deliver):
+        threading.Thread(target=self.listen, args=(deliver,), name="task-events-listener", daemon=True).start()
+
+    def listen(self, deliver):
+        import select
+
+        import psycopg2
+
+        wrapper = connections[self.alias]
+        params = wrapper.get_connection_params()
+        params.pop("pool", None)  # task_management.pooled_postgresql's option, not psycopg2's
+        while True:
+            try:
+                connection = psycopg2.connect(**params)
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                deliver({"action": "resync"})
+                while True:
+                    if select.select([connection], [], [], 30) != ([], [], []):
+                        connection.poll()
+                        while connection.notifies:
+                            deliver(json.loads(connection.notifies.pop(0).payload))
+            except (psycopg2.Error, OSError) as e:
+                logger.error("Task event listener lost its connection: %s", e)
+                time.sleep(1)
+
+
+BROKERS = {"local": LocalBroker, "postgres": PostgresBroker}
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def broker():
+    """The process-wide broker named by TASK_EVENTS_BROKER."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            name = getattr(settings, "TASK_EVENTS_BROKER", "local")
+            _broker = (BROKERS.get(name) or import_string(name))()
+        return _broker
+
+
+class Subscription:
+    """
+    One stream's buffer of encoded events; only touched on the event loop.
+    Idle streams are the common case: the buffer is only allocated once an
+    event arrives, and waiting takes a bare future, woken for keepalives by
+    the hub's tick rather than by a timer of its own.
+    """
+
+    __slots__ = ("user_id", "admin", "size", "buffer", "waiter", "overflowed", "closed")
+
+    def __init__(self, user_id, admin, size):
+        self.user_id = user_id
+        self.admin = admin
+        self.size = size
+        self.buffer = None
+        self.waiter = None
+        self.overflowed = False
+        self.closed = False
+
+    def put(self, frame):
+        if self.overflowed:
+            return
+        if self.buffer is None:
+            self.buffer = deque()
+        if len(self.buffer) >= self.size:
+            self.buffer = None
+            self.overflowed = True
+            hub.dropped += 1
+        else:
+            self.buffer.append(frame)
+        self.wake()
+
+    def resync(self):
+        self.buffer = None
+        self.overflowed = True
+        self.wake()
+
+    def close(self):
+        self.closed = True
+        self.wake()
+
+    def wake(self):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    async def get(self):
+        """The next frame, or None at a keepalive tick and once closed."""
+        if not (self.buffer or self.overflowed or self.closed):
+            self.waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self.waiter
+            finally:
+                self.waiter = None
+        if self.closed:
+            return None
+        if self.overflowed:
+            self.overflowed = False
+            return RESYNC
+        if not self.buffer:
+            return None
+        frame = self.buffer.popleft()
+        if not self.buffer:
+            self.buffer = None
+        return frame
+
+
+class EventHub:
+    """The subscriptions of this process, by owner, and the event loop they live on."""
+
+    def __init__(self):
+        self.users = {}
+        self.admins = set()
+        self.loop = None
+        self.listening = False
+        self.open = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id, admin):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Subscriptions are bound to the loop that serves them (one per worker).
+            self.loop, self.users, self.admins, self.open = loop, {}, set(), 0
+            loop.call_later(getattr(settings, "TASK_EVENTS_KEEPALIVE", 15), self.tick, loop)
+        if not self.listening:
+            broker().subscribe(self.deliver_threadsafe)
+            self.listening = True
+        subscription = Subscription(user_id, admin, getattr(settings, "TASK_EVENTS_BUFFER", 100))
+        if admin:
+            self.admins.add(subscription)
+        else:
+            self.users.setdefault(user_id, set()).add(subscription)
+        self.open += 1
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscriptions = self.admins if subscription.admin else self.users.get(subscription.user_id, ())
+        if subscription not in subscriptions:
+            return  # Dropped when the hub moved to another loop.
+        subscriptions.remove(subscription)
+        self.open -= 1
+        if not subscriptions and not subscription.admin:
+            del self.users[subscription.user_id]
+
+    def tick(self, loop):
+        """Wake every stream for a keepalive: one timer per process instead of one per stream."""
+        if loop is not self.loop:
+            return
+        for subscription in [*self.admins, *(s for subs in self.users.values() for s in subs)]:
+            subscription.wake()
+        loop.call_later(getattr(settings, "TASK_EVENTS_KEEPALIVE", 15), self.tick, loop)
+
+    def deliver_threadsafe(self, message):
+        """Hand `message` to the event loop; callable from any thread."""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self.deliver, message)
+        except RuntimeError:  # The loop closed in the meantime.
+            pass
+
+    def deliver(self, message):
+        if message.get("action") == "resync":
+            for subscription in [*self.admins, *(s for subs in self.users.values() for s in subs)]:
+                subscription.resync()
+            return
+        frame = encode_event(message)
+        for subscription in self.admins:
+            subscription.put(frame)
+        for user_id in message.get("user_ids", ()):
+            for subscription in self.users.get(user_id, ()):
+                subscription.put(frame)
+
+
+hub = EventHub()
+
+registry.callback("task_event_streams", "Open task event streams in this process.", lambda: hub.open)
+registry.callback(
+    "task_event_overflows_total", "Task event buffers dropped for a resync because the client fell behind.",
+    lambda: hub.dropped, type="counter",
+)
+
+
+@receiver(task_changed)
+def publish_task_event(sender, action=None, user_ids=(), task_ids=None, **kwargs):
+    if task_ids is not None and len(task_ids) > getattr(settings, "TASK_EVENTS_MAX_IDS", 100):
+        task_ids = None  # Too many to list: clients fetch the changes instead.
+    message = {"action": action, "user_ids": sorted(user_ids), "task_ids": None if task_ids is None else list(task_ids)}
+    transaction.on_commit(lambda: broker().publish(message), robust=True)
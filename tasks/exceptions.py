@@ -1,3 +1,5 @@
+from rest_framework.exceptions import Throttled
+from rest_framework.response import Response
 from rest_framework.views import exception_handler
 import logging
 
@@ -9,9 +11,9 @@ def custom_exception_handler(exc, context):
     """
     response = exception_handler(exc, context)
 
-    # Log the error
-    if response is not None:
-        logger.error(f"Exception occurred: {exc}, Context: {context}")
+    # Log the error; a flood of throttled requests would only flood the log.
+    if response is not None and not isinstance(exc, Throttled):
+        logger.error("Exception occurred: %s, Context: %s", exc, context)
 
     # Return the standard response if DRF handled it
     if response is not None:
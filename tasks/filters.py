@@ -0,0 +1,121 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from .models import TaskStatus
+from .serializers import TaskSerializer
+
+ORDERING_FIELDS = ("created_at", "updated_at", "due_date", "title", "status")
+FILTER_PARAMS = ("status", "due_after", "due_before", "overdue", "ordering", "fields")
+BOOLEAN_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+
+def get_projected_fields(request):
+    """
+    The serializer fields requested with `?fields=a,b`, or None for all of them.
+    Only honoured on reads.
+    """
+    raw = request.query_params.get("fields")
+    if not raw or request.method != "GET":
+        return None
+    fields = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in TaskSerializer.Meta.fields]
+    if unknown or not fields:
+        raise ValidationError({"fields": [f"Unknown field(s): {', '.join(unknown) or raw}."]})
+    return fields
+
+
+def read_columns(queryset, fields, paginator=None):
+    """The columns to load with `.values()` to render `fields` and paginate by the query's ordering."""
+    ordering = queryset.query.order_by or getattr(paginator, "ordering", ())
+    return list(dict.fromkeys([*fields, *(name.lstrip("-") for name in ordering), "id"]))
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Pushes the task list query parameters into the ORM query:
+
+    - `status=PENDING,IN_PROGRESS`
+    - `due_after=YYYY-MM-DD` / `due_before=YYYY-MM-DD` (inclusive)
+    - `overdue=true` (past due and not COMPLETED)
+    - `ordering=-due_date,title` (the primary key is always the tie-breaker)
+    - `fields=id,title` (columns not requested are never loaded)
+
+    Any other query parameter is rejected with a 400 instead of being ignored.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        self.check_unknown_params(params, view)
+
+        if "status" in params:
+            statuses = [value.strip() for value in params["status"].split(",")]
+            invalid = [value for value in statuses if value not in TaskStatus.values]
+            if invalid:
+                raise ValidationError({"status": [f"Invalid status: {', '.join(invalid)}."]})
+            queryset = queryset.filter(status__in=statuses)
+
+        if "due_after" in params:
+            queryset = queryset.filter(due_date__gte=self.parse_date(params, "due_after"))
+        if "due_before" in params:
+            queryset = queryset.filter(due_date__lte=self.parse_date(params, "due_before"))
+
+        if self.parse_bool(params, "overdue"):
+            queryset = queryset.filter(due_date__lt=timezone.localdate()).exclude(status=TaskStatus.COMPLETED)
+
+        ordering = self.get_ordering(params)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+
+        fields = get_projected_fields(request)
+        if fields:
+            # Keep the ordering columns loaded: the paginator reads them to build cursors.
+            default = getattr(getattr(view, "paginator", None), "ordering", ())
+            sort_columns = [name.lstrip("-") for name in ordering or default]
+            queryset = queryset.only(*dict.fromkeys(fields + sort_columns))
+        return queryset
+
+    def check_unknown_params(self, params, view):
+        allowed = set(getattr(view, "filter_params", FILTER_PARAMS)) | {api_settings.URL_FORMAT_OVERRIDE}
+        allowed.update(getattr(view, "extra_query_params", ()))
+        paginator = getattr(view, "paginator", None)
+        if paginator is not None:
+            allowed.update(
+                getattr(paginator, name)
+                for name in ("cursor_query_param", "page_size_query_param")
+                if hasattr(paginator, name)
+            )
+        unknown = sorted(set(params) - allowed)
+        if unknown:
+            raise ValidationError({name: ["Unknown query parameter."] for name in unknown})
+
+    def get_ordering(self, params):
+        raw = params.get("ordering")
+        if not raw:
+            return None
+        ordering = [name.strip() for name in raw.split(",") if name.strip()]
+        invalid = [name for name in ordering if name.lstrip("-") not in ORDERING_FIELDS]
+        if invalid or not ordering:
+            raise ValidationError({"ordering": [f"Cannot order by: {', '.join(invalid) or raw}."]})
+        return ordering
+
+    @staticmethod
+    def parse_date(params, name):
+        try:
+            value = parse_date(params[name])
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValidationError({name: ["Expected a date in YYYY-MM-DD format."]})
+        return value
+
+    @staticmethod
+    def parse_bool(params, name):
+        if name not in params:
+            return False
+        try:
+            return BOOLEAN_VALUES[params[name].lower()]
+        except KeyError:
+            raise ValidationError({name: ["Expected true or false."]})
@@ -0,0 +1,183 @@
+"""
+Bulk task import from CSV or NDJSON, behind `manage.py import_tasks` and
+POST /api/tasks/import/.
+
+The file is read one record at a time and handled in chunks: each chunk is
+validated by a single TaskSerializer, the owners it names are looked up in
+one query (and remembered for the following chunks), and its valid rows are
+written with one bulk_create. Memory use depends on the chunk size, not on
+the size of the file.
+"""
+import codecs
+import csv
+import itertools
+import json
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import Task
+from .serializers import TaskSerializer
+from .signals import task_changed
+from .stats import count_changes, counter_key
+
+User = get_user_model()
+
+FORMATS = ("ndjson", "csv")
+EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+INVALID_UTF8 = "Invalid UTF-8."
+
+
+def detect_type(filename, default="ndjson"):
+    return EXTENSIONS.get(os.path.splitext(filename or "")[1].lower(), default)
+
+
+def decode_lines(stream, bad_lines):
+    """
+    Yield the lines of the binary `stream` as text. The numbers of lines that
+    are not UTF-8 are added to `bad_lines`, and their text is yielded with
+    replacement characters, so that the lines after them are still read.
+    """
+    for number, line in enumerate(stream, 1):
+        if number == 1 and line.startswith(codecs.BOM_UTF8):
+            line = line[len(codecs.BOM_UTF8):]
+        try:
+            yield line.decode("utf-8")
+        except UnicodeDecodeError:
+            bad_lines.add(number)
+            yield line.decode("utf-8", errors="replace")
+
+
+def read_rows(stream, import_type):
+    """Yield `(line number, row, parse error)` for every record in the binary `stream`."""
+    bad_lines = set()
+    lines = decode_lines(stream, bad_lines)
+    if import_type == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            if bad_lines:  # Only lines of this record have been read since the last one.
+                bad_lines.clear()
+                yield reader.line_num, None, {"non_field_errors": [INVALID_UTF8]}
+            else:
+                yield reader.line_num, row, None
+    else:
+        for number, line in enumerate(lines, 1):
+            if bad_lines:
+                bad_lines.clear()
+                yield number, None, {"non_field_errors": [INVALID_UTF8]}
+            elif line.strip():
+                try:
+                    yield number, json.loads(line), None
+                except ValueError as exc:
+                    yield number, None, {"non_field_errors": [f"Invalid JSON: {exc}"]}
+
+
+class TaskImporter:
+    """
+    Imports rows into `Task`. A row's `username` names its owner; rows without
+    one belong to `owner`. With `allow_other_owners=False` only `owner` may be
+    named. Rejected rows are counted, the first `max_errors` of them kept in
+    `errors`, and every one passed to `on_reject(line, row, errors)`.
+    """
+
+    def __init__(self, owner=None, allow_other_owners=True, chunk_size=None, dry_run=False, max_errors=100,
+                 on_reject=None):
+        self.owner = owner
+        self.allow_other_owners = allow_other_owners
+        self.chunk_size = chunk_size or getattr(settings, "TASK_IMPORT_CHUNK_SIZE", 1000)
+        self.dry_run = dry_run
+        self.max_errors = max_errors
+        self.on_reject = on_reject
+        self.user_ids = {} if owner is None else {owner.username: owner.id}
+        self.rows = self.created = self.rejected = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    def run(self, records):
+        start = time.perf_counter()
+        records = iter(records)
+        while chunk := list(itertools.islice(records, self.chunk_size)):
+            self.import_chunk(chunk)
+        self.seconds = time.perf_counter() - start
+        return self
+
+    def import_chunk(self, chunk):
+        self.rows += len(chunk)
+        parsed, rejects = [], []
+        for line, row, error in chunk:
+            if error is None:
+                parsed.append((line, row))
+            else:
+                rejects.append((line, row, error))
+
+        self.resolve_owners(row.get("username") for _, row in parsed if isinstance(row, dict))
+        serializer = TaskSerializer(data=[row for _, row in parsed], many=True)
+        serializer.validate_items()
+        errors = {item["index"]: item["errors"] for item in serializer.item_errors}
+        owners = {}
+        for index, (_, row) in enumerate(parsed):
+            owner_id, owner_error = self.owner_of(row) if isinstance(row, dict) else (None, None)
+            if owner_error:
+                errors[index] = {**errors.get(index, {}), "username": [owner_error]}
+            owners[index] = owner_id
+
+        tasks = [Task(user_id=owners[index], **data) for index, data in serializer.valid_items if index not in errors]
+        rejects += [(*parsed[index], row_errors) for index, row_errors in errors.items()]
+        for line, row, row_errors in sorted(rejects, key=lambda reject: reject[0]):
+            self.reject(line, row, row_errors)
+        if tasks and not self.dry_run:
+            with transaction.atomic():
+                Task.objects.bulk_create(tasks, batch_size=self.chunk_size)
+                counts = count_changes(after=map(counter_key, tasks))
+                task_changed.send(sender=Task, action="created", user_ids={task.user_id for task in tasks},
+                                  counts=counts, task_ids=[task.id for task in tasks if task.id is not None])
+        self.created += len(tasks)
+
+    def resolve_owners(self, usernames):
+        """Look up the usernames not seen in earlier chunks with one query."""
+        if not self.allow_other_owners:
+            return  # Only `owner` may be named, and it is known already.
+        missing = {name for name in usernames if name and isinstance(name, str) and name not in self.user_ids}
+        if missing:
+            found = dict(User.objects.filter(username__in=missing).values_list("username", "id"))
+            self.user_ids.update({name: found.get(name) for name in missing})
+
+    def owner_of(self, row):
+        """`(user id, None)` for the owner of `row`, or `(None, error message)`."""
+        username = row.get("username")
+        if username is not None and not isinstance(username, str):
+            return None, "Not a valid string."
+        if not username:
+            if self.owner is None:
+                return None, "This field is required."
+            return self.owner.id, None
+        if not self.allow_other_owners and username != self.owner.username:
+            return None, "Only admins can import tasks for other users."
+        user_id = self.user_ids.get(username)
+        if user_id is None:
+            return None, "User not found."
+        return user_id, None
+
+    def reject(self, line, row, errors):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+        if self.on_reject is not None:
+            self.on_reject(line, row, errors)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def report(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
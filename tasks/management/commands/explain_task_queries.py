@@ -0,0 +1,123 @@
+import datetime
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tasks.models import Task, TaskStatus
+from tasks.views import TaskListCreateView, TaskRetrieveUpdateDeleteView
+
+User = get_user_model()
+
+SEQUENTIAL_SCAN = {
+    "postgresql": re.compile(r"Seq Scan on tasks_task\b"),
+    "sqlite": re.compile(r"\bSCAN tasks_task\b(?!\s+USING)"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the task list/detail views, EXPLAIN every query they issue against tasks_task "
+        "and fail if any of them is planned as a sequential scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100, help="Users to seed (default: 100).")
+        parser.add_argument("--tasks", type=int, default=100000, help="Tasks to seed (default: 100000).")
+        parser.add_argument(
+            "--no-seed", action="store_true", help="Explain against the existing data instead of seeding."
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQUENTIAL_SCAN.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Unsupported database backend: {connection.vendor}")
+
+        # Everything, seed data included, is rolled back at the end.
+        with transaction.atomic():
+            if options["no_seed"]:
+                user = User.objects.filter(role="USER", task__isnull=False).first()
+                admin = User.objects.filter(role="ADMIN").first()
+                if user is None or admin is None:
+                    raise CommandError("Need an ADMIN and a USER with tasks; run without --no-seed.")
+            else:
+                admin, user = self.seed(options["users"], options["tasks"])
+            self.analyze()
+            failures = self.explain_views(pattern, admin, user)
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{failures} task quer{'y' if failures == 1 else 'ies'} planned as a sequential scan.")
+        self.stdout.write(self.style.SUCCESS("No sequential scans on tasks_task."))
+
+    def seed(self, users, tasks):
+        self.stdout.write(f"Seeding {users} users and {tasks} tasks...")
+        admin = User.objects.create(username="explain-admin", role="ADMIN")
+        owners = User.objects.bulk_create(
+            User(username=f"explain-user-{i}", role="USER") for i in range(max(users, 1))
+        )
+        statuses = list(TaskStatus.values)
+        today = datetime.date.today()
+        batch = []
+        for i in range(tasks):
+            batch.append(Task(
+                user=owners[i % len(owners)],
+                title=f"Task {i}",
+                description="",
+                status=statuses[i % len(statuses)],
+                due_date=today + datetime.timedelta(days=i % 365 - 90),
+            ))
+            if len(batch) == 5000:
+                Task.objects.bulk_create(batch)
+                batch = []
+        Task.objects.bulk_create(batch)
+        return admin, owners[0]
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+    def explain_views(self, pattern, admin, user):
+        factory = APIRequestFactory(SERVER_NAME="localhost")
+        list_view = TaskListCreateView.as_view()
+        detail_view = TaskRetrieveUpdateDeleteView.as_view()
+        task_id = Task.objects.filter(user_id=user.id).values_list("id", flat=True).first()
+
+        def call(view, as_user, url, **kwargs):
+            request = factory.get(url)
+            force_authenticate(request, user=as_user)
+            return view(request, **kwargs)
+
+        captured = []
+        for label, as_user in (("USER", user), ("ADMIN", admin)):
+            with CaptureQueriesContext(connection) as queries:
+                response = call(list_view, as_user, "/api/tasks/")
+                next_url = self.next_link(response)
+                if next_url:
+                    call(list_view, as_user, next_url[next_url.index("/api/"):])
+                call(detail_view, as_user, f"/api/tasks/{task_id}/", pk=task_id)
+            captured += [(label, query["sql"]) for query in queries.captured_queries]
+
+        failures = 0
+        prefix = connection.ops.explain_query_prefix()
+        for label, sql in captured:
+            if not sql.lstrip().upper().startswith("SELECT") or Task._meta.db_table not in sql:
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}")
+                plan = "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+            ok = not pattern.search(plan)
+            failures += not ok
+            status = self.style.SUCCESS("OK") if ok else self.style.ERROR("SEQ SCAN")
+            self.stdout.write(f"[{status}] {label}: {sql}\n{plan}\n")
+        return failures
+
+    @staticmethod
+    def next_link(response):
+        for part in response.headers.get("Link", "").split(", "):
+            if 'rel="next"' in part:
+                return part.split(";")[0][1:-1]
+        return None
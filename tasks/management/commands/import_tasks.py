@@ -0,0 +1,69 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importer import FORMATS, TaskImporter, detect_type, read_rows
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks from a CSV or NDJSON file (columns/keys: title, description, due_date, status, "
+        "username). The file is streamed and written in chunks with bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for standard input.")
+        parser.add_argument("--type", choices=FORMATS, help="File format (default: from the file extension, else ndjson).")
+        parser.add_argument("--owner", help="Username owning the rows that have no username.")
+        parser.add_argument("--chunk-size", type=int, help="Rows validated and written at a time (default: TASK_IMPORT_CHUNK_SIZE).")
+        parser.add_argument("--rejects", help="Write every rejected row, with its errors, to this NDJSON file.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only; write nothing.")
+
+    def handle(self, *args, **options):
+        owner = None
+        if options["owner"]:
+            owner = User.objects.filter(username=options["owner"]).first()
+            if owner is None:
+                raise CommandError(f"User '{options['owner']}' not found.")
+        import_type = options["type"] or detect_type(options["path"])
+
+        rejects = open(options["rejects"], "w", encoding="utf-8") if options["rejects"] else None
+
+        def write_reject(line, row, errors):
+            rejects.write(json.dumps({"line": line, "row": row, "errors": errors}) + "\n")
+
+        try:
+            importer = TaskImporter(
+                owner=owner,
+                chunk_size=options["chunk_size"],
+                dry_run=options["dry_run"],
+                max_errors=10,
+                on_reject=write_reject if rejects else None,
+            )
+            if options["path"] == "-":
+                importer.run(read_rows(sys.stdin.buffer, import_type))
+            else:
+                try:
+                    stream = open(options["path"], "rb")
+                except OSError as e:
+                    raise CommandError(f"Cannot open {options['path']}: {e}")
+                with stream:
+                    importer.run(read_rows(stream, import_type))
+        finally:
+            if rejects is not None:
+                rejects.close()
+
+        for error in importer.errors:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        if importer.rejected > len(importer.errors):
+            self.stderr.write(f"... and {importer.rejected - len(importer.errors)} more rejected rows.")
+        verb = "Validated" if options["dry_run"] else "Imported"
+        summary = (
+            f"{verb} {importer.created} tasks, rejected {importer.rejected}, out of {importer.rows} rows "
+            f"in {importer.seconds:.2f} s ({importer.rows_per_second:.0f} rows/s)."
+        )
+        self.stdout.write(self.style.WARNING(summary) if importer.rejected else self.style.SUCCESS(summary))
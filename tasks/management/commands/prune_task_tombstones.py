@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tasks.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of deleted and reassigned tasks older than TASK_TOMBSTONE_RETENTION_DAYS. "
+        "Clients whose changes cursor is older than that download their tasks again."
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} task tombstones."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from tasks.stats import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the task statistics counters (TaskCounter) from a GROUP BY over the tasks table. "
+        "Needed after writes that bypass the API, e.g. in the admin or when users are deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many counters are wrong.")
+
+    def handle(self, *args, **options):
+        wrong = reconcile_counters(dry_run=options["dry_run"])
+        if not wrong:
+            self.stdout.write(self.style.SUCCESS("Task counters are up to date."))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{wrong} task counters are wrong."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Corrected {wrong} task counters."))
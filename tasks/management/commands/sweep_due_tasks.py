@@ -0,0 +1,42 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.reminders import SINKS, DueSweeper, get_sink
+
+
+class Command(BaseCommand):
+    help = (
+        "Send reminders for tasks that became overdue or due within --days since the last run. "
+        "Each run only reads the tasks past its saved positions, not the whole table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sink", help=f"{', '.join(SINKS)} or a dotted path (default: TASK_REMINDER_SINK).")
+        parser.add_argument("--days", type=int, help="Due-soon horizon in days (default: TASK_DUE_SOON_DAYS).")
+        parser.add_argument("--batch-size", type=int, help="Events per sink call (default: TASK_REMINDER_BATCH_SIZE).")
+        parser.add_argument("--name", default="default", help="Sweep whose positions to use and advance.")
+        parser.add_argument("--loop", action="store_true", help="Keep running, every --interval seconds, until stopped.")
+        parser.add_argument("--interval", type=float, help="Seconds between runs with --loop (default: TASK_REMINDER_INTERVAL).")
+
+    def handle(self, *args, **options):
+        try:
+            sink = get_sink(options["sink"])
+        except (ImportError, ValueError) as e:
+            raise CommandError(f"Invalid sink: {e}")
+        sweeper = DueSweeper(sink, days=options["days"], batch_size=options["batch_size"], name=options["name"])
+
+        if not options["loop"]:
+            sent = sweeper.run()
+            self.stdout.write(self.style.SUCCESS(
+                f"Sent {sent['overdue']} overdue and {sent['due_soon']} due-soon reminders."
+            ))
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+        self.stdout.write("Sweeping for due tasks until interrupted (SIGINT/SIGTERM).")
+        sweeper.run_forever(options["interval"], stop=stop)
+        self.stdout.write("Stopped.")
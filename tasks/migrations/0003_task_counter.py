@@ -0,0 +1,50 @@
+# Generated by Django 4.2.19 on 2026-10-18 06:23
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.comparison
+
+
+def fill_counters(apps, schema_editor):
+    """Count the existing tasks, as reconcile_task_counters would."""
+    Task = apps.get_model('tasks', 'Task')
+    TaskCounter = apps.get_model('tasks', 'TaskCounter')
+    counts = {}
+    groups = Task.objects.order_by().values_list('user_id', 'status', 'due_date').annotate(n=models.Count('id'))
+    for user_id, status, due_date, n in groups:
+        for owner in (user_id, None):
+            counts[owner, status, None] = counts.get((owner, status, None), 0) + n
+            if status != 'COMPLETED':
+                counts[owner, status, due_date] = counts.get((owner, status, due_date), 0) + n
+    TaskCounter.objects.bulk_create(
+        [TaskCounter(user_id=user_id, status=status, due_date=due_date, count=n) for (user_id, status, due_date), n in counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0002_task_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed')], max_length=20)),
+                ('due_date', models.DateField(null=True)),
+                ('count', models.BigIntegerField(default=0)),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='taskcounter',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('user', models.Value(0)), models.F('status'), django.db.models.functions.comparison.Coalesce('due_date', models.Value(datetime.date(1, 1, 1))), name='task_counter_key'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
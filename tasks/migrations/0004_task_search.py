@@ -0,0 +1,77 @@
+# Generated by Django 4.2.19 on 2026-10-18 07:05
+
+from django.db import migrations
+
+# The search index lives outside the model: the database maintains it on every
+# write, bulk_create()/update() included. See tasks/search.py. On SQLite the
+# owner is indexed too, so that a user's search only reads their own postings.
+FORWARD = {
+    'postgresql': [
+        """
+        ALTER TABLE tasks_task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX task_search_idx ON tasks_task USING gin (search_vector)",
+    ],
+    'sqlite': [
+        """
+        CREATE VIRTUAL TABLE tasks_task_fts USING fts5(
+            title, description, user_id, content='tasks_task', content_rowid='id', tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+            INSERT INTO tasks_task_fts (rowid, title, description, user_id)
+            VALUES (new.id, new.title, new.description, new.user_id);
+        END
+        """,
+        """
+        CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+            INSERT INTO tasks_task_fts (tasks_task_fts, rowid, title, description, user_id)
+            VALUES ('delete', old.id, old.title, old.description, old.user_id);
+        END
+        """,
+        """
+        CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title, description, user_id ON tasks_task BEGIN
+            INSERT INTO tasks_task_fts (tasks_task_fts, rowid, title, description, user_id)
+            VALUES ('delete', old.id, old.title, old.description, old.user_id);
+            INSERT INTO tasks_task_fts (rowid, title, description, user_id)
+            VALUES (new.id, new.title, new.description, new.user_id);
+        END
+        """,
+        "INSERT INTO tasks_task_fts (tasks_task_fts) VALUES ('rebuild')",
+    ],
+}
+
+BACKWARD = {
+    'postgresql': [
+        "DROP INDEX IF EXISTS task_search_idx",
+        "ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector",
+    ],
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS tasks_task_fts_insert",
+        "DROP TRIGGER IF EXISTS tasks_task_fts_delete",
+        "DROP TRIGGER IF EXISTS tasks_task_fts_update",
+        "DROP TABLE IF EXISTS tasks_task_fts",
+    ],
+}
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_counter'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(FORWARD), run(BACKWARD)),
+    ]
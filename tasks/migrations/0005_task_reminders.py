@@ -0,0 +1,44 @@
+# Generated by Django 4.2.19 on 2026-10-18 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderSweep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('overdue_due_date', models.DateField(null=True)),
+                ('overdue_task_id', models.BigIntegerField(null=True)),
+                ('due_soon_due_date', models.DateField(null=True)),
+                ('due_soon_task_id', models.BigIntegerField(null=True)),
+                ('changed_at', models.DateTimeField(null=True)),
+                ('changed_task_id', models.BigIntegerField(null=True)),
+                ('last_run_at', models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('kind', models.CharField(choices=[('overdue', 'Overdue'), ('due_soon', 'Due soon')], max_length=20)),
+                ('task_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('due_date', models.DateField()),
+                ('payload', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at', 'id'], name='task_updated_idx'),
+        ),
+    ]
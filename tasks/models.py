@@ -1,6 +1,10 @@
+import datetime
+
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -9,6 +13,14 @@ class TaskStatus(models.TextChoices):
     IN_PROGRESS = "IN_PROGRESS", "In Progress"
     COMPLETED = "COMPLETED", "Completed"
 
+class TaskQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Tasks `user` may see: everything for ADMINs, otherwise their own."""
+        if user.role == "ADMIN":
+            return self.all()
+        return self.filter(user_id=user.id)
+
+
 class Task(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tasks")
     title = models.CharField(max_length=255)
@@ -23,5 +35,112 @@ class Task(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Per-user list filtered by status and sorted by due date.
+            models.Index(fields=["user", "status", "due_date"], name="task_user_status_due_idx"),
+            # Per-user keyset pagination on (created_at, id).
+            models.Index(fields=["user", "created_at", "id"], name="task_user_created_idx"),
+            # ADMIN keyset pagination over the whole table.
+            models.Index(fields=["created_at", "id"], name="task_created_idx"),
+            # Tasks written since a point in time (reminder sweep, ADMIN changes feed).
+            models.Index(fields=["updated_at", "id"], name="task_updated_idx"),
+            # Per-user changes feed on (updated_at, id).
+            models.Index(fields=["user", "updated_at", "id"], name="task_user_updated_idx"),
+            # Open tasks by due date (overdue / due-soon scans).
+            models.Index(
+                fields=["due_date", "id"],
+                name="task_open_due_idx",
+                condition=~models.Q(status=TaskStatus.COMPLETED),
+            ),
+        ]
+
     def __str__(self):
         return self.title
+
+
+class TaskCounter(models.Model):
+    """
+    Task counts kept up to date as tasks are written (see tasks/stats.py), so
+    statistics never have to scan tasks_task. A row counts the tasks of `user`
+    (all users when null) in `status`: in total when `due_date` is null,
+    otherwise those due on that date, for the statuses that can be overdue.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=TaskStatus.choices)
+    due_date = models.DateField(null=True)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # One row per key; null user/due_date count as values here, unlike in a plain unique constraint.
+            models.UniqueConstraint(
+                Coalesce("user", models.Value(0)),
+                "status",
+                Coalesce("due_date", models.Value(datetime.date.min)),
+                name="task_counter_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id or 'all'}/{self.status}/{self.due_date or 'total'}: {self.count}"
+
+
+class ReminderKind(models.TextChoices):
+    OVERDUE = "overdue", "Overdue"
+    DUE_SOON = "due_soon", "Due soon"
+
+
+class ReminderSweep(models.Model):
+    """
+    How far the reminder sweep named `name` has got (see tasks/reminders.py):
+    the last `(due_date, id)` reported overdue and due soon, and the last
+    `(updated_at, id)` checked for tasks changed behind those positions.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    overdue_due_date = models.DateField(null=True)
+    overdue_task_id = models.BigIntegerField(null=True)
+    due_soon_due_date = models.DateField(null=True)
+    due_soon_task_id = models.BigIntegerField(null=True)
+    changed_at = models.DateTimeField(null=True)
+    changed_task_id = models.BigIntegerField(null=True)
+    last_run_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return self.name
+
+
+class TaskReminder(models.Model):
+    """Outbox of reminder events, written by OutboxSink for another process to deliver."""
+    key = models.CharField(max_length=100, unique=True)
+    kind = models.CharField(max_length=20, choices=ReminderKind.choices)
+    task_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    due_date = models.DateField()
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.key
+
+
+class TaskTombstone(models.Model):
+    """
+    A task that left `user`'s list, for the changes feed (see tasks/changes.py):
+    deleted, or reassigned to someone else when `deleted` is False.
+    """
+    task_id = models.BigIntegerField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    deleted = models.BooleanField()
+    removed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "removed_at", "id"], name="tombstone_user_removed_idx"),
+            models.Index(fields=["removed_at", "id"], name="tombstone_removed_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} {'deleted' if self.deleted else 'reassigned'} from {self.user_id}"
@@ -0,0 +1,219 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination with opaque cursors.
+
+    Pages are selected with a `WHERE (a, b) > (x, y)` style filter on the
+    ordering columns instead of OFFSET, so every page costs the same no matter
+    how deep the client has scrolled. The ordering always ends with the primary
+    key, which makes it total and keeps pages stable while rows are inserted.
+
+    The response body stays a plain list; the cursors for the adjacent pages
+    are returned in a `Link` header (RFC 8288).
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = ("created_at", "id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = getattr(settings, "API_PAGE_SIZE", 50)
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 500)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.finish_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views: the page is fetched with the async ORM."""
+        return self.finish_page([item async for item in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """The unevaluated query for the requested page, plus one extra row."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+        self.fields = self.get_ordering(queryset)
+
+        self.position, self.reverse = self.decode_cursor(request)
+        if self.position is not None:
+            self.position = self.clean_position(self.position, queryset.model)
+        order = [self._flip(field) if self.reverse else field for field in self.fields]
+        queryset = queryset.order_by(*order)
+        if self.position is not None:
+            queryset = queryset.filter(self._seek(order, self.position))
+        # One extra row tells us whether there is anything past this page.
+        return queryset[:self.limit + 1]
+
+    def finish_page(self, results):
+        """Trim the rows fetched from page_queryset() to the page and work out the cursors."""
+        position, reverse = self.position, self.reverse
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or reverse:
+                self.next_position = self._position(results[-1])
+            if (has_more and reverse) or (position is not None and not reverse):
+                self.previous_position = self._position(results[0])
+        elif reverse and position is not None:
+            # Paged back past the first row: offer the way forward again.
+            self.next_position = position
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(data, headers=self.get_headers())
+
+    def get_headers(self):
+        links = []
+        next_url = self.get_next_link()
+        if next_url:
+            links.append(f'<{next_url}>; rel="next"')
+        previous_url = self.get_previous_link()
+        if previous_url:
+            links.append(f'<{previous_url}>; rel="prev"')
+        return {"Link": ", ".join(links)} if links else {}
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.previous_position, reverse=True)
+        )
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """
+        Use the ordering already applied to the queryset, falling back to
+        `ordering`, and make sure it ends with the primary key.
+        """
+        fields = tuple(queryset.query.order_by) or self.ordering
+        if fields[-1].lstrip("-") not in ("id", "pk"):
+            fields += ("-id" if fields[-1].startswith("-") else "id",)
+        return fields
+
+    def encode_cursor(self, position, reverse=False):
+        payload = {"o": list(self.fields), "p": position}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            position = payload["p"]
+            reverse = bool(payload.get("r"))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor is only valid for the ordering it was issued under.
+        if payload.get("o") != list(self.fields) or not isinstance(position, list) or len(position) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def clean_position(self, position, model=None):
+        """`position` with each value converted for its ordering field; a 404 for values that do not fit."""
+        try:
+            return [self._clean_value(model, field.lstrip("-"), value) for field, value in zip(self.fields, position)]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _clean_value(model, name, value):
+        if value is None or isinstance(value, (list, dict)):
+            raise TypeError(value)
+        try:
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except (AttributeError, FieldDoesNotExist):
+            # Not a model field (a search rank): only numbers are positions.
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise TypeError(value)
+            return value
+        return field.to_python(value)
+
+    def _position(self, item):
+        values = []
+        for field in self.fields:
+            value = self._value(item, field.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return values
+
+    def _value(self, item, name):
+        if isinstance(item, dict):
+            return item["id" if name == "pk" else name]
+        return getattr(item, name)
+
+    def _seek(self, order, position):
+        """
+        Build the "comes after `position`" condition for `order`.
+
+        Expands the row comparison into OR-ed prefixes and adds a sargable
+        bound on the leading column so the planner can range-scan the index.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(order, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        leading = order[0].lstrip("-")
+        bound = "lte" if order[0].startswith("-") else "gte"
+        return Q(**{f"{leading}__{bound}": position[0]}) & condition
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+
+class TaskCursorPagination(KeysetPagination):
+    ordering = ("created_at", "id")
+
+
+class TaskSearchPagination(KeysetPagination):
+    """Keyset pages of ranked search results: best match first, by `(rank, id)`."""
+
+    ordering = ("-rank", "id")
+
+    def paginate_search(self, search, request):
+        """Page through `search(position, reverse, limit)`, which returns rows in `ordering` (flipped if `reverse`)."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+        self.fields = self.ordering
+        self.position, self.reverse = self.decode_cursor(request)
+        if self.position is not None:
+            self.position = self.clean_position(self.position)
+        return self.finish_page(search(self.position, self.reverse, self.limit + 1))
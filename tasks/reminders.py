@@ -0,0 +1,224 @@
+"""
+Overdue and due-soon reminders, found incrementally by
+`manage.py sweep_due_tasks`.
+
+A sweep keeps three keyset positions in its ReminderSweep row and only reads
+past them:
+- overdue: open tasks by `(due_date, id)` on the partial task_open_due_idx,
+  up to yesterday;
+- due soon: the same index, from today up to today + `days`;
+- changed: tasks by `(updated_at, id)` on task_updated_idx, for tasks created
+  or edited behind the other two positions (a task created already overdue,
+  a due date moved earlier, a completed task reopened).
+A run therefore reads the tasks that fell due or changed since the last run,
+not the table. The first run reports every task that is already overdue.
+
+Every pass only reads tasks last written before `now - settle`, and the
+changed position then moves to that cutoff. A write that commits late, with
+an older updated_at, is still seen, and a task reported by a due pass is not
+read again by the changed pass unless it is written again.
+
+Events go to the sink in batches, and each batch moves the positions forward
+in the same transaction. A failed send leaves the positions where they were,
+so delivery is at-least-once. A task edited after it was reported is
+reported again. Every event has a `key` (task, kind and due date) to
+deduplicate on, and OutboxSink does.
+
+Only one sweep with a given name should run at a time.
+"""
+import datetime
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ReminderKind, ReminderSweep, Task, TaskReminder, TaskStatus
+
+logger = logging.getLogger("tasks")
+
+EVENT_FIELDS = ("id", "user_id", "title", "status", "due_date", "updated_at")
+
+
+def reminder_event(row, kind):
+    return {
+        "key": f"{row['id']}:{kind}:{row['due_date'].isoformat()}",
+        "kind": kind,
+        "task_id": row["id"],
+        "user_id": row["user_id"],
+        "title": row["title"],
+        "status": row["status"],
+        "due_date": row["due_date"].isoformat(),
+    }
+
+
+class LogSink:
+    """Writes each batch to the `tasks` log."""
+
+    def send(self, events):
+        logger.info("%d task reminders: %s", len(events), ", ".join(event["key"] for event in events))
+
+
+class OutboxSink:
+    """Inserts the events into TaskReminder, skipping keys already there."""
+
+    def send(self, events):
+        TaskReminder.objects.bulk_create(
+            [
+                TaskReminder(
+                    key=event["key"], kind=event["kind"], task_id=event["task_id"], user_id=event["user_id"],
+                    due_date=event["due_date"], payload=event,
+                )
+                for event in events
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class WebhookSink:
+    """POSTs each batch as `{"events": [...]}` to TASK_REMINDER_WEBHOOK_URL; any error fails the batch."""
+
+    def __init__(self, url=None, timeout=10):
+        self.url = url or getattr(settings, "TASK_REMINDER_WEBHOOK_URL", "")
+        if not self.url:
+            raise ValueError("TASK_REMINDER_WEBHOOK_URL is not set.")
+        self.timeout = timeout
+
+    def send(self, events):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"events": events}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass  # urlopen raises on 4xx/5xx
+
+
+SINKS = {"log": LogSink, "outbox": OutboxSink, "webhook": WebhookSink}
+
+
+def get_sink(name=None):
+    """The sink called `name` in SINKS or at that dotted path (default: TASK_REMINDER_SINK)."""
+    name = name or getattr(settings, "TASK_REMINDER_SINK", "log")
+    sink_class = SINKS.get(name) or import_string(name)
+    return sink_class()
+
+
+def after(position, field):
+    """Rows past `position`, a `(value, id)` pair, in `(field, id)` order, with a sargable bound on `field`."""
+    value, pk = position
+    return Q(**{f"{field}__gte": value}) & (Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk}))
+
+
+class DueSweeper:
+    def __init__(self, sink=None, days=None, batch_size=None, settle=None, name="default"):
+        self.sink = sink or get_sink()
+        self.days = getattr(settings, "TASK_DUE_SOON_DAYS", 2) if days is None else days
+        self.batch_size = batch_size or getattr(settings, "TASK_REMINDER_BATCH_SIZE", 500)
+        if settle is None:
+            settle = getattr(settings, "TASK_REMINDER_SETTLE_SECONDS", 60)
+        self.settle = datetime.timedelta(seconds=settle)
+        self.name = name
+
+    def run(self, now=None):
+        """Send the reminders due since the last run; returns the number sent per kind."""
+        now = now or timezone.now()
+        today = timezone.localdate(now)
+        horizon = today + datetime.timedelta(days=self.days)
+        until = now - self.settle
+        state, _ = ReminderSweep.objects.get_or_create(name=self.name)
+        self.sent = Counter()
+
+        if state.changed_at is None:
+            # Every settled task is ahead of the due positions, which start empty.
+            state.changed_at, state.changed_task_id = until, 0
+            state.save(update_fields=["changed_at", "changed_task_id"])
+        else:
+            self.sweep_changed(state, today, horizon, until)
+        self.sweep_due(state, ReminderKind.OVERDUE, until, end=today - datetime.timedelta(days=1))
+        self.sweep_due(state, ReminderKind.DUE_SOON, until, end=horizon, start=today)
+
+        state.last_run_at = now
+        state.save()
+        return self.sent
+
+    def sweep_due(self, state, kind, until, end, start=None):
+        position = self.position(state, kind)
+        if start is not None and (position is None or position[0] < start):
+            position = (start, 0)
+        open_tasks = Task.objects.exclude(status=TaskStatus.COMPLETED).filter(due_date__lte=end, updated_at__lt=until)
+        while True:
+            tasks = open_tasks.filter(after(position, "due_date")) if position else open_tasks
+            rows = list(tasks.order_by("due_date", "id").values(*EVENT_FIELDS)[:self.batch_size])
+            if not rows:
+                return
+            position = rows[-1]["due_date"], rows[-1]["id"]
+            self.emit(state, [reminder_event(row, kind) for row in rows], {
+                f"{kind}_due_date": position[0], f"{kind}_task_id": position[1],
+            })
+            if len(rows) < self.batch_size:
+                return
+
+    def sweep_changed(self, state, today, horizon, until):
+        """Report tasks written since the last cutoff whose `(due_date, id)` the due passes have already gone past."""
+        overdue, due_soon = self.position(state, ReminderKind.OVERDUE), self.position(state, ReminderKind.DUE_SOON)
+        changed = (
+            Task.objects.exclude(status=TaskStatus.COMPLETED)
+            .filter(due_date__lte=horizon, updated_at__lt=until)
+            .order_by("updated_at", "id")
+        )
+        position = state.changed_at, state.changed_task_id
+        while True:
+            rows = list(changed.filter(after(position, "updated_at")).values(*EVENT_FIELDS)[:self.batch_size])
+            if not rows:
+                break
+            position = rows[-1]["updated_at"], rows[-1]["id"]
+            events = []
+            for row in rows:
+                key = (row["due_date"], row["id"])
+                if row["due_date"] < today and overdue and key <= overdue:
+                    events.append(reminder_event(row, ReminderKind.OVERDUE))
+                elif row["due_date"] >= today and due_soon and key <= due_soon:
+                    events.append(reminder_event(row, ReminderKind.DUE_SOON))
+            self.emit(state, events, {"changed_at": position[0], "changed_task_id": position[1]})
+            if len(rows) < self.batch_size:
+                break
+        # Everything written before the cutoff has been read; saved with the run.
+        state.changed_at, state.changed_task_id = until, 0
+
+    def emit(self, state, events, position):
+        with transaction.atomic():
+            if events:
+                self.sink.send(events)
+                self.sent.update(event["kind"] for event in events)
+            for name, value in position.items():
+                setattr(state, name, value)
+            state.save(update_fields=[*position])
+
+    @staticmethod
+    def position(state, kind):
+        due_date = getattr(state, f"{kind}_due_date")
+        return None if due_date is None else (due_date, getattr(state, f"{kind}_task_id"))
+
+    def run_forever(self, interval=None, stop=None):
+        """Worker mode: run every `interval` seconds until the `stop` event is set."""
+        interval = interval or getattr(settings, "TASK_REMINDER_INTERVAL", 60)
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                sent = self.run()
+                if sent:
+                    logger.info("Reminder sweep sent %s", dict(sent))
+            except Exception as e:
+                # Positions only move with a batch that was sent: the next run retries.
+                logger.error("Reminder sweep failed: %s", e)
+            stop.wait(max(0, interval - (time.monotonic() - started)))
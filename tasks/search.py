@@ -0,0 +1,92 @@
+"""
+Ranked full-text search over task titles and descriptions for
+GET /api/tasks/search/.
+
+The index is maintained by the database on every write, bulk writes
+included (migration 0004):
+- PostgreSQL: a stored generated `search_vector` tsvector column (title
+  weighted A, description B) with a GIN index, ranked with ts_rank();
+- SQLite: an FTS5 table kept in sync by triggers, ranked with bm25(). The
+  owner is indexed as a column, so a user's search intersects their
+  postings instead of filtering every match of a common word.
+
+Both rank higher for better matches and page by `(rank, id)` keyset, so a
+page only reads the matching rows from the index, never the whole table.
+"""
+import re
+
+from django.db import connection
+
+WORD = re.compile(r"\w+")
+
+
+class PostgresSearch:
+    # ts_rank() is a float4. The cursor carries the rank as a Python float and
+    # it comes back as a float8 parameter, which would not compare equal to the
+    # float4 of the row it was taken from: rank is a float8 from the start.
+    ranked_sql = """
+        SELECT id, rank FROM (
+            SELECT tasks_task.id, ts_rank(search_vector, query)::float8 AS rank
+            FROM tasks_task, plainto_tsquery('english', %s) AS query
+            WHERE search_vector @@ query {scope}
+        ) AS matches
+    """
+
+    def query(self, text, user_id):
+        return text
+
+
+class SQLiteSearch:
+    ranked_sql = """
+        SELECT id, rank FROM (
+            SELECT tasks_task.id AS id, -bm25(tasks_task_fts, 2.0, 1.0, 0.0) AS rank
+            FROM tasks_task_fts JOIN tasks_task ON tasks_task.id = tasks_task_fts.rowid
+            WHERE tasks_task_fts MATCH %s {scope}
+        ) AS matches
+    """
+
+    def query(self, text, user_id):
+        # Every word must match, as with plainto_tsquery; quoting keeps FTS5 syntax out of user input.
+        query = "{title description} : (%s)" % " ".join(f'"{word}"' for word in WORD.findall(text))
+        if user_id is not None:
+            query += f' AND user_id : "{int(user_id)}"'
+        return query
+
+
+BACKENDS = {"postgresql": PostgresSearch, "sqlite": SQLiteSearch}
+
+
+def search_backend():
+    try:
+        return BACKENDS[connection.vendor]()
+    except KeyError:
+        raise NotImplementedError(f"Task search is not available on {connection.vendor}.")
+
+
+def ranked_ids(text, user_id=None, position=None, reverse=False, limit=50):
+    """
+    `[{"id", "rank"}]` for the tasks matching every word of `text`, best match
+    first (lowest id first among equal ranks), starting after the `(rank, id)`
+    `position`. Only tasks of `user_id` unless it is None. With `reverse`, the
+    rows before `position`, nearest first.
+    """
+    if not WORD.search(text):
+        return []
+    backend = search_backend()
+    params = [backend.query(text, user_id)]
+    scope = ""
+    if user_id is not None:
+        scope = "AND tasks_task.user_id = %s"
+        params.append(user_id)
+    sql = backend.ranked_sql.format(scope=scope)
+    # Forwards: rank DESC, id ASC. Backwards everything flips.
+    rank_order, id_order = ("ASC", "DESC") if reverse else ("DESC", "ASC")
+    if position is not None:
+        rank_after, id_after = (">", "<") if reverse else ("<", ">")
+        sql += f" WHERE rank {rank_after} %s OR (rank = %s AND id {id_after} %s)"
+        params += [position[0], position[0], position[1]]
+    sql += f" ORDER BY rank {rank_order}, id {id_order} LIMIT %s"
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [{"id": pk, "rank": rank} for pk, rank in cursor.fetchall()]
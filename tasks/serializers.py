@@ -1,8 +1,104 @@
+import datetime
+
 from rest_framework import serializers
+from rest_framework.settings import ISO_8601, api_settings
+
 from .models import Task
 
+class TaskBulkSerializer(serializers.ListSerializer):
+    """
+    List serializer for the bulk endpoints. `validate_items()` validates every
+    item on its own so a bad row is reported without rejecting the whole batch.
+    """
+
+    def validate_items(self):
+        self.valid_items = []
+        self.item_errors = []
+        for index, item in enumerate(self.initial_data):
+            try:
+                self.valid_items.append((index, self.child.run_validation(item)))
+            except serializers.ValidationError as exc:
+                self.item_errors.append({"index": index, "errors": exc.detail})
+        return not self.item_errors
+
+
 class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ["id", "title", "description", "due_date", "status", "created_at", "updated_at"]
         read_only_fields = ["id", "created_at", "updated_at"]
+        list_serializer_class = TaskBulkSerializer
+
+    def __init__(self, *args, **kwargs):
+        # `fields` limits the rendered fields, e.g. TaskSerializer(tasks, many=True, fields=["id", "title"]).
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def update(self, instance, validated_data):
+        # Write only the submitted columns (plus the auto_now timestamp).
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
+
+class TaskReadSerializer:
+    """
+    Read-only fast path for TaskSerializer: turns `.values()` rows (or Task
+    instances) into exactly the dicts `TaskSerializer(...).data` would give.
+
+    DRF resolves every field's attribute, format and time zone again for every
+    row; here that is done once, when the serializer is created, leaving one
+    plain function call per value. Create it per request, since it captures
+    the active time zone. Writes and validation stay with TaskSerializer.
+    """
+
+    def __init__(self, fields=None):
+        declared = TaskSerializer().fields
+        # In declared order, whatever the order of `fields`, as TaskSerializer does.
+        self.fields = [name for name in TaskSerializer.Meta.fields if fields is None or name in fields]
+        self.handlers = [(name, representation_of(declared[name])) for name in self.fields]
+
+    def to_representation(self, row):
+        return {name: None if row[name] is None else handler(row[name]) for name, handler in self.handlers}
+
+    def instance_representation(self, task):
+        return self.to_representation({name: getattr(task, name) for name in self.fields})
+
+    def many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+def representation_of(field):
+    """A function with the same result as `field.to_representation` for the values Task holds."""
+    if isinstance(field, serializers.DateTimeField) and getattr(field, "format", api_settings.DATETIME_FORMAT) == ISO_8601:
+        return iso_datetime(field)
+    if isinstance(field, serializers.DateField) and getattr(field, "format", api_settings.DATE_FORMAT) == ISO_8601:
+        return iso_date
+    if isinstance(field, serializers.ChoiceField):
+        choices = field.choice_strings_to_values
+        return lambda value: choices.get(str(value), value)
+    return field.to_representation  # A single str() / int() call for the other Task fields.
+
+
+def iso_date(value):
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def iso_datetime(field):
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    # The database hands back UTC datetimes; with the UTC zone active they need no conversion.
+    utc = tz is datetime.timezone.utc or getattr(tz, "key", None) == "UTC"
+
+    def represent(value):
+        if isinstance(value, str) or tz is None or value.tzinfo is None:
+            return field.to_representation(value)
+        if not (utc and value.tzinfo is datetime.timezone.utc):
+            value = value.astimezone(tz)
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return represent
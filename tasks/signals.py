@@ -0,0 +1,12 @@
+from django.dispatch import Signal
+
+# Sent after tasks are written through the API, including bulk writes that
+# bypass the model signals. Arguments:
+#   action   -- "created", "updated", "deleted" or "assigned"
+#   user_ids -- owners whose task lists changed (old and new owner on reassignment)
+#   counts   -- optional; change in the number of tasks per (user_id, status, due_date),
+#               see tasks/stats.py
+#   task_ids -- optional; ids of the tasks written (see tasks/events.py)
+#   removed  -- optional; {task_id: previous owner} for tasks deleted or reassigned,
+#               see tasks/changes.py
+task_changed = Signal()
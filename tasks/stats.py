@@ -0,0 +1,139 @@
+"""
+Task statistics served from TaskCounter rows instead of counting tasks.
+
+Every API write sends `task_changed` with `counts`, a Counter of
+`(user_id, status, due_date) -> change in the number of tasks`; the receiver
+here folds it into the counters in two statements (an INSERT of any missing
+rows, then one UPDATE ... SET count = count + CASE ...). Reading the stats of a
+user is one aggregate over their counter rows, whatever the number of tasks.
+
+Writes made outside the API (admin, shell, cascades on user deletion) do not
+reach the counters; `manage.py reconcile_task_counters` rebuilds them.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Task, TaskCounter, TaskStatus
+from .signals import task_changed
+
+OPEN_STATUSES = [status for status in TaskStatus.values if status != TaskStatus.COMPLETED]
+
+
+def counter_key(task):
+    return task.user_id, task.status, task.due_date
+
+
+def count_changes(before=(), after=()):
+    """The `counts` for tasks going from the `before` to the `after` versions, as counter_key() tuples."""
+    changes = Counter(after)
+    changes.subtract(before)
+    return changes
+
+
+def expand(changes):
+    """Spread per-task changes over the counter rows they affect: per user and for all users."""
+    rows = Counter()
+    for (user_id, status, due_date), delta in changes.items():
+        if not delta:
+            continue
+        status = str(status)
+        for owner in (user_id, None):
+            rows[owner, status, None] += delta
+            if status in OPEN_STATUSES:
+                rows[owner, status, due_date] += delta
+    return {key: delta for key, delta in rows.items() if delta}
+
+
+def key_filter(key):
+    user_id, status, due_date = key
+    return Q(user_id=user_id, status=status, due_date=due_date)
+
+
+def update_counters(changes):
+    rows = expand(changes)
+    if not rows:
+        return
+    # Rows are created at zero first so that concurrent writers all take the UPDATE path.
+    TaskCounter.objects.bulk_create(
+        [TaskCounter(user_id=user_id, status=status, due_date=due_date) for user_id, status, due_date in rows],
+        ignore_conflicts=True,
+    )
+    matches = Q()
+    for key in rows:
+        matches |= key_filter(key)
+    TaskCounter.objects.filter(matches).update(
+        count=F("count") + Case(*(When(key_filter(key), then=Value(delta)) for key, delta in rows.items()), default=0)
+    )
+
+
+@receiver(task_changed)
+def apply_task_counts(sender, counts=None, **kwargs):
+    if counts:
+        update_counters(counts)
+
+
+def read_stats(user_ids):
+    """
+    `{user_id: {"total", "by_status", "overdue"}}` for `user_ids`, where None
+    stands for all users, in one query over the counter rows.
+    """
+    today = timezone.localdate()
+    totals = {
+        status: Sum("count", filter=Q(status=status, due_date__isnull=True), default=0)
+        for status in TaskStatus.values
+    }
+    owners = Q(user_id__in=[pk for pk in user_ids if pk is not None])
+    if None in user_ids:
+        owners |= Q(user_id__isnull=True)
+    rows = (
+        TaskCounter.objects
+        .filter(owners)
+        .filter(Q(due_date__isnull=True) | Q(due_date__lt=today, status__in=OPEN_STATUSES))
+        .values("user_id")
+        .annotate(**totals, overdue=Sum("count", filter=Q(due_date__lt=today), default=0))
+    )
+    found = {row["user_id"]: row for row in rows}
+    stats = {}
+    for user_id in user_ids:
+        row = found.get(user_id, {})
+        by_status = {status: row.get(status, 0) for status in TaskStatus.values}
+        stats[user_id] = {"total": sum(by_status.values()), "by_status": by_status, "overdue": row.get("overdue", 0)}
+    return stats
+
+
+def expected_counters():
+    """What the counters should hold, from a GROUP BY over tasks_task."""
+    groups = Task.objects.order_by().values_list("user_id", "status", "due_date").annotate(n=Count("id"))
+    return expand({(user_id, status, due_date): n for user_id, status, due_date, n in groups})
+
+
+def reconcile_counters(dry_run=False):
+    """
+    Make the counters match the tasks table and drop the rows that count
+    nothing. Returns the number of counts that were wrong. Writes that land
+    while this runs may be counted twice or not at all, so run it while the
+    API is quiet.
+    """
+    expected = expected_counters()
+    empty, wrong = [], []
+    for counter in TaskCounter.objects.iterator(chunk_size=2000):
+        count = expected.pop((counter.user_id, counter.status, counter.due_date), 0)
+        if counter.count != count:
+            counter.count = count
+            wrong.append(counter)
+        if count == 0:
+            empty.append(counter.id)
+    missing = [
+        TaskCounter(user_id=user_id, status=status, due_date=due_date, count=count)
+        for (user_id, status, due_date), count in expected.items()
+    ]
+    if not dry_run:
+        with transaction.atomic():
+            TaskCounter.objects.filter(id__in=empty).delete()
+            TaskCounter.objects.bulk_update([counter for counter in wrong if counter.count], ["count"], batch_size=1000)
+            TaskCounter.objects.bulk_create(missing, batch_size=1000)
+    return len(wrong) + len(missing)
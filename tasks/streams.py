@@ -0,0 +1,157 @@
+"""
+`GET /api/async/tasks/events/`: a Server-Sent Events stream of the changes
+to the caller's tasks (every task for ADMINs), fed by tasks/events.py.
+
+The stream is served by TaskEventStream, an ASGI application wrapped around
+Django's in task_management/asgi.py, rather than by a StreamingHttpResponse.
+Django 4.2 does not notice a client going away during a streaming response,
+and an idle stream would then never end. An open stream here costs a
+coroutine and a Subscription, not a request cycle.
+
+The handshake is an AsyncAPIView (routed in tasks/async_urls.py) that goes
+through Django's request handler: MIDDLEWARE applies to it as to any other
+request, and authentication, throttles and error responses are the async
+views'. Events are
+
+    event: task
+    data: {"action": "updated", "task_ids": [12]}
+
+with `task_ids` null for writes touching more than TASK_EVENTS_MAX_IDS
+tasks, and `event: resync` when the client has to fetch
+/api/tasks/changes/ instead. A `: keepalive` comment is sent every
+TASK_EVENTS_KEEPALIVE seconds. The stream ends at the first keepalive after
+the access token expires or TASK_EVENTS_MAX_SECONDS have passed; EventSource
+clients reconnect by themselves.
+"""
+import asyncio
+import io
+import logging
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from .async_views import AsyncAPIView
+from .events import hub
+
+logger = logging.getLogger("tasks")
+
+EVENTS_PATH = "/api/async/tasks/events/"
+RETRY = b"retry: 5000\n\n"
+KEEPALIVE = b": keepalive\n\n"
+
+
+def response_start(response):
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in response.items()]
+    return {"type": "http.response.start", "status": response.status_code, "headers": headers}
+
+
+class TooManyStreams(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = {"error": "Too many open event streams. Try again later."}
+    default_code = "too_many_streams"
+
+
+class TaskEventsView(AsyncAPIView):
+    """The handshake: a 200 here is followed by the events, written by TaskEventStream."""
+
+    http_method_names = ["get"]
+
+    async def get(self, request, *args, **kwargs):
+        if not getattr(request, "event_stream", False):
+            # Reached through Django's own application (WSGI, runserver): nothing would write the events.
+            raise NotFound({"error": "Task events are only served under ASGI."})
+        if hub.open >= getattr(settings, "TASK_EVENTS_MAX_CONNECTIONS", 50000):
+            raise TooManyStreams()
+        lifetime = getattr(settings, "TASK_EVENTS_MAX_SECONDS", 3600)
+        expires = request.auth.get("exp") if request.auth is not None else None
+        if expires is not None:
+            lifetime = min(lifetime, expires - time.time())
+        response = HttpResponse(
+            content_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # X-Accel-Buffering: for nginx
+        )
+        response.subscriber = (request.user.id, request.user.role == "ADMIN", lifetime)
+        return response
+
+
+class TaskEventStream:
+    """ASGI application serving EVENTS_PATH and passing every other request to `application`."""
+
+    def __init__(self, application, path=EVENTS_PATH):
+        self.application = application
+        self.path = path
+        self.handler = ASGIHandler()  # Runs the handshake through MIDDLEWARE and the URLconf.
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            return await self.application(scope, receive, send)
+        while True:  # A GET has no body, but its messages still have to be read.
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            if not message.get("more_body"):
+                break
+
+        try:
+            start, body, subscriber = await self.handshake(scope)
+        except Exception:
+            logger.exception("Task event stream handshake failed")
+            response = JsonResponse({"error": "An unexpected error occurred"}, status=500)
+            start, body, subscriber = response_start(response), response.content, None
+        if subscriber is None:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+        user_id, admin, lifetime = subscriber
+        # Subscribed before the headers go out: nothing written after the client sees the 200 is missed.
+        stream = self.stream(hub.subscribe(user_id, admin), start, lifetime, receive, send)
+        del start  # stream() drops the headers once sent; this frame would keep them for the life of the stream.
+        await stream
+
+    async def handshake(self, scope):
+        """
+        `(response start, body, subscriber)` for the request in `scope`, with
+        `subscriber` `(user_id, admin, lifetime)` when TaskEventsView accepted
+        it and None otherwise. The request itself is not kept for the life of
+        the stream.
+        """
+        request, response = self.handler.create_request(scope, io.BytesIO())
+        if request is not None:
+            request.event_stream = True
+            response = await self.handler.get_response_async(request)
+        subscriber = getattr(response, "subscriber", None)
+        if response.status_code != status.HTTP_200_OK or subscriber is None:
+            return response_start(response), response.content, None
+        return response_start(response), b"", subscriber
+
+    async def stream(self, subscription, start, lifetime, receive, send):
+        watcher = asyncio.ensure_future(self.watch(subscription, receive))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + lifetime
+        try:
+            await send(start)
+            start = None  # Headers are not kept for the life of the stream.
+            await send({"type": "http.response.body", "body": RETRY, "more_body": True})
+            while True:
+                frame = await subscription.get()
+                if subscription.closed:
+                    return
+                if frame is None and loop.time() >= deadline:
+                    break
+                await send({"type": "http.response.body", "body": frame or KEEPALIVE, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        except OSError:  # The client went away during a write.
+            pass
+        finally:
+            hub.unsubscribe(subscription)
+            watcher.cancel()
+
+    @staticmethod
+    async def watch(subscription, receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        subscription.close()
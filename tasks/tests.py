@@ -1,8 +1,36 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import datetime
+import io
+import json
+import tempfile
+import time
+import urllib.error
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 from rest_framework import status
-from .models import Task
+from task_management.metrics import REQUESTS
+from users.serializers import CustomTokenObtainPairSerializer
+from .cache import task_list_cache
+from .changes import encode_cursor
+from .events import RESYNC, hub
+from .models import ReminderSweep, Task, TaskCounter, TaskReminder, TaskTombstone
+from .reminders import DueSweeper, OutboxSink, WebhookSink
+from .serializers import TaskReadSerializer, TaskSerializer
+from .stats import reconcile_counters
+from .streams import EVENTS_PATH, KEEPALIVE, RETRY, TaskEventStream
 
 User = get_user_model()
 
@@ -57,3 +85,1362 @@ class TaskAPITestCase(TestCase):
         response = self.client.delete(f"/api/tasks/{self.task.id}/")
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+
+
+class TaskPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="pager", password="pagerpass", role="USER")
+        self.tasks = [
+            Task.objects.create(user=self.user, title=f"Task {i}", description="", due_date="2025-12-31")
+            for i in range(7)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def links(self, response):
+        links = {}
+        for part in response.headers.get("Link", "").split(", "):
+            if part:
+                url, rel = part.split("; ")
+                links[rel[5:-1]] = url[1:-1]
+        return links
+
+    def test_pages_follow_created_at_then_id(self):
+        seen = []
+        url = "/api/tasks/?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data), 3)
+            seen.extend(task["id"] for task in response.data)
+            url = self.links(response).get("next")
+        self.assertEqual(seen, [task.id for task in self.tasks])
+
+    def test_previous_link_returns_to_earlier_page(self):
+        first = self.client.get("/api/tasks/?page_size=3")
+        second = self.client.get(self.links(first)["next"])
+        back = self.client.get(self.links(second)["prev"])
+        self.assertEqual([t["id"] for t in back.data], [t["id"] for t in first.data])
+        self.assertNotIn("prev", self.links(back))
+
+    def test_page_size_is_capped(self):
+        with self.settings(API_MAX_PAGE_SIZE=2):
+            response = self.client.get("/api/tasks/?page_size=100")
+        self.assertEqual(len(response.data), 2)
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/tasks/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def async_get(self, path, cursor, token):
+        return await self.async_client.get(path, {"cursor": cursor}, headers={"authorization": f"Bearer {token}"})
+
+    def test_forged_cursor_positions_are_not_found(self):
+        def cursor(position):
+            raw = json.dumps({"o": ["created_at", "id"], "p": position}).encode()
+            return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        for position in ([], ["2025-01-01T00:00:00+00:00"], ["garbage", 1], [["x"], 1], [{"a": 1}, 1], [None, 1],
+                         ["2025-01-01T00:00:00+00:00", "one"]):
+            with self.subTest(position=position):
+                response = self.client.get("/api/tasks/", {"cursor": cursor(position)})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+                response = async_to_sync(self.async_get)("/api/async/tasks/", cursor(position), token)
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deep_page_costs_the_same_queries(self):
+        # The page itself: the ETag comes from the list cache generation.
+        with self.assertNumQueries(1):
+            first = self.client.get("/api/tasks/?page_size=1")
+        third_url = self.links(self.client.get(self.links(first)["next"]))["next"]
+        with self.assertNumQueries(1):
+            self.client.get(third_url)
+
+
+class ExplainTaskQueriesCommandTestCase(TestCase):
+    def test_view_queries_use_indexes(self):
+        out = StringIO()
+        call_command("explain_task_queries", users=5, tasks=2000, stdout=out)
+        self.assertIn("No sequential scans", out.getvalue())
+        self.assertFalse(Task.objects.exists())
+
+
+class TaskFilterTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="filterer", password="filterpass", role="USER")
+        self.overdue = Task.objects.create(
+            user=self.user, title="B overdue", description="late", due_date="2020-01-10", status="PENDING"
+        )
+        self.done = Task.objects.create(
+            user=self.user, title="A done", description="old", due_date="2020-01-05", status="COMPLETED"
+        )
+        self.future = Task.objects.create(
+            user=self.user, title="C future", description="soon", due_date="2099-06-01", status="IN_PROGRESS"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [task["id"] for task in response.data]
+
+    def test_filter_by_status(self):
+        self.assertEqual(self.ids("/api/tasks/?status=PENDING,IN_PROGRESS"), [self.overdue.id, self.future.id])
+
+    def test_filter_by_due_date_range(self):
+        self.assertEqual(self.ids("/api/tasks/?due_after=2020-01-06&due_before=2099-01-01"), [self.overdue.id])
+
+    def test_overdue_only(self):
+        self.assertEqual(self.ids("/api/tasks/?overdue=true"), [self.overdue.id])
+
+    def test_ordering(self):
+        self.assertEqual(self.ids("/api/tasks/?ordering=-due_date"), [self.future.id, self.overdue.id, self.done.id])
+        self.assertEqual(self.ids("/api/tasks/?ordering=title"), [self.done.id, self.overdue.id, self.future.id])
+
+    def test_ordering_is_kept_across_pages(self):
+        first = self.client.get("/api/tasks/?ordering=title&page_size=2")
+        next_url = first.headers["Link"].split(";")[0][1:-1]
+        self.assertEqual([t["id"] for t in first.data] + self.ids(next_url), [self.done.id, self.overdue.id, self.future.id])
+
+    def test_field_projection_skips_description(self):
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get("/api/tasks/?fields=id,title")
+        self.assertEqual(response.data[0], {"id": self.overdue.id, "title": "B overdue"})
+        self.assertNotIn("description", queries.captured_queries[-1]["sql"])
+
+    def test_unknown_and_invalid_params_are_rejected(self):
+        for query in ("colour=red", "status=DONE", "due_after=yesterday", "overdue=maybe", "ordering=user", "fields=secret"):
+            response = self.client.get(f"/api/tasks/?{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+
+class TaskBulkTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="bulker", password="bulkpass", role="USER")
+        self.other = User.objects.create_user(username="other", password="otherpass", role="USER")
+        self.task = Task.objects.create(user=self.user, title="Mine", description="", due_date="2025-12-31")
+        self.foreign = Task.objects.create(user=self.other, title="Theirs", description="", due_date="2025-12-31")
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_create_reports_invalid_items(self):
+        items = [
+            {"title": "One", "description": "d", "due_date": "2025-12-31"},
+            {"title": "Two", "description": "d", "due_date": "not-a-date"},
+            {"title": "Three", "description": "d", "due_date": "2026-01-01", "status": "COMPLETED"},
+        ]
+        response = self.client.post("/api/tasks/bulk/", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([task["title"] for task in response.data["created"]], ["One", "Three"])
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1])
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+
+    def test_bulk_create_atomic_rejects_whole_batch(self):
+        items = [{"title": "One", "description": "d", "due_date": "2025-12-31"}, {"title": "Bad"}]
+        response = self.client.post("/api/tasks/bulk/?atomic=true", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 1)
+
+    def test_bulk_create_is_bounded(self):
+        items = [{"title": "x", "description": "d", "due_date": "2025-12-31"}] * 3
+        with self.settings(TASK_BULK_MAX_ITEMS=2):
+            response = self.client.post("/api/tasks/bulk/", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_only_touches_own_tasks(self):
+        before = self.task.updated_at
+        items = [{"id": self.task.id, "status": "COMPLETED"}, {"id": self.foreign.id, "status": "COMPLETED"}]
+        response = self.client.patch("/api/tasks/bulk/", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["errors"], [{"index": 1, "errors": {"id": ["Task not found."]}}])
+        self.task.refresh_from_db()
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.task.status, "COMPLETED")
+        self.assertGreater(self.task.updated_at, before)
+        self.assertEqual(self.foreign.status, "PENDING")
+
+    def test_bulk_writes_read_their_rows_inside_the_transaction(self):
+        for method, items in [("patch", [{"id": self.task.id, "status": "COMPLETED"}]), ("delete", [self.task.id])]:
+            with self.subTest(method=method), CaptureQueriesContext(connection) as queries:
+                response = getattr(self.client, method)("/api/tasks/bulk/", items, format="json")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                statements = [query["sql"].split()[0] for query in queries.captured_queries]
+                self.assertEqual(statements[:2], ["SAVEPOINT", "SELECT"])
+                self.assertEqual(statements[-1], "RELEASE")
+        delete = next(query["sql"] for query in queries.captured_queries if query["sql"].startswith("DELETE"))
+        self.assertIn(f'"user_id" = {self.user.id}', delete)
+
+    def test_bulk_delete_uses_one_delete(self):
+        extra = Task.objects.create(user=self.user, title="Extra", description="", due_date="2025-12-31")
+        # Plus the savepoint, the tombstones and the task counters.
+        with self.assertNumQueries(7) as queries:
+            response = self.client.delete("/api/tasks/bulk/", [self.task.id, extra.id, self.foreign.id], format="json")
+        self.assertTrue(queries.captured_queries[2]["sql"].startswith("DELETE"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["deleted"], 2)
+        self.assertEqual(len(response.data["errors"]), 1)
+        self.assertTrue(Task.objects.filter(id=self.foreign.id).exists())
+        self.assertFalse(Task.objects.filter(user=self.user).exists())
+
+
+class TaskAssignmentTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="boss", password="bosspass", role="ADMIN")
+        self.leaver = User.objects.create_user(username="leaver", password="leaverpass", role="USER")
+        self.keeper = User.objects.create_user(username="keeper", password="keeperpass", role="USER")
+        self.pending = [
+            Task.objects.create(user=self.leaver, title=f"Pending {i}", description="d", due_date="2025-12-31")
+            for i in range(3)
+        ]
+        self.completed = Task.objects.create(
+            user=self.leaver, title="Done", description="d", due_date="2025-12-31", status="COMPLETED"
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_single_assign_writes_only_owner_and_timestamp(self):
+        task = self.pending[0]
+        # Plus the savepoint, the tombstone and the task counters.
+        with self.assertNumQueries(8) as queries:
+            response = self.client.patch(f"/api/tasks/{task.id}/assign/", {"username": "keeper"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        update = queries.captured_queries[3]["sql"]
+        self.assertTrue(update.startswith("UPDATE"))
+        self.assertNotIn("description", update)
+        self.assertNotIn("title", update)
+
+    def test_bulk_assign_by_filter(self):
+        with self.assertNumQueries(9):  # Plus the savepoint, the tombstones and the task counters.
+            response = self.client.patch(
+                "/api/tasks/assign/", {"username": "keeper", "from_username": "leaver", "status": "PENDING"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(Task.objects.filter(user=self.keeper).count(), 3)
+        self.completed.refresh_from_db()
+        self.assertEqual(self.completed.user, self.leaver)
+
+    def test_bulk_assign_by_ids(self):
+        ids = [self.pending[0].id, self.completed.id]
+        response = self.client.patch("/api/tasks/assign/", {"username": "keeper", "task_ids": ids}, format="json")
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(set(Task.objects.filter(user=self.keeper).values_list("id", flat=True)), set(ids))
+
+    def test_bulk_assign_requires_a_selection(self):
+        response = self.client.patch("/api/tasks/assign/", {"username": "keeper"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.filter(user=self.keeper).exists())
+
+    def test_bulk_assign_as_regular_user(self):
+        self.client.force_authenticate(user=self.keeper)
+        response = self.client.patch("/api/tasks/assign/", {"username": "keeper", "from_username": "leaver"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TaskListCacheTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="cacheadmin", password="adminpass", role="ADMIN")
+        self.owner = User.objects.create_user(username="owner", password="ownerpass", role="USER")
+        self.other = User.objects.create_user(username="another", password="anotherpass", role="USER")
+        self.task = Task.objects.create(user=self.owner, title="Cached", description="d", due_date="2025-12-31")
+
+    def get(self, user, url="/api/tasks/"):
+        self.client.force_authenticate(user=user)
+        return self.client.get(url)
+
+    def test_repeated_list_is_served_from_cache(self):
+        stats = task_list_cache.stats()
+        self.assertEqual(self.get(self.owner)["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.get(self.owner)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(task_list_cache.stats()["hits"], stats["hits"] + 1)
+        self.assertEqual(task_list_cache.stats()["misses"], stats["misses"] + 1)
+
+    def test_filters_are_cached_separately(self):
+        self.get(self.owner)
+        self.assertEqual(self.get(self.owner, "/api/tasks/?status=COMPLETED")["X-Cache"], "MISS")
+
+    def test_create_invalidates_owner_and_admin_lists(self):
+        self.get(self.owner)
+        self.get(self.admin)
+        self.client.force_authenticate(user=self.owner)
+        self.client.post("/api/tasks/", {"title": "New", "description": "d", "due_date": "2025-12-31"}, format="json")
+        self.assertEqual(len(self.get(self.owner).data), 2)
+        self.assertEqual(len(self.get(self.admin).data), 2)
+
+    def test_update_and_delete_invalidate(self):
+        self.get(self.owner)
+        self.client.put(f"/api/tasks/{self.task.id}/", {"title": "Renamed", "description": "d", "due_date": "2025-12-31"}, format="json")
+        self.assertEqual(self.get(self.owner).data[0]["title"], "Renamed")
+        self.client.delete(f"/api/tasks/{self.task.id}/")
+        self.assertEqual(len(self.get(self.owner).data), 0)
+
+    def test_assign_invalidates_old_and_new_owner(self):
+        self.get(self.owner)
+        self.get(self.other)
+        self.client.force_authenticate(user=self.admin)
+        self.client.patch(f"/api/tasks/{self.task.id}/assign/", {"username": "another"}, format="json")
+        self.assertEqual(len(self.get(self.owner).data), 0)
+        self.assertEqual(len(self.get(self.other).data), 1)
+
+    def test_bulk_assign_invalidates_old_and_new_owner(self):
+        self.get(self.owner)
+        self.get(self.other)
+        self.client.force_authenticate(user=self.admin)
+        self.client.patch("/api/tasks/assign/", {"username": "another", "from_username": "owner"}, format="json")
+        self.assertEqual(len(self.get(self.owner).data), 0)
+        self.assertEqual(len(self.get(self.other).data), 1)
+
+
+class TaskConditionalRequestTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="poller", password="pollerpass", role="USER")
+        self.task = Task.objects.create(user=self.user, title="Polled", description="d", due_date="2025-12-31")
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_not_modified(self):
+        response = self.client.get("/api/tasks/")
+        self.assertNotIn("Last-Modified", response)
+        etag = response["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        # A lost generation (evicted, cache cleared) can only cost a full response.
+        task_list_cache.backend.clear()
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_on_delete(self):
+        response = self.client.get("/api/tasks/")
+        self.client.delete(f"/api/tasks/{self.task.id}/")
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_list_etag_changes_on_write(self):
+        etag = self.client.get("/api/tasks/")["ETag"]
+        Task.objects.create(user=self.user, title="Another", description="d", due_date="2025-12-31")
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_expires_with_the_cached_pages(self):
+        # Writes this worker never hears of are only answered with a 304 until then.
+        with self.settings(TASK_CACHE_TIMEOUT=0.05):
+            task_list_cache.backend.clear()  # Stamps from setUp's writes have the default timeout.
+            etag = self.client.get("/api/tasks/")["ETag"]
+            time.sleep(0.1)
+            response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_overdue_list_etag_changes_with_the_date(self):
+        etag = self.client.get("/api/tasks/?overdue=true")["ETag"]
+        self.assertEqual(self.client.get("/api/tasks/?overdue=true", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        with mock.patch("tasks.conditional.timezone.localdate", return_value=tomorrow):
+            response = self.client.get("/api/tasks/?overdue=true", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_depends_on_query(self):
+        etag = self.client.get("/api/tasks/")["ETag"]
+        self.assertNotEqual(self.client.get("/api/tasks/?fields=id")["ETag"], etag)
+
+    def test_detail_not_modified(self):
+        response = self.client.get(f"/api/tasks/{self.task.id}/")
+        self.assertIn("Last-Modified", response)
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/tasks/{self.task.id}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_match_guards_updates(self):
+        etag = self.client.get(f"/api/tasks/{self.task.id}/")["ETag"]
+        payload = {"title": "First", "description": "d", "due_date": "2025-12-31"}
+        response = self.client.put(f"/api/tasks/{self.task.id}/", payload, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        payload["title"] = "Lost update"
+        response = self.client.put(f"/api/tasks/{self.task.id}/", payload, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "First")
+
+    def test_if_match_guards_delete(self):
+        response = self.client.delete(f"/api/tasks/{self.task.id}/", HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertTrue(Task.objects.filter(id=self.task.id).exists())
+
+
+class TaskDetailQueryCountTestCase(TestCase):
+    """Every detail verb reads the task once; writes add exactly one statement."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="counted", password="pass", role="USER")
+        self.other = User.objects.create_user(username="other", password="pass", role="USER")
+        self.task = Task.objects.create(user=self.user, title="Counted", description="d", due_date="2025-12-31")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = f"/api/tasks/{self.task.id}/"
+
+    def data_queries(self, queries):
+        # Transaction control (BEGIN, SAVEPOINT...) depends on the backend and the test's own transaction.
+        # The task counters and tombstones are covered by TaskStatsTestCase and TaskChangesTestCase.
+        control = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")
+        return [
+            q["sql"] for q in queries.captured_queries
+            if q["sql"].split()[0] not in control
+            and "tasks_taskcounter" not in q["sql"] and "tasks_tasktombstone" not in q["sql"]
+        ]
+
+    def test_retrieve_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "Counted")
+        self.assertIn("ETag", response)
+
+    def test_put_reads_once_and_updates_only_its_columns(self):
+        payload = {"title": "Renamed", "description": "d", "due_date": "2026-01-31"}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        select, update = self.data_queries(queries)
+        self.assertTrue(select.startswith("SELECT"))
+        self.assertTrue(update.startswith("UPDATE"))
+        self.assertNotIn('"user_id"', update)
+        self.assertNotIn('"created_at"', update)
+
+    def test_patch_writes_only_the_submitted_field(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {"status": "COMPLETED"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "COMPLETED")
+        select, update = self.data_queries(queries)
+        self.assertIn('"status"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertNotIn('"title"', update)
+        self.assertNotIn('"description"', update)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.status, self.task.title), ("COMPLETED", "Counted"))
+
+    def test_delete_reads_once_and_deletes(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        select, delete = self.data_queries(queries)
+        self.assertTrue(select.startswith("SELECT"))
+        self.assertTrue(delete.startswith("DELETE"))
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+
+    def test_failed_precondition_stops_after_the_read(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {"status": "COMPLETED"}, format="json", HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(len(self.data_queries(queries)), 1)
+
+    def test_other_users_task_is_not_written(self):
+        self.client.force_authenticate(user=self.other)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {"status": "COMPLETED"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(len(self.data_queries(queries)), 1)
+        self.assertEqual(self.client.delete(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "PENDING")
+
+    def test_invalid_update_is_a_400(self):
+        response = self.client.patch(self.url, {"status": "DONE"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("status", response.data)
+
+
+class TaskExportTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter", password="pass", role="USER")
+        self.other = User.objects.create_user(username="other", password="pass", role="USER")
+        self.tasks = [
+            Task.objects.create(user=self.user, title=f"Task, {i}", description="d\n\"q\"", due_date="2025-12-31",
+                                status="COMPLETED" if i % 2 else "PENDING")
+            for i in range(5)
+        ]
+        Task.objects.create(user=self.other, title="Not mine", description="d", due_date="2025-12-31")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def export(self, query=""):
+        response = self.client.get(f"/api/tasks/export/{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson_matches_the_list_representation(self):
+        response, body = self.export()
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        listed = self.client.get("/api/tasks/", {"page_size": 10}).json()
+        self.assertEqual([json.loads(line) for line in body.splitlines()], listed)
+
+    def test_csv_with_filters_and_fields(self):
+        response, body = self.export("?type=csv&status=COMPLETED&fields=id,title,description")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="tasks.csv"', response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], ["id", "title", "description"])
+        expected = [[str(task.id), task.title, task.description] for task in self.tasks if task.status == "COMPLETED"]
+        self.assertEqual(rows[1:], expected)
+
+    def test_one_query_regardless_of_size(self):
+        with self.settings(TASK_EXPORT_CHUNK_SIZE=2):
+            with self.assertNumQueries(1):
+                _, body = self.export()
+        self.assertEqual(len(body.splitlines()), 5)
+
+    async def test_streams_under_asgi(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        response = await self.async_client.get("/api/tasks/export/", headers={"authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(b"".join(chunks).splitlines()), 5)
+
+    def test_invalid_type(self):
+        response = self.client.get("/api/tasks/export/?type=xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("type", response.data)
+
+
+class TaskReadSerializerTestCase(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="reader", password="pass", role="USER")
+        Task.objects.create(user=user, title="Caf\u00e9 \u2028 <b>", description="", due_date="2025-12-31")
+        Task.objects.create(user=user, title="Second", description="d", due_date="2026-01-01", status="COMPLETED")
+
+    def assertSameBytes(self, fields=None):
+        renderer = JSONRenderer()
+        expected = renderer.render(TaskSerializer(Task.objects.order_by("id"), many=True, fields=fields).data)
+        serializer = TaskReadSerializer(fields)
+        rows = Task.objects.order_by("id").values(*serializer.fields)
+        self.assertEqual(renderer.render(serializer.many(rows)), expected)
+        tasks = Task.objects.order_by("id")
+        self.assertEqual(renderer.render([serializer.instance_representation(task) for task in tasks]), expected)
+
+    def test_output_is_byte_identical_to_task_serializer(self):
+        self.assertSameBytes()
+        self.assertSameBytes(["status", "id", "updated_at"])
+
+    def test_output_follows_the_active_time_zone(self):
+        for name in ("UTC", "America/New_York", "Asia/Kolkata"):
+            with timezone.override(name):
+                self.assertSameBytes()
+
+
+class TaskImportTestCase(TestCase):
+    CSV = (
+        "title,description,due_date,status,username\n"
+        "First,d,2026-01-01,PENDING,\n"
+        "Second,d,2026-01-02,COMPLETED,importer-other\n"
+        ",d,2026-01-03,PENDING,\n"
+        "Fourth,d,not-a-date,PENDING,nobody\n"
+        "Fifth,d,2026-01-05,IN_PROGRESS,importer-other\n"
+    )
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer", password="pass", role="USER")
+        self.other = User.objects.create_user(username="importer-other", password="pass", role="USER")
+        self.admin = User.objects.create_user(username="importer-admin", password="pass", role="ADMIN")
+        self.client = APIClient()
+
+    def upload(self, user, content, name="tasks.csv", query=""):
+        self.client.force_authenticate(user=user)
+        upload = SimpleUploadedFile(name, content if isinstance(content, bytes) else content.encode())
+        return self.client.post(f"/api/tasks/import/{query}", {"file": upload}, format="multipart")
+
+    def test_command_imports_in_chunks_and_reports_rejects(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "tasks.csv"
+            path.write_text(self.CSV)
+            rejects = Path(directory) / "rejects.ndjson"
+            out, err = StringIO(), StringIO()
+            with CaptureQueriesContext(connection) as queries:
+                call_command("import_tasks", str(path), owner="importer", chunk_size=2, rejects=str(rejects),
+                             stdout=out, stderr=err)
+            rejected = [json.loads(line) for line in rejects.read_text().splitlines()]
+
+        self.assertIn("Imported 3 tasks, rejected 2, out of 5 rows", out.getvalue())
+        self.assertEqual([row["line"] for row in rejected], [4, 5])
+        self.assertIn("title", rejected[0]["errors"])
+        self.assertEqual(set(rejected[1]["errors"]), {"due_date", "username"})
+        self.assertEqual(
+            sorted(Task.objects.values_list("title", "user__username")),
+            [("Fifth", "importer-other"), ("First", "importer"), ("Second", "importer-other")],
+        )
+        # Usernames are resolved once each, not per row.
+        user_lookups = [q for q in queries.captured_queries if 'FROM "users_customuser"' in q["sql"]]
+        self.assertEqual(len(user_lookups), 3)  # --owner, then one per chunk with new names
+
+    def test_dry_run_writes_nothing(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write(self.CSV)
+            file.flush()
+            out = StringIO()
+            call_command("import_tasks", file.name, owner="importer", dry_run=True, stdout=out, stderr=StringIO())
+        self.assertIn("Validated 3 tasks", out.getvalue())
+        self.assertFalse(Task.objects.exists())
+
+    def test_upload_keeps_regular_users_to_their_own_tasks(self):
+        lines = [
+            {"title": "Mine", "description": "d", "due_date": "2026-01-01"},
+            {"title": "Theirs", "description": "d", "due_date": "2026-01-01", "username": "importer-other"},
+            "not json",
+        ]
+        content = "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines)
+        response = self.upload(self.user, content, name="tasks.ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["rows"], response.data["created"], response.data["rejected"]), (3, 1, 2))
+        self.assertEqual([error["line"] for error in response.data["errors"]], [2, 3])
+        self.assertEqual(list(Task.objects.values_list("title", "user_id")), [("Mine", self.user.id)])
+
+    def test_upload_as_admin_assigns_by_username(self):
+        response = self.upload(self.admin, self.CSV)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(Task.objects.filter(user=self.other).count(), 2)
+        self.assertEqual(Task.objects.filter(user=self.admin).count(), 1)
+
+    def test_rows_that_are_not_utf8_are_rejected(self):
+        row = json.dumps({"title": "Fine", "description": "d", "due_date": "2026-01-01"}).encode()
+        content = b"\n".join([row, b'{"title": "Caf\xe9", "description": "d", "due_date": "2026-01-01"}', row])
+        response = self.upload(self.user, content, name="tasks.ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["created"], response.data["rejected"]), (2, 1))
+        self.assertEqual(response.data["errors"], [{"line": 2, "errors": {"non_field_errors": ["Invalid UTF-8."]}}])
+
+        content = b"title,description,due_date\nCaf\xe9,d,2026-01-01\n"
+        response = self.upload(self.user, content)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"], [{"line": 2, "errors": {"non_field_errors": ["Invalid UTF-8."]}}])
+
+    def test_username_must_be_a_string(self):
+        row = {"title": "T", "description": "d", "due_date": "2026-01-01", "username": ["importer-other"]}
+        response = self.upload(self.admin, json.dumps(row), name="tasks.ndjson")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["errors"]["username"], ["Not a valid string."])
+        self.assertFalse(Task.objects.exists())
+
+    def test_upload_with_only_bad_rows_is_a_400(self):
+        response = self.upload(self.user, "title\n\n", query="?type=csv")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)  # No rows at all is not an error.
+        response = self.upload(self.user, "title,description,due_date\nx,d,nope\n")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["rejected"], 1)
+
+
+class TaskStatsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="counted", password="pass", role="USER")
+        self.other = User.objects.create_user(username="counted-other", password="pass", role="USER")
+        self.admin = User.objects.create_user(username="counter", password="pass", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(user=self.admin)
+
+    def create(self, client, due_date="2030-01-01", **data):
+        response = client.post("/api/tasks/", {"title": "T", "description": "d", "due_date": due_date, **data}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def assertCountersMatchTasks(self):
+        self.assertEqual(reconcile_counters(dry_run=True), 0)
+
+    def test_counters_follow_every_kind_of_write(self):
+        first = self.create(self.client)
+        overdue = self.create(self.client, due_date="2020-01-01")
+        self.client.patch(f"/api/tasks/{first}/", {"status": "COMPLETED"}, format="json")
+        self.client.put(f"/api/tasks/{overdue}/", {"title": "T", "description": "d", "due_date": "2021-06-01"}, format="json")
+        self.assertCountersMatchTasks()
+
+        bulk = self.client.post("/api/tasks/bulk/", [{"title": f"B{i}", "description": "d", "due_date": "2030-01-02"}
+                                                   for i in range(3)], format="json").data["created"]
+        self.client.patch("/api/tasks/bulk/", [{"id": bulk[0]["id"], "status": "IN_PROGRESS"},
+                                               {"id": bulk[0]["id"], "due_date": "2030-02-01"}], format="json")
+        self.client.delete("/api/tasks/bulk/", [bulk[1]["id"]], format="json")
+        self.assertCountersMatchTasks()
+
+        self.admin_client.patch(f"/api/tasks/{overdue}/assign/", {"username": "counted-other"}, format="json")
+        self.admin_client.patch("/api/tasks/assign/", {"username": "counted-other", "from_username": "counted"}, format="json")
+        self.client.delete(f"/api/tasks/{first}/")
+        self.admin_client.delete(f"/api/tasks/{bulk[2]['id']}/")
+        self.assertCountersMatchTasks()
+
+        upload = SimpleUploadedFile("tasks.ndjson", b'{"title": "I", "description": "d", "due_date": "2020-01-01"}\n')
+        self.client.post("/api/tasks/import/", {"file": upload}, format="multipart")
+        self.assertCountersMatchTasks()
+
+    async def test_async_views_update_the_counters_too(self):
+        headers = {"authorization": f"Bearer {CustomTokenObtainPairSerializer.get_token(self.admin).access_token}"}
+        response = await self.async_client.post(
+            "/api/async/tasks/", {"title": "A", "description": "d", "due_date": "2020-01-01"},
+            content_type="application/json", headers=headers,
+        )
+        url = f"/api/async/tasks/{response.json()['id']}/"
+        await self.async_client.patch(url, {"status": "IN_PROGRESS"}, content_type="application/json", headers=headers)
+        await self.async_client.patch(f"{url}assign/", {"username": "counted"}, content_type="application/json", headers=headers)
+        self.assertEqual(await sync_to_async(reconcile_counters)(dry_run=True), 0)
+        count = await TaskCounter.objects.aget(user=self.user, status="IN_PROGRESS", due_date__isnull=True)
+        self.assertEqual(count.count, 1)
+        await self.async_client.delete(url, headers=headers)
+        self.assertEqual(await sync_to_async(reconcile_counters)(dry_run=True), 0)
+
+    async def test_create_is_undone_when_the_counters_fail(self):
+        headers = {"authorization": f"Bearer {CustomTokenObtainPairSerializer.get_token(self.user).access_token}"}
+        payload = {"title": "T", "description": "d", "due_date": "2030-01-01"}
+        with mock.patch("tasks.stats.update_counters", side_effect=RuntimeError("counters unavailable")):
+            response = await sync_to_async(self.client.post)("/api/tasks/", payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+            response = await self.async_client.post("/api/async/tasks/", payload, content_type="application/json",
+                                                    headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(await Task.objects.aexists())
+
+    async def test_writes_are_undone_when_the_counters_fail(self):
+        headers = {"authorization": f"Bearer {CustomTokenObtainPairSerializer.get_token(self.admin).access_token}"}
+        task = await Task.objects.acreate(user=self.user, title="T", description="d", due_date="2030-01-01")
+        url, async_url, admin = f"/api/tasks/{task.id}/", f"/api/async/tasks/{task.id}/", self.admin_client
+        requests = [
+            (sync_to_async(admin.patch), url, {"status": "COMPLETED"}, {"format": "json"}),
+            (sync_to_async(admin.delete), url, None, {}),
+            (sync_to_async(admin.patch), f"{url}assign/", {"username": "counted-other"}, {"format": "json"}),
+            (sync_to_async(admin.patch), "/api/tasks/bulk/", [{"id": task.id, "status": "COMPLETED"}], {"format": "json"}),
+            (sync_to_async(admin.delete), "/api/tasks/bulk/", [task.id], {"format": "json"}),
+            (sync_to_async(admin.patch), "/api/tasks/assign/", {"username": "counted-other", "task_ids": [task.id]},
+             {"format": "json"}),
+            (self.async_client.patch, async_url, {"status": "COMPLETED"},
+             {"content_type": "application/json", "headers": headers}),
+            (self.async_client.delete, async_url, None, {"headers": headers}),
+            (self.async_client.patch, f"{async_url}assign/", {"username": "counted-other"},
+             {"content_type": "application/json", "headers": headers}),
+        ]
+        with mock.patch("tasks.stats.update_counters", side_effect=RuntimeError("counters unavailable")):
+            for send, path, data, options in requests:
+                with self.subTest(path=path, method=send.__name__):
+                    response = await send(path, data, **options)
+                    self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+                    self.assertEqual(
+                        await Task.objects.filter(id=task.id).values_list("user_id", "status").aget(),
+                        (self.user.id, "PENDING"),
+                    )
+        self.assertFalse(await TaskTombstone.objects.aexists())
+
+    def test_stats_are_one_query(self):
+        self.create(self.client)
+        self.create(self.client, due_date="2020-01-01")
+        self.create(self.client, due_date="2020-01-01", status="COMPLETED")
+        self.create(self.admin_client, due_date="2020-01-01", status="IN_PROGRESS")
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/tasks/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"user": {
+            "username": "counted", "total": 3, "by_status": {"PENDING": 2, "IN_PROGRESS": 0, "COMPLETED": 1}, "overdue": 1,
+        }})
+
+        response = self.admin_client.get("/api/tasks/stats/")
+        self.assertEqual(response.data["user"]["by_status"]["IN_PROGRESS"], 1)
+        self.assertEqual(response.data["all"]["total"], 4)
+        self.assertEqual(response.data["all"]["overdue"], 2)
+
+    def test_only_admins_see_other_users(self):
+        response = self.client.get("/api/tasks/stats/", {"username": "counted-other"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.create(self.client)
+        response = self.admin_client.get("/api/tasks/stats/", {"username": "counted"})
+        self.assertEqual(response.data["user"]["total"], 1)
+        response = self.admin_client.get("/api/tasks/stats/", {"username": "nobody"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_reconcile_command_repairs_writes_outside_the_api(self):
+        self.create(self.client)
+        Task.objects.create(user=self.user, title="Shell", description="d", due_date="2020-01-01")
+        TaskCounter.objects.create(user=self.other, status="PENDING", count=5)
+        out = StringIO()
+        call_command("reconcile_task_counters", stdout=out)
+        self.assertIn("Corrected", out.getvalue())
+        self.assertCountersMatchTasks()
+        self.assertFalse(TaskCounter.objects.filter(user=self.other).exists())
+        self.assertEqual(self.client.get("/api/tasks/stats/").data["user"]["overdue"], 1)
+
+
+class TaskSearchTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="searcher", password="pass", role="USER")
+        self.admin = User.objects.create_user(username="search-admin", password="pass", role="ADMIN")
+        self.in_title = Task.objects.create(user=self.user, title="Quarterly report", description="numbers", due_date="2030-01-01")
+        self.in_text = Task.objects.create(user=self.user, title="Groceries", description="a report folder", due_date="2030-01-01")
+        self.foreign = Task.objects.create(user=self.admin, title="Report", description="", due_date="2030-01-01")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, client=None, **params):
+        response = (client or self.client).get("/api/tasks/search/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["id"] for task in response.data]
+
+    def links(self, response):
+        links = {}
+        for part in response.headers.get("Link", "").split(", "):
+            if part:
+                url, rel = part.split("; ")
+                links[rel[5:-1]] = url[1:-1]
+        return links
+
+    def test_ranked_stemmed_and_scoped(self):
+        with self.assertNumQueries(2):
+            found = self.search(q="reporting")
+        self.assertEqual(found, [self.in_title.id, self.in_text.id])
+        self.assertEqual(self.search(q="quarterly REPORTS"), [self.in_title.id])
+        self.assertEqual(self.search(q='"report*" -- ^'), [self.in_title.id, self.in_text.id])
+
+        admin = APIClient()
+        admin.force_authenticate(user=self.admin)
+        self.assertEqual(set(self.search(admin, q="report")), {self.in_title.id, self.in_text.id, self.foreign.id})
+
+    def test_index_follows_writes(self):
+        self.client.patch(f"/api/tasks/{self.in_text.id}/", {"description": "milk"}, format="json")
+        self.client.delete(f"/api/tasks/{self.in_title.id}/")
+        self.client.post("/api/tasks/bulk/", [{"title": "Report", "description": "d", "due_date": "2030-01-01"}], format="json")
+        created = Task.objects.get(user=self.user, title="Report")
+        self.assertEqual(self.search(q="report"), [created.id])
+        Task.objects.filter(id=created.id).update(user=self.admin)
+        self.assertEqual(self.search(q="report"), [])
+
+    def test_keyset_pages_cover_every_match_once(self):
+        for i in range(5):
+            Task.objects.create(user=self.user, title=f"Report {i}", description="report " * i, due_date="2030-01-01")
+        expected = self.search(q="report", page_size=100)
+        seen, response = [], self.client.get("/api/tasks/search/", {"q": "report", "page_size": 2})
+        while True:
+            seen += [task["id"] for task in response.data]
+            links = self.links(response)
+            if "next" not in links:
+                break
+            response = self.client.get(links["next"])
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 7)
+        back = self.client.get(self.links(self.client.get(links["prev"]))["next"])
+        self.assertEqual([task["id"] for task in back.data], expected[6:])
+
+    def test_pages_through_tied_ranks(self):
+        # Equal ranks are ordered by id; the cursor's rank has to compare equal to the rows' own.
+        Task.objects.bulk_create(
+            Task(user=self.user, title="Weekly report", description="team report", due_date="2030-01-01")
+            for _ in range(10)
+        )
+        expected = self.search(q="weekly report", page_size=100)
+        self.assertEqual(len(expected), 10)
+        self.assertEqual(expected, sorted(expected))
+        pages, response = [], self.client.get("/api/tasks/search/", {"q": "weekly report", "page_size": 3})
+        while True:
+            pages.append([task["id"] for task in response.data])
+            links = self.links(response)
+            if "next" not in links:
+                break
+            response = self.client.get(links["next"])
+        self.assertEqual(sum(pages, []), expected)
+        while "prev" in links:
+            response = self.client.get(links["prev"])
+            self.assertEqual([task["id"] for task in response.data], pages[-2])
+            pages.pop()
+            links = self.links(response)
+        self.assertEqual(len(pages), 1)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get("/api/tasks/search/").status_code, status.HTTP_400_BAD_REQUEST)
+        for position in ([], [1.0], ["best", 1], [[1], 1], [True, 1]):
+            raw = json.dumps({"o": ["-rank", "id"], "p": position}).encode()
+            cursor = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+            response = self.client.get("/api/tasks/search/", {"q": "x", "cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+        self.assertEqual(self.client.get("/api/tasks/search/", {"q": "x", "status": "PENDING"}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.search(q="!!!"), [])
+        self.assertEqual(self.search(q=str(self.user.id)), [])  # The owner column is not searchable.
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def send(self, events):
+        self.events += events
+
+
+class DueSweeperTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="reminded", password="pass", role="USER")
+        # Sweeps run once the setup writes are older than the settle delay.
+        self.now = timezone.now() + datetime.timedelta(minutes=2)
+        self.today = timezone.localdate(self.now)
+        self.sink = ListSink()
+
+    def task(self, days, **fields):
+        due_date = self.today + datetime.timedelta(days=days)
+        return Task.objects.create(user=self.user, title="T", description="d", due_date=due_date, **fields)
+
+    def sweep(self, later=datetime.timedelta(), **kwargs):
+        """Run a sweep `later` after setUp and return `(kind, task id)` for what it sent."""
+        sent = len(self.sink.events)
+        DueSweeper(self.sink, days=2, **kwargs).run(now=self.now + later)
+        return [(event["kind"], event["task_id"]) for event in self.sink.events[sent:]]
+
+    def written(self, *tasks, at=datetime.timedelta()):
+        Task.objects.filter(id__in=[task.id for task in tasks]).update(updated_at=self.now + at)
+
+    def test_first_run_reports_the_backlog_then_only_what_falls_due(self):
+        overdue = self.task(-5)
+        soon = self.task(1)
+        later = self.task(10)
+        self.task(-5, status="COMPLETED")
+        self.assertEqual(self.sweep(), [("overdue", overdue.id), ("due_soon", soon.id)])
+        self.assertEqual(self.sweep(), [])
+        self.assertEqual(self.sweep(datetime.timedelta(days=1)), [])
+        self.assertEqual(self.sweep(datetime.timedelta(days=9)), [("overdue", soon.id), ("due_soon", later.id)])
+
+    def test_changed_pass_catches_writes_behind_the_positions(self):
+        self.task(-5)
+        moved = self.task(10)
+        reopened = self.task(-30, status="COMPLETED")
+        self.task(1)
+        self.sweep()
+
+        created = self.task(-60)
+        ahead = self.task(2)
+        moved.due_date = self.today
+        moved.save()
+        reopened.status = "PENDING"
+        reopened.save()
+        self.written(created, ahead, moved, reopened)
+        # Writes younger than the settle delay wait for a later run.
+        self.assertEqual(self.sweep(datetime.timedelta(seconds=30)), [])
+        self.assertCountEqual(self.sweep(datetime.timedelta(minutes=2)), [
+            ("overdue", created.id), ("overdue", reopened.id), ("due_soon", moved.id), ("due_soon", ahead.id),
+        ])
+        self.assertEqual(self.sweep(datetime.timedelta(minutes=3)), [])
+        # A late commit still carries an updated_at before the last cutoff.
+        late = self.task(-2)
+        self.written(late, at=datetime.timedelta(minutes=1, seconds=30))
+        self.assertEqual(self.sweep(datetime.timedelta(minutes=4)), [("overdue", late.id)])
+
+    def test_batches_cover_every_task_once(self):
+        tasks = [self.task(-day).id for day in (3, 3, 2, 2, 1)]
+        self.assertEqual(self.sweep(batch_size=2), [("overdue", task) for task in tasks])
+        state = ReminderSweep.objects.get(name="default")
+        self.assertEqual((state.overdue_due_date, state.overdue_task_id), (self.today - datetime.timedelta(days=1), tasks[-1]))
+
+    def test_failed_send_does_not_advance(self):
+        task = self.task(-1)
+        with mock.patch("urllib.request.urlopen", side_effect=urllib.error.URLError("down")):
+            with self.assertRaises(urllib.error.URLError):
+                DueSweeper(WebhookSink(url="http://hooks.invalid/")).run(now=self.now)
+        self.assertIsNone(ReminderSweep.objects.get(name="default").overdue_due_date)
+
+        with mock.patch("urllib.request.urlopen") as urlopen:
+            DueSweeper(WebhookSink(url="http://hooks.invalid/")).run(now=self.now)
+        body = json.loads(urlopen.call_args.args[0].data)
+        self.assertEqual(body["events"][0]["key"], f"{task.id}:overdue:{task.due_date.isoformat()}")
+
+    def test_outbox_skips_events_already_recorded(self):
+        self.task(-1)
+        self.task(0)
+        DueSweeper(OutboxSink()).run(now=self.now)
+        DueSweeper(OutboxSink(), name="replay").run(now=self.now)
+        self.assertEqual(sorted(TaskReminder.objects.values_list("kind", flat=True)), ["due_soon", "overdue"])
+
+    def test_command(self):
+        self.written(self.task(-1), self.task(0), at=-datetime.timedelta(hours=1))
+        out = StringIO()
+        call_command("sweep_due_tasks", sink="outbox", stdout=out)
+        self.assertIn("Sent 1 overdue and 1 due-soon reminders.", out.getvalue())
+        self.assertEqual(TaskReminder.objects.count(), 2)
+
+
+@override_settings(TASK_CHANGES_SETTLE_SECONDS=0)
+class TaskChangesTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="syncer", password="pass", role="USER")
+        self.other = User.objects.create_user(username="sync-other", password="pass", role="USER")
+        self.admin = User.objects.create_user(username="sync-admin", password="pass", role="ADMIN")
+        self.tasks = [Task.objects.create(user=self.user, title=f"T{i}", description="d", due_date="2030-01-01")
+                      for i in range(3)]
+        self.client = self.client_for(self.user)
+        self.admin_client = self.client_for(self.admin)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def changes(self, client=None, **params):
+        response = (client or self.client).get("/api/tasks/changes/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def ids(self, data):
+        return [task["id"] for task in data["tasks"]]
+
+    def test_only_changes_since_the_cursor(self):
+        with self.assertNumQueries(2):
+            first = self.changes()
+        self.assertEqual(self.ids(first), [task.id for task in self.tasks])
+        self.assertEqual((first["removed"], first["has_more"]), ([], False))
+        self.assertEqual(first["tasks"][0], TaskSerializer(self.tasks[0]).data)
+        self.assertEqual(self.ids(self.changes(since=first["cursor"])), [])
+
+        self.client.patch(f"/api/tasks/{self.tasks[1].id}/", {"status": "IN_PROGRESS"}, format="json")
+        self.client.delete(f"/api/tasks/{self.tasks[2].id}/")
+        created = self.client.post("/api/tasks/", {"title": "N", "description": "d", "due_date": "2030-01-01"},
+                                   format="json").data["id"]
+        data = self.changes(since=first["cursor"], fields="id,status")
+        self.assertEqual(data["tasks"], [{"id": self.tasks[1].id, "status": "IN_PROGRESS"}, {"id": created, "status": "PENDING"}])
+        self.assertEqual(data["removed"], [self.tasks[2].id])
+        self.assertEqual(self.changes(since=data["cursor"])["removed"], [])
+
+    def test_reassignment_is_a_removal_for_the_previous_owner_only(self):
+        mine, theirs = self.changes()["cursor"], self.changes(self.client_for(self.other))["cursor"]
+        admin = self.changes(self.admin_client)["cursor"]
+        self.admin_client.patch(f"/api/tasks/{self.tasks[0].id}/assign/", {"username": "sync-other"}, format="json")
+        self.admin_client.patch("/api/tasks/assign/", {"username": "sync-other", "task_ids": [self.tasks[1].id]}, format="json")
+        self.client.delete("/api/tasks/bulk/", [self.tasks[2].id], format="json")
+
+        data = self.changes(since=mine)
+        self.assertEqual((data["tasks"], sorted(data["removed"])), ([], [task.id for task in self.tasks]))
+        self.assertEqual(self.ids(self.changes(self.client_for(self.other), since=theirs)), [self.tasks[0].id, self.tasks[1].id])
+        data = self.changes(self.admin_client, since=admin)
+        self.assertEqual((self.ids(data), data["removed"]), ([self.tasks[0].id, self.tasks[1].id], [self.tasks[2].id]))
+
+    def test_latest_entry_per_task_wins_across_pages(self):
+        cursor = self.changes()["cursor"]
+        self.client.patch(f"/api/tasks/{self.tasks[0].id}/", {"status": "IN_PROGRESS"}, format="json")
+        self.admin_client.patch(f"/api/tasks/{self.tasks[0].id}/assign/", {"username": "sync-other"}, format="json")
+        for task in self.tasks[1:]:
+            self.client.patch(f"/api/tasks/{task.id}/", {"status": "COMPLETED"}, format="json")
+        self.admin_client.patch(f"/api/tasks/{self.tasks[0].id}/assign/", {"username": "syncer"}, format="json")
+        self.client.delete(f"/api/tasks/{self.tasks[2].id}/")
+
+        def pages(size, since=cursor):
+            pages = []
+            while True:
+                data = self.changes(since=since, page_size=size)
+                pages.append((self.ids(data), data["removed"]))
+                since = data["cursor"]
+                if not data["has_more"]:
+                    return pages
+
+        first, second, third = (task.id for task in self.tasks)
+        # The first task leaves (its earlier update is superseded) and comes back; the third is only seen deleted.
+        self.assertEqual(pages(2), [([second], [first]), ([first], [third])])
+        self.assertEqual(pages(3), [([second, first], []), ([], [third])])
+
+    def test_invalid_and_expired_cursors(self):
+        self.assertEqual(self.client.get("/api/tasks/changes/", {"since": "nope"}).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get("/api/tasks/changes/", {"cursor": "x"}).status_code, status.HTTP_400_BAD_REQUEST)
+        old = timezone.now() - datetime.timedelta(days=31)
+        response = self.client.get("/api/tasks/changes/", {"since": encode_cursor(None, (old, 0))})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+        self.client.delete(f"/api/tasks/{self.tasks[0].id}/")
+        self.client.delete(f"/api/tasks/{self.tasks[1].id}/")
+        TaskTombstone.objects.filter(task_id=self.tasks[0].id).update(removed_at=old)
+        out = StringIO()
+        call_command("prune_task_tombstones", stdout=out)
+        self.assertIn("Deleted 1 task tombstones.", out.getvalue())
+        self.assertEqual(list(TaskTombstone.objects.values_list("task_id", flat=True)), [self.tasks[1].id])
+
+
+class AsyncTaskViewsTestCase(TestCase):
+    """The /api/async/tasks/ endpoints, served through Django's async request path."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="async", password="pass", role="USER")
+        self.other = User.objects.create_user(username="async-other", password="pass", role="USER")
+        self.admin = User.objects.create_user(username="async-admin", password="pass", role="ADMIN")
+        self.task = Task.objects.create(user=self.user, title="Async", description="d", due_date="2025-12-31")
+        Task.objects.create(user=self.other, title="Not mine", description="d", due_date="2025-12-31")
+        self.url = f"/api/async/tasks/{self.task.id}/"
+
+    def headers(self, user):
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        return {"authorization": f"Bearer {token}"}
+
+    async def test_requires_a_token(self):
+        response = await self.async_client.get("/api/async/tasks/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)
+
+    async def test_list_is_scoped_filtered_and_paginated(self):
+        await Task.objects.acreate(user=self.user, title="Done", description="d", due_date="2025-12-31", status="COMPLETED")
+        response = await self.async_client.get(
+            "/api/async/tasks/", {"status": "PENDING", "page_size": 1}, headers=self.headers(self.user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task["title"] for task in response.json()], ["Async"])
+        self.assertNotIn("Link", response)
+
+        response = await self.async_client.get("/api/async/tasks/", {"page_size": 1}, headers=self.headers(self.user))
+        self.assertIn('rel="next"', response["Link"])
+
+    async def test_matches_the_sync_views(self):
+        sync = await sync_to_async(self.sync_get)(f"/api/tasks/{self.task.id}/")
+        response = await self.async_client.get(self.url, headers=self.headers(self.user))
+        self.assertEqual(response.content, sync.content)
+        self.assertEqual(response["ETag"], sync["ETag"])
+
+    def sync_get(self, path):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        return client.get(path)
+
+    async def test_create(self):
+        payload = {"title": "New", "description": "d", "due_date": "2026-01-01"}
+        response = await self.async_client.post(
+            "/api/async/tasks/", payload, content_type="application/json", headers=self.headers(self.user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await Task.objects.filter(id=response.json()["id"], user=self.user).aexists())
+
+    def test_patch_reads_once_and_writes_once(self):
+        # Sync test: CaptureQueriesContext cannot be entered on the event loop.
+        async def patch():
+            return await self.async_client.patch(
+                self.url, {"status": "COMPLETED"}, content_type="application/json", headers=self.headers(self.user)
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = async_to_sync(patch)()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "COMPLETED")
+        statements = [q["sql"].split()[0] for q in queries.captured_queries if "tasks_taskcounter" not in q["sql"]]
+        self.assertEqual([sql for sql in statements if sql in ("SELECT", "UPDATE")], ["SELECT", "UPDATE"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "COMPLETED")
+
+    async def test_invalid_data_is_a_400(self):
+        response = await self.async_client.put(
+            self.url, {"title": ""}, content_type="application/json", headers=self.headers(self.user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("title", response.json())
+
+    async def test_stale_if_match_is_rejected(self):
+        response = await self.async_client.delete(self.url, headers={**self.headers(self.user), "if-match": '"stale"'})
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+        etag = (await self.async_client.get(self.url, headers=self.headers(self.user)))["ETag"]
+        response = await self.async_client.delete(self.url, headers={**self.headers(self.user), "if-match": etag})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(await Task.objects.filter(id=self.task.id).aexists())
+
+    async def test_other_users_task_is_not_found(self):
+        for method in ("get", "patch", "delete"):
+            response = await getattr(self.async_client, method)(self.url, headers=self.headers(self.other))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, method)
+        self.assertTrue(await Task.objects.filter(id=self.task.id).aexists())
+
+    async def test_assign(self):
+        url = f"{self.url}assign/"
+        payload = {"username": self.other.username}
+        response = await self.async_client.patch(
+            url, payload, content_type="application/json", headers=self.headers(self.user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = await self.async_client.patch(
+            url, payload, content_type="application/json", headers=self.headers(self.admin)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        await self.task.arefresh_from_db()
+        self.assertEqual(self.task.user_id, self.other.id)
+
+
+class StreamClient:
+    """One request to an ASGI application, driven like a server would."""
+
+    def __init__(self, app, path=EVENTS_PATH, method="GET", headers=None):
+        self.received, self.sent = asyncio.Queue(), asyncio.Queue()
+        self.received.put_nowait({"type": "http.request", "body": b"", "more_body": False})
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+            "path": path, "root_path": "", "query_string": b"", "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+            "headers": [(name.encode(), value.encode()) for name, value in (headers or {}).items()],
+        }
+        self.done = asyncio.ensure_future(app(scope, self.received.get, self.sent.put))
+
+    async def next(self, timeout=2):
+        return await asyncio.wait_for(self.sent.get(), timeout)
+
+    async def open(self):
+        """The response start; for a 200, after the retry line that begins every stream."""
+        start = await self.next()
+        if start["status"] == 200:
+            assert (await self.next())["body"] == RETRY
+        return start
+
+    async def event(self):
+        body = (await self.next())["body"]
+        if body == RESYNC:
+            return "resync"
+        name, data = body.decode().strip().split("\n")
+        assert name == "event: task", body
+        return json.loads(data.removeprefix("data: "))
+
+    async def disconnect(self):
+        self.received.put_nowait({"type": "http.disconnect"})
+        await asyncio.wait_for(self.done, 2)
+
+
+class TaskEventStreamTestCase(TestCase):
+    """GET /api/async/tasks/events/, through TaskEventStream and the local broker."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="listener", password="pass", role="USER")
+        self.other = User.objects.create_user(username="listener-other", password="pass", role="USER")
+        self.admin = User.objects.create_user(username="listener-admin", password="pass", role="ADMIN")
+        self.task = Task.objects.create(user=self.user, title="Watched", description="d", due_date="2025-12-31")
+        self.passed_through = []
+        self.app = TaskEventStream(self.django_app)
+
+    async def django_app(self, scope, receive, send):
+        self.passed_through.append(scope["path"])
+
+    def connect(self, user=None, **kwargs):
+        headers = {}
+        if user is not None:
+            headers["authorization"] = f"Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}"
+        return StreamClient(self.app, headers=headers, **kwargs)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    async def write(self, user, method, path, data=None):
+        """A request through the sync API, with its on_commit callbacks (the publishing) run."""
+        def request():
+            with self.captureOnCommitCallbacks(execute=True):
+                return getattr(self.client_for(user), method)(path, data, format="json")
+
+        return await sync_to_async(request)()
+
+    async def test_events_reach_the_owners_and_admins_only(self):
+        streams = {name: self.connect(user) for name, user in
+                   (("user", self.user), ("other", self.other), ("admin", self.admin))}
+        for stream in streams.values():
+            start = await stream.open()
+            self.assertEqual(start["status"], status.HTTP_200_OK)
+            self.assertIn((b"Content-Type", b"text/event-stream"), start["headers"])
+
+        await self.write(self.user, "patch", f"/api/tasks/{self.task.id}/", {"status": "IN_PROGRESS"})
+        expected = {"action": "updated", "task_ids": [self.task.id]}
+        self.assertEqual(await streams["user"].event(), expected)
+        self.assertEqual(await streams["admin"].event(), expected)
+
+        response = await self.write(self.admin, "patch", f"/api/tasks/{self.task.id}/assign/", {"username": "listener-other"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The first event of `other` is this one: it got nothing for the update.
+        for name in ("user", "other", "admin"):
+            self.assertEqual(await streams[name].event(), {"action": "assigned", "task_ids": [self.task.id]}, name)
+
+        for stream in streams.values():
+            await stream.disconnect()
+
+    async def test_large_writes_are_sent_without_ids(self):
+        stream = self.connect(self.user)
+        await stream.open()
+        items = [{"title": f"Bulk {i}", "description": "d", "due_date": "2025-12-31"} for i in range(3)]
+        with self.settings(TASK_EVENTS_MAX_IDS=2):
+            await self.write(self.user, "post", "/api/tasks/bulk/", items)
+        self.assertEqual(await stream.event(), {"action": "created", "task_ids": None})
+        await stream.disconnect()
+
+    async def test_a_client_that_falls_behind_gets_a_resync(self):
+        with self.settings(TASK_EVENTS_BUFFER=2):
+            stream = self.connect(self.user)
+            await stream.open()
+        dropped = hub.dropped
+        for i in range(5):  # On the loop, without yielding: the stream cannot drain in between.
+            hub.deliver({"action": "updated", "user_ids": [self.user.id], "task_ids": [i]})
+        self.assertEqual(hub.dropped, dropped + 1)
+        self.assertEqual(await stream.event(), "resync")
+        hub.deliver({"action": "deleted", "user_ids": [self.user.id], "task_ids": [9]})
+        self.assertEqual(await stream.event(), {"action": "deleted", "task_ids": [9]})
+        await stream.disconnect()
+
+    async def test_handshake_errors(self):
+        start = await self.connect().open()
+        self.assertEqual(start["status"], status.HTTP_401_UNAUTHORIZED)
+        self.assertIn(b"WWW-Authenticate", dict(start["headers"]))
+
+        stream = self.connect(self.user, method="POST")
+        self.assertEqual((await stream.open())["status"], status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        with self.settings(TASK_EVENTS_MAX_CONNECTIONS=0):
+            stream = self.connect(self.user)
+            self.assertEqual((await stream.open())["status"], status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertIn("error", json.loads((await stream.next())["body"]))
+        self.assertEqual(hub.open, 0)
+
+    async def test_handshake_goes_through_the_middleware(self):
+        def handshakes():
+            return {labels: value for _, labels, value in REQUESTS.samples()}.get(
+                '{view="async-task-events",method="GET",status="200"}', 0
+            )
+
+        before = handshakes()
+        stream = self.connect(self.user)
+        headers = dict((await stream.open())["headers"])
+        self.assertEqual(headers[b"X-Frame-Options"], b"DENY")
+        self.assertEqual(handshakes(), before + 1)
+        await stream.disconnect()
+
+        # Django's own application has nothing to write the events with.
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        response = await self.async_client.get(EVENTS_PATH, headers={"authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_handshake_failures_are_logged(self):
+        with mock.patch.object(self.app.handler, "create_request", side_effect=RuntimeError("bad scope")):
+            with self.assertLogs("tasks", "ERROR") as logs:
+                stream = self.connect(self.user)
+                self.assertEqual((await stream.open())["status"], status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertIn("bad scope", "\n".join(logs.output))
+        self.assertEqual(hub.open, 0)
+
+    async def test_disconnect_closes_the_stream(self):
+        stream = self.connect(self.user)
+        await stream.open()
+        self.assertEqual(hub.open, 1)
+        await stream.disconnect()
+        self.assertEqual(hub.open, 0)
+
+    async def test_keepalives_until_the_stream_expires(self):
+        # Set before the first stream of the test's loop, which starts the keepalive tick.
+        with self.settings(TASK_EVENTS_KEEPALIVE=0.05, TASK_EVENTS_MAX_SECONDS=0.2):
+            stream = self.connect(self.user)
+            await stream.open()
+            self.assertEqual((await stream.next())["body"], KEEPALIVE)
+            await asyncio.wait_for(stream.done, 2)
+        bodies = []
+        while not stream.sent.empty():
+            bodies.append(stream.sent.get_nowait())
+        self.assertEqual(bodies[-1], {"type": "http.response.body", "body": b""})
+        self.assertEqual(hub.open, 0)
+
+    async def test_other_requests_pass_through(self):
+        await StreamClient(self.app, path="/api/async/tasks/").done
+        self.assertEqual(self.passed_through, ["/api/async/tasks/"])
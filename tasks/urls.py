@@ -1,8 +1,18 @@
 from django.urls import path
-from .views import TaskListCreateView, TaskRetrieveUpdateDeleteView, AssignTaskView
+from .views import (
+    TaskListCreateView, TaskRetrieveUpdateDeleteView, AssignTaskView, BulkAssignTaskView, TaskBulkView, TaskChangesView,
+    TaskExportView, TaskImportView, TaskSearchView, TaskStatsView,
+)
 
 urlpatterns = [
     path("", TaskListCreateView.as_view(), name="task-list-create"),
+    path("bulk/", TaskBulkView.as_view(), name="task-bulk"),
+    path("export/", TaskExportView.as_view(), name="task-export"),
+    path("import/", TaskImportView.as_view(), name="task-import"),
+    path("search/", TaskSearchView.as_view(), name="task-search"),
+    path("stats/", TaskStatsView.as_view(), name="task-stats"),
+    path("changes/", TaskChangesView.as_view(), name="task-changes"),
+    path("assign/", BulkAssignTaskView.as_view(), name="bulk-assign-tasks"),
     path("<int:pk>/", TaskRetrieveUpdateDeleteView.as_view(), name="task-detail"),
     path('<int:pk>/assign/', AssignTaskView.as_view(), name='assign-task'),
 ]
@@ -1,10 +1,26 @@
 import logging
+from collections import Counter
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
 from rest_framework import generics, permissions, status
-from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from .models import Task
-from .serializers import TaskSerializer
+from .cache import task_list_cache
+from .changes import read_changes
+from .conditional import evaluate_preconditions, list_validators, task_validators
+from .export import FORMATS as EXPORT_FORMATS, export_response
+from .importer import FORMATS as IMPORT_FORMATS, TaskImporter, detect_type, read_rows
+from .filters import TaskFilterBackend, get_projected_fields, read_columns
+from .models import Task, TaskStatus
+from .pagination import KeysetPagination, TaskCursorPagination, TaskSearchPagination
+from .serializers import TaskReadSerializer, TaskSerializer
+from .search import ranked_ids
+from .signals import task_changed
+from .stats import count_changes, counter_key, read_stats
 
 logger = logging.getLogger('tasks')
 User = get_user_model()
@@ -12,76 +28,402 @@ User = get_user_model()
 class TaskListCreateView(generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend]
 
     def get_queryset(self):
         try:
-            logger.info(self.request.user.role)
-            if self.request.user.role == "ADMIN":
-                return Task.objects.all()
-            return Task.objects.filter(user=self.request.user)
+            logger.debug("Listing tasks for %s (role %s)", self.request.user, self.request.user.role)
+            return Task.objects.visible_to(self.request.user)
         except Exception as e:
-            logger.error(f"Error fetching tasks for user {self.request.user}: {e}")
+            logger.error("Error fetching tasks for user %s: %s", self.request.user, e)
             return Response({"error": "Something went wrong"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", get_projected_fields(self.request))
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        version = task_list_cache.version(request)
+        validators = list_validators(request, *version)
+        not_modified = evaluate_preconditions(request, validators)
+        if not_modified is not None:
+            return not_modified
+        key = task_list_cache.key(request, version)
+        cached = task_list_cache.get(key)
+        if cached is not None:
+            data, headers = cached
+            return Response(data, headers={**headers, **validators.headers, "X-Cache": "HIT"})
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        serializer = TaskReadSerializer(get_projected_fields(request))
+        rows = queryset.values(*read_columns(queryset, serializer.fields, self.paginator))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            response = Response(serializer.many(rows))
+        else:
+            response = self.get_paginated_response(serializer.many(page))
+        headers = {"Link": response["Link"]} if response.has_header("Link") else {}
+        task_list_cache.set(key, (list(response.data), headers))
+        for name, value in {**validators.headers, "X-Cache": "MISS"}.items():
+            response[name] = value
+        return response
+
     def perform_create(self, serializer):
         try:
-            serializer.save(user=self.request.user)
-            logger.info(f"Task created successfully by user {self.request.user}")
+            # The task and its counter rows are written together, or not at all.
+            with transaction.atomic():
+                task = serializer.save(user_id=self.request.user.id)
+                counts = count_changes(after=[counter_key(task)])
+                task_changed.send(sender=Task, action="created", user_ids={self.request.user.id}, counts=counts,
+                                  task_ids=[task.id])
+            logger.info("Task created successfully by user %s", self.request.user)
         except Exception as e:
-            logger.error(f"Error creating task: {e}")
+            logger.error("Error creating task: %s", e)
             raise e
 
 
-class TaskRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+class TaskExportView(generics.GenericAPIView):
+    """
+    Stream every task the user can see as NDJSON (default) or CSV, with the
+    filters of the list: `?type=csv&status=PENDING&fields=id,title`.
+    """
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [TaskFilterBackend]
+    pagination_class = None
+    extra_query_params = ("type",)
 
     def get_queryset(self):
+        return Task.objects.visible_to(self.request.user).order_by("id")
 
-        logger.info(self)
-        if self.request.user.role == "ADMIN":
-            return Task.objects.all()
-        return Task.objects.filter(user=self.request.user)
+    def get(self, request, *args, **kwargs):
+        export_type = request.query_params.get("type", "ndjson")
+        if export_type not in EXPORT_FORMATS:
+            raise ValidationError({"type": [f"Expected one of: {', '.join(EXPORT_FORMATS)}."]})
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = get_projected_fields(request) or TaskSerializer.Meta.fields
+        logger.info("Task export (%s) started by user %s", export_type, request.user)
+        chunk_size = getattr(settings, "TASK_EXPORT_CHUNK_SIZE", 2000)
+        return export_response(request, queryset, fields, export_type, chunk_size)
+
+
+class TaskImportView(generics.GenericAPIView):
+    """
+    Import tasks from an uploaded CSV or NDJSON `file` (see tasks/importer.py).
+    The format follows the file name unless `?type=csv|ndjson` is given. Rows
+    belong to the caller; ADMINs may name another owner in a `username` column.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+        import_type = request.query_params.get("type") or detect_type(upload.name)
+        if import_type not in IMPORT_FORMATS:
+            raise ValidationError({"type": [f"Expected one of: {', '.join(IMPORT_FORMATS)}."]})
+
+        importer = TaskImporter(owner=request.user, allow_other_owners=request.user.role == "ADMIN")
+        importer.run(read_rows(upload.file, import_type))
+        logger.info(
+            "User %s imported %s tasks (%s rejected) in %.2f s",
+            request.user, importer.created, importer.rejected, importer.seconds,
+        )
+        failed = importer.rejected and not importer.created
+        return Response(importer.report(), status=status.HTTP_400_BAD_REQUEST if failed else status.HTTP_201_CREATED)
+
+
+class TaskSearchView(generics.GenericAPIView):
+    """
+    Full-text search over titles and descriptions, best match first:
+    `?q=quarterly report`. Every word must match (stemmed, so "reports"
+    finds "report"). Pages are keyset pages as on the list; `fields` applies.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TaskSearchPagination
+    filter_params = ("fields",)  # The list filters do not apply here.
+    extra_query_params = ("q",)
+
+    def get(self, request, *args, **kwargs):
+        TaskFilterBackend().check_unknown_params(request.query_params, self)
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": ["This parameter is required."]})
+        user_id = None if request.user.role == "ADMIN" else request.user.id
+        matches = self.paginator.paginate_search(
+            lambda position, reverse, limit: ranked_ids(text, user_id, position, reverse, limit), request
+        )
+        serializer = TaskReadSerializer(get_projected_fields(request))
+        rows = Task.objects.visible_to(request.user).filter(id__in=[match["id"] for match in matches])
+        rows = {row["id"]: row for row in rows.values(*read_columns(rows, serializer.fields))}
+        data = [serializer.to_representation(rows[match["id"]]) for match in matches if match["id"] in rows]
+        return self.get_paginated_response(data)
+
+
+class TaskChangesView(generics.GenericAPIView):
+    """
+    What changed in the caller's tasks since `?since=<cursor>` (see
+    tasks/changes.py): tasks created or updated, oldest first, and the ids of
+    tasks that were deleted or reassigned away. Without `since`, every task.
+    Pass the returned `cursor` as `since` next time; while `has_more` is true,
+    ask again straight away. `fields` and `page_size` apply.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    filter_params = ("fields",)
+    extra_query_params = ("since", "page_size")
+
+    def get(self, request, *args, **kwargs):
+        TaskFilterBackend().check_unknown_params(request.query_params, self)
+        serializer = TaskReadSerializer(get_projected_fields(request))
+        limit = KeysetPagination().get_page_size(request)
+        tasks, removed, cursor, has_more = read_changes(
+            request.user, request.query_params.get("since"), limit, serializer.fields
+        )
+        return Response({"tasks": serializer.many(tasks), "removed": removed, "cursor": cursor, "has_more": has_more})
+
+
+class TaskStatsView(generics.GenericAPIView):
+    """
+    Task counts by status, plus overdue tasks (open and past their due date),
+    read from the TaskCounter summary rows. ADMINs also get the counts over
+    all users, and may ask for another user's with `?username=`.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        user = request.user
+        username = request.query_params.get("username")
+        if username and username != user.username:
+            if user.role != "ADMIN":
+                raise PermissionDenied({"error": "Only admins can see other users' statistics."})
+            user = get_assignee(username)
+        scopes = [user.id, None] if request.user.role == "ADMIN" else [user.id]
+        stats = read_stats(scopes)
+        data = {"user": {"username": user.username, **stats[user.id]}}
+        if None in stats:
+            data["all"] = stats[None]
+        return Response(data)
+
+
+class TaskRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Task.objects.visible_to(self.request.user)
+        if self.request.method not in permissions.SAFE_METHODS:
+            # update()/delete() read, check and write the row in one transaction.
+            queryset = queryset.select_for_update()
+        return queryset
 
     def get_object(self):
 
         try:
             task = super().get_object()
-            if self.request.user.role != "ADMIN" and task.user != self.request.user:
-                logger.warning(f"User {self.request.user} tried to access unauthorized task {task.id}")
+            if self.request.user.role != "ADMIN" and task.user_id != self.request.user.id:
+                logger.warning("User %s tried to access unauthorized task %s", self.request.user, task.id)
                 raise PermissionDenied({"error": "You do not have permission to access this task."})
             return task
-        except Task.DoesNotExist:
-            logger.warning(f"Task not found for user {self.request.user}")
+        except (Task.DoesNotExist, Http404):
+            logger.warning("Task not found for user %s", self.request.user)
             raise NotFound({"error": "Task not found"})
 
-    def update(self, request, *args, **kwargs):
+    def retrieve(self, request, *args, **kwargs):
+        task = self.get_object()
+        validators = task_validators(task.id, task.updated_at)
+        not_modified = evaluate_preconditions(request, validators)
+        if not_modified is not None:
+            return not_modified
+        return Response(TaskReadSerializer().instance_representation(task), headers=validators.headers)
+
+    def check_preconditions(self, request, task):
+        """If-Match / If-Unmodified-Since against the current version of `task`."""
+        return evaluate_preconditions(request, task_validators(task.id, task.updated_at))
 
+    # update() and delete() fetch the task once and pass it on, instead of
+    # going through the generic mixins, which would call get_object() again.
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
         try:
-            task = self.get_object()
-            response = super().update(request, *args, **kwargs)
-            logger.info(f"Task {task.id} updated by user {self.request.user} (Role: {self.request.user.role})")
-            return response
+            with transaction.atomic():
+                task = self.get_object()
+                failed = self.check_preconditions(request, task)
+                if failed is not None:
+                    return failed
+                before = counter_key(task)
+                serializer = self.get_serializer(task, data=request.data, partial=partial)
+                serializer.is_valid(raise_exception=True)
+                self.perform_update(serializer)
+                counts = count_changes([before], [counter_key(task)])
+                task_changed.send(sender=Task, action="updated", user_ids={task.user_id}, counts=counts,
+                                  task_ids=[task.id])
+            logger.info("Task %s updated by user %s (Role: %s)", task.id, self.request.user, self.request.user.role)
+            return Response(serializer.data, headers=task_validators(task.id, task.updated_at).headers)
         except PermissionDenied:
             return Response({"error": "You do not have permission to update this task."}, status=status.HTTP_403_FORBIDDEN)
+        except (NotFound, ValidationError):
+            raise
         except Exception as e:
-            logger.error(f"Error updating task: {e}")
+            logger.error("Error updating task: %s", e)
             return Response({"error": "Error updating task"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def delete(self, request, *args, **kwargs):
 
         try:
-            task = self.get_object()
-            response = super().delete(request, *args, **kwargs)
-            logger.info(f"Task {task.id} deleted by user {self.request.user} (Role: {self.request.user.role})")
-            return response
+            with transaction.atomic():
+                task = self.get_object()
+                failed = self.check_preconditions(request, task)
+                if failed is not None:
+                    return failed
+                task_id = task.id  # delete() clears it
+                self.perform_destroy(task)
+                counts = count_changes(before=[counter_key(task)])
+                task_changed.send(sender=Task, action="deleted", user_ids={task.user_id}, counts=counts,
+                                  task_ids=[task_id], removed={task_id: task.user_id})
+            logger.info("Task %s deleted by user %s (Role: %s)", task_id, self.request.user, self.request.user.role)
+            return Response(status=status.HTTP_204_NO_CONTENT)
         except PermissionDenied:
             return Response({"error": "You do not have permission to delete this task."}, status=status.HTTP_403_FORBIDDEN)
+        except (NotFound, ValidationError):
+            raise
         except Exception as e:
-            logger.error(f"Error deleting task: {e}")
+            logger.error("Error deleting task: %s", e)
             return Response({"error": "Error deleting task"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class TaskBulkView(generics.GenericAPIView):
+    """
+    Bulk create (POST), update (PATCH) and delete (DELETE) in one request.
+
+    POST takes a list of tasks, PATCH a list of partial tasks with their `id`,
+    DELETE a list of ids. Valid items are written in a single transaction and
+    invalid ones are reported by index; with `?atomic=true` any invalid item
+    rejects the whole batch.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Task.objects.visible_to(self.request.user)
+
+    def get_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"error": "Expected a non-empty list."})
+        limit = getattr(settings, "TASK_BULK_MAX_ITEMS", 1000)
+        if len(items) > limit:
+            raise ValidationError({"error": f"At most {limit} items per request."})
+        return items
+
+    def is_atomic(self, request):
+        return TaskFilterBackend.parse_bool(request.query_params, "atomic")
+
+    def bulk_response(self, key, result, errors, atomic, success_status=status.HTTP_200_OK):
+        # Nothing was written when this is a 400: either atomic mode or every item failed.
+        failed = errors and (atomic or not result)
+        return Response({key: result, "errors": errors}, status=status.HTTP_400_BAD_REQUEST if failed else success_status)
+
+    def post(self, request, *args, **kwargs):
+        atomic = self.is_atomic(request)
+        serializer = self.get_serializer(data=self.get_items(request), many=True)
+        serializer.validate_items()
+        created = []
+        if serializer.valid_items and not (atomic and serializer.item_errors):
+            tasks = [Task(user_id=request.user.id, **data) for _, data in serializer.valid_items]
+            with transaction.atomic():
+                created = Task.objects.bulk_create(tasks, batch_size=500)
+                counts = count_changes(after=map(counter_key, created))
+                task_changed.send(sender=Task, action="created", user_ids={request.user.id}, counts=counts,
+                                  task_ids=[task.id for task in created])
+            logger.info("%s tasks bulk created by user %s", len(created), request.user)
+            created = self.get_serializer(created, many=True).data
+        return self.bulk_response("created", created, serializer.item_errors, atomic, status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        atomic = self.is_atomic(request)
+        items = self.get_items(request)
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        serializer = self.get_serializer(data=items, many=True, partial=True)
+        serializer.validate_items()
+        errors = serializer.item_errors
+
+        changed, fields = [], {"updated_at"}
+        with transaction.atomic():
+            # Read, check and write the rows in one transaction, so the counter
+            # deltas are taken from the versions bulk_update() overwrites.
+            tasks = self.get_queryset().select_for_update().in_bulk([pk for pk in ids if isinstance(pk, int)])
+            errors += [
+                {"index": index, "errors": {"id": ["Task not found."]}}
+                for index, pk in enumerate(ids)
+                if not isinstance(pk, int) or pk not in tasks
+            ]
+            failed = {error["index"] for error in errors}
+            errors.sort(key=lambda error: error["index"])
+
+            before = {pk: counter_key(task) for pk, task in tasks.items()}
+            if not (atomic and errors):
+                now = timezone.now()
+                for index, data in serializer.valid_items:
+                    if index in failed:
+                        continue
+                    task = tasks[ids[index]]
+                    for name, value in data.items():
+                        setattr(task, name, value)
+                    # bulk_update() bypasses auto_now, so stamp updated_at ourselves.
+                    task.updated_at = now
+                    fields.update(data)
+                    changed.append(task)
+            if changed:
+                Task.objects.bulk_update(changed, sorted(fields), batch_size=500)
+                unique = {task.id: task for task in changed}
+                counts = count_changes([before[pk] for pk in unique], map(counter_key, unique.values()))
+                task_changed.send(sender=Task, action="updated", user_ids={task.user_id for task in changed},
+                                  counts=counts, task_ids=list(unique))
+        if changed:
+            logger.info("%s tasks bulk updated by user %s", len(changed), request.user)
+        return self.bulk_response("updated", self.get_serializer(changed, many=True).data, errors, atomic)
+
+    def delete(self, request, *args, **kwargs):
+        atomic = self.is_atomic(request)
+        ids = self.get_items(request)
+        deleted = 0
+        with transaction.atomic():
+            # The rows are locked from the read to the delete, so the counter deltas match what is removed.
+            found = {
+                pk: (user_id, task_status, due_date)
+                for pk, user_id, task_status, due_date in self.get_queryset().select_for_update()
+                .filter(id__in=[pk for pk in ids if isinstance(pk, int)])
+                .values_list("id", "user_id", "status", "due_date")
+            }
+            errors = [
+                {"index": index, "errors": {"id": ["Task not found."]}}
+                for index, pk in enumerate(ids)
+                if not isinstance(pk, int) or pk not in found
+            ]
+            if found and not (atomic and errors):
+                deleted, _ = self.get_queryset().filter(id__in=found).delete()
+                counts = count_changes(before=found.values())
+                removed = {pk: key[0] for pk, key in found.items()}
+                task_changed.send(sender=Task, action="deleted", user_ids=set(removed.values()), counts=counts,
+                                  task_ids=list(found), removed=removed)
+        if deleted:
+            logger.info("%s tasks bulk deleted by user %s", deleted, request.user)
+        return self.bulk_response("deleted", deleted, errors, atomic)
+
+
+def get_assignee(username):
+    try:
+        return User.objects.only("id", "username").get(username=username)
+    except User.DoesNotExist:
+        logger.error("User '%s' not found", username)
+        raise NotFound({"error": "User not found"})
+
+
 class AssignTaskView(generics.UpdateAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
@@ -89,25 +431,87 @@ class AssignTaskView(generics.UpdateAPIView):
 
     def update(self, request, *args, **kwargs):
         if request.user.role != "ADMIN":
-            logger.warning(f"Unauthorized access attempt by {request.user}")
+            logger.warning("Unauthorized access attempt by %s", request.user)
             raise PermissionDenied({"error": "Only admins can assign tasks"})
 
         task_id = kwargs.get("pk") 
         username = request.data.get("username")
 
         try:
-            task = Task.objects.get(pk=task_id)
+            task = Task.objects.only("id", "title", "user_id", "status", "due_date").get(pk=task_id)
         except Task.DoesNotExist:
-            logger.error(f"Task with ID {task_id} not found")
+            logger.error("Task with ID %s not found", task_id)
             raise NotFound({"error": "Task not found"})
 
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            logger.error(f"User '{username}' not found")
-            raise NotFound({"error": "User not found"})
+        user = get_assignee(username)
 
+        previous_owner, before = task.user_id, counter_key(task)
         task.user = user
-        task.save()
-        logger.info(f"Task '{task.title}' assigned to {user.username} by {request.user}")
-        return Response({"message": f"Task '{task.title}' assigned to {user.username}"}, status=status.HTTP_200_OK)
\ No newline at end of file
+        with transaction.atomic():
+            task.save(update_fields=["user", "updated_at"])
+            counts = count_changes([before], [counter_key(task)])
+            removed = {task.id: previous_owner} if previous_owner != user.id else {}
+            task_changed.send(sender=Task, action="assigned", user_ids={previous_owner, user.id}, counts=counts,
+                              task_ids=[task.id], removed=removed)
+        logger.info("Task '%s' assigned to %s by %s", task.title, user.username, request.user)
+        return Response({"message": f"Task '{task.title}' assigned to {user.username}"}, status=status.HTTP_200_OK)
+
+
+class BulkAssignTaskView(generics.GenericAPIView):
+    """
+    Reassign many tasks with a single `UPDATE ... SET user_id`.
+
+    Body: `{"username": "bob", "task_ids": [1, 2]}` and/or the filters
+    `from_username` and `status`, e.g. all PENDING tasks of a departing user:
+    `{"username": "bob", "from_username": "alice", "status": "PENDING"}`.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def patch(self, request, *args, **kwargs):
+        if request.user.role != "ADMIN":
+            logger.warning("Unauthorized access attempt by %s", request.user)
+            raise PermissionDenied({"error": "Only admins can assign tasks"})
+
+        tasks = self.get_selection(request.data)
+        user = get_assignee(request.data.get("username"))
+        tasks = tasks.exclude(user_id=user.id)
+        with transaction.atomic():
+            # Each task's previous owner is needed for its tombstone (tasks/changes.py).
+            rows = list(tasks.order_by().values_list("id", "user_id", "status", "due_date"))
+            previous = {pk: user_id for pk, user_id, _, _ in rows}
+            moved = Counter(row[1:] for row in rows)
+            updated = tasks.update(user_id=user.id, updated_at=timezone.now())
+            if updated:
+                # Rows selected above but changed before the UPDATE are left to reconcile_task_counters.
+                counts = Counter()
+                for (user_id, task_status, due_date), n in moved.items():
+                    counts[user_id, task_status, due_date] -= n
+                    counts[user.id, task_status, due_date] += n
+                previous_owners = {user_id for user_id, _, _ in moved}
+                task_changed.send(sender=Task, action="assigned", user_ids=previous_owners | {user.id}, counts=counts,
+                                  task_ids=list(previous), removed=previous)
+        logger.info("%s tasks assigned to %s by %s", updated, user.username, request.user)
+        return Response({"message": f"{updated} tasks assigned to {user.username}", "updated": updated}, status=status.HTTP_200_OK)
+
+    def get_selection(self, data):
+        if not isinstance(data, dict) or not any(key in data for key in ("task_ids", "from_username", "status")):
+            raise ValidationError({"error": "Provide task_ids, from_username and/or status to select tasks."})
+
+        tasks = Task.objects.all()
+        if "task_ids" in data:
+            ids = data["task_ids"]
+            if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+                raise ValidationError({"task_ids": ["Expected a list of task ids."]})
+            limit = getattr(settings, "TASK_BULK_MAX_ITEMS", 1000)
+            if len(ids) > limit:
+                raise ValidationError({"task_ids": [f"At most {limit} ids per request."]})
+            tasks = tasks.filter(id__in=ids)
+        if "from_username" in data:
+            tasks = tasks.filter(user_id=get_assignee(data["from_username"]).id)
+        if "status" in data:
+            statuses = data["status"] if isinstance(data["status"], list) else [data["status"]]
+            if not all(value in TaskStatus.values for value in statuses):
+                raise ValidationError({"status": ["Invalid status."]})
+            tasks = tasks.filter(status__in=statuses)
+        return tasks
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from benchmarks.endpoints import BASELINE, ENDPOINTS, api_routes, compare, run_suite
+
+
+def test_every_api_route_is_benchmarked():
+    assert api_routes() <= {endpoint.route for endpoint in ENDPOINTS}
+
+
+def test_compare_flags_extra_queries_and_slowdowns():
+    baseline = {
+        "config": {"database": "sqlite"},
+        "endpoints": {"GET /x": {"queries": 1, "p50": 10.0, "p95": 20.0, "peak_kib": 100.0}},
+    }
+    same = {"config": {"database": "sqlite"}, "endpoints": {"GET /x": dict(baseline["endpoints"]["GET /x"])}}
+    assert compare(same, baseline) == []
+
+    slower = json.loads(json.dumps(same))
+    slower["endpoints"]["GET /x"].update(queries=2, p50=30.0)
+    assert [problem.split(":")[1].split()[0] for problem in compare(slower, baseline)] == ["2", "p50"]
+
+    # Timings from another database are not comparable; query counts are.
+    slower["config"]["database"] = "postgresql"
+    assert len(compare(slower, baseline)) == 1
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_no_regressions_against_baseline(request):
+    baseline = json.loads(BASELINE.read_text())
+    config = baseline["config"]
+    results = run_suite(config["users"], config["tasks"], config["repeat"])
+    problems = compare(results, baseline, tolerance=request.config.getoption("--benchmark-tolerance"))
+    assert not problems, "\n".join(problems)
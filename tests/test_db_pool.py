@@ -0,0 +1,69 @@
+import threading
+
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase
+
+from task_management.pooled_postgresql.pool import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_returned_connections_are_reused(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        first = pool.checkout(FakeConnection)
+        pool.checkin(first)
+        self.assertIs(pool.checkout(FakeConnection), first)
+
+    def test_closed_or_unhealthy_connections_are_replaced(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        dead, stale = pool.checkout(FakeConnection), pool.checkout(FakeConnection)
+        pool.checkin(dead)
+        pool.checkin(stale)
+        dead.closed = True
+
+        fresh = pool.checkout(FakeConnection, check=lambda connection: connection is not stale)
+        self.assertNotIn(fresh, (dead, stale))
+        self.assertTrue(stale.closed)
+
+    def test_checkin_without_reuse_closes_the_connection(self):
+        pool = ConnectionPool(max_size=1, timeout=1)
+        connection = pool.checkout(FakeConnection)
+        pool.checkin(connection, reuse=False)
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.checkout(FakeConnection), connection)
+
+    def test_checkout_waits_for_a_free_slot(self):
+        pool = ConnectionPool(max_size=1, timeout=5)
+        connection = pool.checkout(FakeConnection)
+        threading.Timer(0.05, pool.checkin, [connection]).start()
+        self.assertIs(pool.checkout(FakeConnection), connection)
+
+    def test_checkout_times_out_when_exhausted(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.checkout(FakeConnection)
+        with self.assertRaises(OperationalError):
+            pool.checkout(FakeConnection)
+
+    def test_failed_connect_frees_its_slot(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+
+        def refuse():
+            raise OperationalError("connection refused")
+
+        with self.assertRaises(OperationalError):
+            pool.checkout(refuse)
+        self.assertIsInstance(pool.checkout(FakeConnection), FakeConnection)
+
+    def test_close_drops_idle_connections(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        connection = pool.checkout(FakeConnection)
+        pool.checkin(connection)
+        pool.close()
+        self.assertTrue(connection.closed)
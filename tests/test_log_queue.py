@@ -0,0 +1,80 @@
+import logging
+import threading
+
+from django.test import SimpleTestCase
+
+from task_management.log_queue import BoundedQueueHandler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class BoundedQueueHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.target = ListHandler()
+        self.target.set_name("test-log-queue-target")
+        logging._handlers[self.target.name] = self.target
+
+    def make_handler(self, **kwargs):
+        handler = BoundedQueueHandler([self.target.name], **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def record(self, msg, *args):
+        return logging.LogRecord("tasks", logging.INFO, __file__, 0, msg, args, None)
+
+    def stall_listener(self, handler):
+        """Park the listener thread on a first record until the returned event is set."""
+        blocked = threading.Event()
+        release = threading.Event()
+        original_emit = self.target.emit
+
+        def slow_emit(record):
+            blocked.set()
+            release.wait(5)
+            original_emit(record)
+
+        self.target.emit = slow_emit
+        handler.handle(self.record("first"))
+        blocked.wait(5)
+        return release
+
+    def test_records_are_written_by_the_listener(self):
+        handler = self.make_handler()
+        handler.handle(self.record("task %s updated", 7))
+        handler.flush()
+        self.assertEqual(self.target.messages, ["task 7 updated"])
+
+    def test_full_queue_drops_newest_and_reports_it(self):
+        handler = self.make_handler(maxsize=2)
+        release = self.stall_listener(handler)
+        for i in range(5):
+            handler.handle(self.record("queued %d", i))
+        release.set()
+        handler.flush()
+        self.assertEqual(
+            sorted(self.target.messages),
+            ["3 log records dropped: logging queue full", "first", "queued 0", "queued 1"],
+        )
+
+    def test_drop_oldest_keeps_the_latest_records(self):
+        handler = self.make_handler(maxsize=2, drop="oldest")
+        release = self.stall_listener(handler)
+        for i in range(5):
+            handler.handle(self.record("queued %d", i))
+        release.set()
+        handler.flush()
+        self.assertEqual(
+            sorted(self.target.messages),
+            ["3 log records dropped: logging queue full", "first", "queued 3", "queued 4"],
+        )
+
+    def test_rejects_unknown_drop_policy(self):
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler([self.target.name], drop="random")
@@ -0,0 +1,114 @@
+import re
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from users.serializers import CustomTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+def sample(text, name, **labels):
+    """The value of one sample in Prometheus text output (0 when absent)."""
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}\{{{re.escape(wanted)}\}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="metered", password="pass", role="USER")
+        self.task = Task.objects.create(user=self.user, title="T", description="d", due_date="2025-12-31")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def metrics(self):
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return response.content.decode()
+
+    def test_requests_are_recorded_per_url_name(self):
+        before = self.metrics()
+        self.client.get(f"/api/tasks/{self.task.id}/")
+        self.client.get("/api/tasks/999999/")
+        after = self.metrics()
+
+        labels = {"view": "task-detail", "method": "GET"}
+        for status in ("200", "404"):
+            self.assertEqual(
+                sample(after, "http_requests_total", **labels, status=status)
+                - sample(before, "http_requests_total", **labels, status=status),
+                1,
+            )
+        self.assertEqual(
+            sample(after, "http_request_db_queries_count", **labels)
+            - sample(before, "http_request_db_queries_count", **labels),
+            2,
+        )
+        self.assertGreaterEqual(
+            sample(after, "http_request_db_queries_sum", **labels) - sample(before, "http_request_db_queries_sum", **labels),
+            2,
+        )
+        self.assertGreater(sample(after, "http_response_size_bytes_sum", **labels), 0)
+        self.assertIn('http_request_duration_seconds_bucket{view="task-detail",method="GET",le="+Inf"}', after)
+        self.assertIn("# TYPE task_list_cache_hits_total counter", after)
+
+    def test_queries_of_async_views_are_counted(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        before = self.metrics()
+        response = async_to_sync(self.async_get)(f"/api/async/tasks/{self.task.id}/", f"Bearer {token}")
+        self.assertEqual(response.status_code, 200)
+        after = self.metrics()
+
+        labels = {"view": "async-task-detail", "method": "GET"}
+        self.assertEqual(
+            sample(after, "http_request_db_queries_sum", **labels) - sample(before, "http_request_db_queries_sum", **labels),
+            1,
+        )
+
+    async def async_get(self, path, authorization):
+        return await self.async_client.get(path, headers={"authorization": authorization})
+
+    def test_unmatched_paths_share_one_label(self):
+        self.client.get("/nowhere/")
+        self.assertGreaterEqual(sample(self.metrics(), "http_requests_total", view="unmatched", method="GET", status="404"), 1)
+
+    def test_metrics_are_local_only(self):
+        response = self.client.get("/metrics", REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 404)
+
+    def test_proxied_requests_are_judged_by_the_client_address(self):
+        # A local reverse proxy that NUM_PROXIES does not declare: REMOTE_ADDR is the proxy's.
+        response = self.client.get("/metrics", HTTP_X_FORWARDED_FOR="203.0.113.7")
+        self.assertEqual(response.status_code, 404)
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            self.assertEqual(self.client.get("/metrics", HTTP_X_FORWARDED_FOR="203.0.113.7").status_code, 404)
+            self.assertEqual(self.client.get("/metrics", HTTP_X_FORWARDED_FOR="127.0.0.1").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_replaces_the_address_check(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 404)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret", REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 200)
+
+
+class ProfilerTests(TestCase):
+    def test_keeps_only_the_slowest_profiles(self):
+        user = User.objects.create_user(username="profiled", password="pass", role="USER")
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(PROFILE_SLOWEST=2, PROFILE_SAMPLE_RATE=1.0, PROFILE_DIR=directory):
+                client = APIClient()
+                client.force_authenticate(user=user)
+                for _ in range(5):
+                    client.get("/api/tasks/")
+            dumps = sorted(Path(directory).glob("*.prof"))
+            self.assertEqual(len(dumps), 2)
+            self.assertTrue(all("task-list-create" in dump.name for dump in dumps))
@@ -0,0 +1,210 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from benchmarks.harness import percentile
+from task_management.throttling import BUCKET_KEY, LOCK_KEY, CacheBucketStore, MemoryBucketStore, parse_rate
+from tasks.models import Task
+from users.authentication import VALID_AFTER_KEY
+
+User = get_user_model()
+
+
+def throttle_rates(**rates):
+    """override_settings() for REST_FRAMEWORK with these DEFAULT_THROTTLE_RATES (others unthrottled)."""
+    rates = {"user": None, "anon": None, "login": None, "register": None, **rates}
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class BucketStoreTests(SimpleTestCase):
+    def stores(self):
+        clock = Clock()
+        yield MemoryBucketStore(clock=clock), clock
+        clock = Clock()
+        yield CacheBucketStore("default", clock=clock), clock
+
+    def test_burst_then_refill(self):
+        capacity, period = parse_rate("3/min")
+        self.assertEqual((capacity, period), (3, 60))
+        for store, clock in self.stores():
+            with self.subTest(store=type(store).__name__):
+                store.clear()
+                self.assertEqual([store.take("k", capacity, capacity / period)[0] for _ in range(4)],
+                                 [True, True, True, False])
+                allowed, wait = store.take("k", capacity, capacity / period)
+                self.assertFalse(allowed)
+                self.assertAlmostEqual(wait, 20)
+                self.assertTrue(store.take("other", capacity, capacity / period)[0])
+
+                clock.now += 20
+                self.assertTrue(store.take("k", capacity, capacity / period)[0])
+                self.assertFalse(store.take("k", capacity, capacity / period)[0])
+                clock.now += 3600
+                self.assertEqual([store.take("k", capacity, capacity / period)[0] for _ in range(4)],
+                                 [True, True, True, False])
+
+    def test_cache_store_without_the_lock_only_refuses_an_empty_bucket(self):
+        clock = Clock()
+        store = CacheBucketStore("default", clock=clock)
+        store.cache.add(LOCK_KEY.format("k"), 1, 60)  # Held by a worker that went away.
+        with mock.patch("time.sleep", side_effect=AssertionError("waited for the lock")):
+            self.assertEqual([store.take("k", 2, 1)[0] for _ in range(3)], [True, True, True])
+            store.cache.set(BUCKET_KEY.format("k"), (0.5, clock.now))
+            allowed, wait = store.take("k", 2, 1)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 0.5)
+
+    def test_cache_store_clear_leaves_other_keys(self):
+        store = CacheBucketStore("default", clock=Clock())
+        store.cache.set(VALID_AFTER_KEY.format(1), 1)
+        store.take("k", 1, 1)
+        self.assertFalse(store.take("k", 1, 1)[0])
+        store.clear()
+        self.assertTrue(store.take("k", 1, 1)[0])
+        self.assertEqual(store.cache.get(VALID_AFTER_KEY.format(1)), 1)
+
+    def test_memory_store_drops_refilled_buckets(self):
+        clock = Clock()
+        store = MemoryBucketStore(sweep_at=2, clock=clock)
+        for key in ("a", "b", "c"):
+            store.take(key, 1, 1)
+        # Nothing had refilled at the first sweep, so the next one waits for twice as many buckets.
+        self.assertEqual(store.sweep_at, 6)
+        clock.now += 10
+        for key in ("d", "e", "f", "g"):
+            store.take(key, 1, 1)
+        self.assertEqual(sorted(store._buckets), ["d", "e", "f", "g"])
+
+
+class ThrottleTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="throttled", password="pass", role="USER")
+
+    @throttle_rates(login="2/min")
+    def test_login_is_throttled_per_ip_with_retry_after(self):
+        client = APIClient()
+        for _ in range(2):
+            response = client.post("/api/auth/login/", {"username": "throttled", "password": "wrong"},
+                                   format="json", REMOTE_ADDR="10.0.0.1")
+            self.assertEqual(response.status_code, 401)
+        response = client.post("/api/auth/login/", {"username": "throttled", "password": "pass"},
+                               format="json", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "30")
+
+        response = client.post("/api/auth/login/", {"username": "throttled", "password": "pass"},
+                               format="json", REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(response.status_code, 200)
+
+    @throttle_rates(user="2/min")
+    def test_user_bucket_covers_sync_and_async_views(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        self.assertEqual(client.get("/api/tasks/").status_code, 200)
+        self.assertEqual(client.get("/api/tasks/stats/").status_code, 200)
+        response = client.get("/api/tasks/")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "30")
+
+        token = APIClient().post("/api/auth/login/", {"username": "throttled", "password": "pass"}, format="json")
+        async_client = APIClient()
+        async_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.data['access']}")
+        self.assertEqual(async_client.get("/api/async/tasks/").status_code, 429)
+
+        other = User.objects.create_user(username="unaffected", password="pass", role="USER")
+        client.force_authenticate(user=other)
+        self.assertEqual(client.get("/api/tasks/").status_code, 200)
+
+    @throttle_rates(login="2/min")
+    @override_settings(PASSWORD_HASHERS=["tests.test_throttling.FastPBKDF2PasswordHasher"])
+    def test_throttled_logins_never_reach_the_password_hasher(self):
+        # PBKDF2 verify() and the unknown-user dummy hash both go through encode().
+        encode = mock.patch.object(FastPBKDF2PasswordHasher, "encode", autospec=True,
+                                   side_effect=FastPBKDF2PasswordHasher.encode)
+        client = APIClient()
+        with encode as hashed:
+            statuses = [
+                client.post("/api/auth/login/", {"username": username, "password": "guess"},
+                            format="json", REMOTE_ADDR="203.0.113.9").status_code
+                for username in ["throttled", "nobody"] * 5
+            ]
+        self.assertEqual(statuses, [401, 401] + [429] * 8)
+        self.assertEqual(hashed.call_count, 2)
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    # Slow enough to dominate a request, fast enough for the suite.
+    iterations = 50000
+
+
+@override_settings(PASSWORD_HASHERS=["tests.test_throttling.FastPBKDF2PasswordHasher"])
+class LoginFloodTests(TransactionTestCase):
+    """
+    A small thread pool stands in for the server's workers. An attacker keeps
+    it busy with failed logins while a well-behaved user lists their tasks.
+    """
+
+    workers = 2
+    flood_per_request = 4
+    requests = 30
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="victim", password="pass", role="USER")
+        Task.objects.create(user=self.user, title="T", description="d", due_date="2030-01-01")
+
+    def login_attempt(self):
+        try:
+            return APIClient().post("/api/auth/login/", {"username": "victim", "password": "guess"},
+                                    format="json", REMOTE_ADDR="203.0.113.9").status_code
+        finally:
+            connections.close_all()
+
+    def list_tasks(self):
+        try:
+            client = APIClient()
+            client.force_authenticate(user=self.user)
+            return client.get("/api/tasks/", REMOTE_ADDR="198.51.100.7").status_code
+        finally:
+            connections.close_all()
+
+    def p99_under_flood(self):
+        """p99 latency (ms) of the user's requests, each queued behind `flood_per_request` login attempts."""
+        latencies, statuses = [], set()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # The flood is already under way when measuring starts.
+            for attempt in [pool.submit(self.login_attempt) for _ in range(self.workers * 2)]:
+                attempt.result()
+            for _ in range(self.requests):
+                flood = [pool.submit(self.login_attempt) for _ in range(self.flood_per_request)]
+                start = time.perf_counter()
+                self.assertEqual(pool.submit(self.list_tasks).result(), 200)
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses.update(attempt.result() for attempt in flood)
+        return percentile(latencies, 99), statuses
+
+    @pytest.mark.benchmark
+    def test_throttled_flood_keeps_well_behaved_latency(self):
+        with throttle_rates(login="2/min"):
+            protected, statuses = self.p99_under_flood()
+        self.assertEqual(statuses, {429})
+        with throttle_rates():
+            unprotected, statuses = self.p99_under_flood()
+        self.assertEqual(statuses, {401})
+        # Throttled attempts never reach the password hasher, so they barely delay anyone.
+        self.assertLess(protected * 3, unprotected, f"p99 {protected:.1f} ms protected, {unprotected:.1f} ms not")
@@ -88,7 +88,7 @@ class TaskManagementIntegrationTests(TestCase):
             f"/api/tasks/{other_user_task.id}/",
             {"title": "Hacked Task", "description": "Unauthorized update", "due_date": "2025-12-31"},
         )
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     # 🟢 DELETE TASK
     def test_task_deletion_by_owner(self):
@@ -111,7 +111,7 @@ class TaskManagementIntegrationTests(TestCase):
 
         self.authenticate_as_regular_user()
         response = self.client.delete(f"/api/tasks/{other_user_task.id}/")
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     # 🟢 ASSIGN TASKS (Only Admin)
     def test_admin_can_assign_task(self):
@@ -0,0 +1,109 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import Role
+
+User = get_user_model()
+
+VALID_AFTER_KEY = "users:valid-after:{}"
+INACTIVE = -1  # Cached for users that are deleted or inactive: none of their tokens are valid.
+
+
+def revocation_cache_timeout():
+    return getattr(settings, "TOKEN_REVOCATION_CACHE_SECONDS", 10)
+
+
+def remember_valid_after(user):
+    """Cache what `user` says about its tokens, so that the next check needs no query."""
+    value = user.tokens_valid_after if user.is_active else INACTIVE
+    cache.set(VALID_AFTER_KEY.format(user.pk), value, revocation_cache_timeout())
+
+
+def revoke_tokens(user_id, issued_before):
+    """
+    Reject every token of `user_id` issued before `issued_before` (a unix
+    timestamp; `iat` has one-second resolution, so tokens issued within that
+    same second stay valid). The cutoff is stored on the user row. Other
+    workers see it once their cached copy expires, after at most
+    TOKEN_REVOCATION_CACHE_SECONDS.
+    """
+    User.objects.filter(pk=user_id).update(tokens_valid_after=issued_before)
+    cache.delete(VALID_AFTER_KEY.format(user_id))
+
+
+def load_valid_after(user_id):
+    value = User.objects.filter(pk=user_id, is_active=True).values_list("tokens_valid_after", flat=True).first()
+    value = INACTIVE if value is None else value
+    cache.set(VALID_AFTER_KEY.format(user_id), value, revocation_cache_timeout())
+    return value
+
+
+def revoked(token, valid_after):
+    return valid_after == INACTIVE or token.get("iat", 0) < valid_after
+
+
+def is_revoked(token):
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    valid_after = cache.get(VALID_AFTER_KEY.format(user_id))
+    if valid_after is None:
+        valid_after = load_valid_after(user_id)
+    return revoked(token, valid_after)
+
+
+async def ais_revoked(token):
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    valid_after = await cache.aget(VALID_AFTER_KEY.format(user_id))
+    if valid_after is None:
+        valid_after = await sync_to_async(load_valid_after)(user_id)
+    return revoked(token, valid_after)
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Stateless user built from the access token claims (`user_id`, `username`,
+    `role`). Covers everything the task API needs from `request.user`.
+    """
+
+    def __str__(self):
+        return self.username or f"user {self.id}"
+
+    @cached_property
+    def role(self):
+        return self.token.get("role", Role.USER)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates from the token alone, without loading the user from the
+    database. Tokens of users who were deactivated, deleted or had their role
+    or password changed are rejected by `tokens_valid_after`, read through a
+    short-lived cache entry (TOKEN_REVOCATION_CACHE_SECONDS): at most one
+    query per user and period in each worker.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if is_revoked(validated_token):
+            raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+        return user
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views, with the revocation check on the async cache API."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        user = super().get_user(validated_token)
+        if await ais_revoked(validated_token):
+            raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+        return user, validated_token
@@ -0,0 +1,44 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+
+from tasks.filters import TaskFilterBackend
+from tasks.models import Task
+
+from .models import Role
+
+
+class UserFilterBackend(TaskFilterBackend):
+    """
+    Query parameters of the admin user list:
+
+    - `role=ADMIN,USER`
+    - `task_count=true` (adds the number of tasks each user owns)
+
+    Any other query parameter is rejected with a 400, as on the task list.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        self.check_unknown_params(params, view)
+
+        if "role" in params:
+            roles = [value.strip() for value in params["role"].split(",")]
+            invalid = [value for value in roles if value not in Role.values]
+            if invalid:
+                raise ValidationError({"role": [f"Invalid role: {', '.join(invalid)}."]})
+            queryset = queryset.filter(role__in=roles)
+
+        if self.parse_bool(params, "task_count"):
+            queryset = queryset.annotate(task_count=task_count())
+        return queryset
+
+
+def task_count():
+    """
+    The number of tasks a user owns, as a correlated subquery on the task
+    owner index. Unlike `Count("task")`, whose GROUP BY aggregates every user
+    before the page is cut, it only runs for the rows of the page.
+    """
+    tasks = Task.objects.filter(user_id=OuterRef("id")).order_by().values("user_id").annotate(n=Count("id"))
+    return Coalesce(Subquery(tasks.values("n"), output_field=IntegerField()), 0)
@@ -1,3 +1,4 @@
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
@@ -11,6 +12,24 @@ class CustomUser(AbstractUser):
         choices=Role.choices,
         default=Role.USER,
     )
+    # Unix time before which this user's tokens are rejected (see users/authentication.py).
+    tokens_valid_after = models.BigIntegerField(default=0)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Admin user list filtered by role, keyset-paginated on id.
+            models.Index(fields=["role", "id"], name="user_role_idx"),
+        ]
+
+    def check_password(self, raw_password):
+        def rehash(raw_password):
+            # Same password, new hasher or cost: one UPDATE, and no pre_save,
+            # which would revoke the user's tokens as for a password change.
+            self.set_password(raw_password)
+            self._password = None
+            type(self).objects.filter(pk=self.pk).update(password=self.password)
+
+        return check_password(raw_password, self.password, rehash)
 
     def __str__(self):
         return self.username
@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import is_revoked, remember_valid_after
 
 User = get_user_model()
 
@@ -14,9 +18,43 @@ class CustomUserSerializer(serializers.ModelSerializer):
         user = User.objects.create_user(**validated_data)
         return user
 
+class UserListSerializer(serializers.Serializer):
+    """Read-only rows of the admin user list, rendered from `.values()` dicts."""
+
+    id = serializers.IntegerField()
+    username = serializers.CharField()
+    email = serializers.CharField()
+    role = serializers.CharField()
+    # Only present when the queryset is annotated with it (`?task_count=true`).
+    task_count = serializers.IntegerField(required=False)
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
+        remember_valid_after(user)  # The user row is at hand: the first requests with the token need no query.
         token = super().get_token(user)
+        token["username"] = user.username
         token["role"] = user.role
         return token
+
+class StatelessTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    TokenRefreshSerializer without the user SELECT on every refresh. Refresh
+    tokens of users who were deactivated, deleted or had their role or
+    password changed are rejected by the same `tokens_valid_after` check as
+    access tokens, which reads the user row at most once per
+    TOKEN_REVOCATION_CACHE_SECONDS.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if is_revoked(refresh):
+            raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
@@ -0,0 +1,31 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import VALID_AFTER_KEY, revoke_tokens
+
+User = get_user_model()
+
+# Changes that must invalidate tokens already handed out.
+TOKEN_FIELDS = ("role", "is_active", "password")
+
+
+@receiver(pre_save, sender=User)
+def revoke_tokens_on_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_FIELDS):
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*TOKEN_FIELDS).first()
+    if previous and any(previous[name] != getattr(instance, name) for name in TOKEN_FIELDS):
+        instance.tokens_valid_after = int(time.time())  # A full save() writes it back as well.
+        revoke_tokens(instance.pk, instance.tokens_valid_after)
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    # No row, no valid tokens: the next check loads that instead of the cached cutoff.
+    cache.delete(VALID_AFTER_KEY.format(instance.pk))
@@ -1,8 +1,14 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from datetime import datetime, timedelta
+from unittest import mock, skipUnless
+import importlib.util
+import time
 from tasks.models import Task 
 
 User = get_user_model()
@@ -73,3 +79,180 @@ class UserTests(TestCase):
         self.assertEqual(response.data["message"], f"Task '{self.task.title}' assigned to user")
         self.task.refresh_from_db()
         self.assertEqual(self.task.user, self.regular_user)
+
+
+class StatelessAuthenticationTests(TestCase):
+
+    def setUp(self):
+        # Cached revocation cutoffs outlive the test transaction.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="tokenuser", password="tokenpass", role="USER")
+        response = self.client.post("/api/auth/login/", {"username": "tokenuser", "password": "tokenpass"}, format="json")
+        self.refresh = response.data["refresh"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def assertRevoked(self):
+        self.assertEqual(self.client.get("/api/tasks/").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get("/api/async/tasks/").status_code, status.HTTP_401_UNAUTHORIZED)
+        response = APIClient().post("/api/auth/token/refresh/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_outlives_the_cache(self):
+        with mock.patch("users.signals.time.time", return_value=time.time() + 5):
+            self.user.set_password("changed")
+            self.user.save()
+        cache.clear()  # Evicted, or never there: another worker's cache.
+        self.assertRevoked()
+
+    def test_revocation_by_another_worker_is_seen_once_the_cache_expires(self):
+        with self.settings(TOKEN_REVOCATION_CACHE_SECONDS=0.05):
+            cache.clear()
+            self.assertEqual(self.client.get("/api/tasks/").status_code, status.HTTP_200_OK)
+            # Another worker's revocation reaches the database, not this worker's cache.
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            self.assertEqual(self.client.get("/api/tasks/").status_code, status.HTTP_200_OK)
+            time.sleep(0.1)
+            self.assertRevoked()
+
+    def test_task_list_does_not_load_the_user(self):
+        Task.objects.create(user=self.user, title="Mine", description="d", due_date="2025-12-31")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/tasks/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in queries.captured_queries if User._meta.db_table in q["sql"]])
+        self.assertEqual(len(response.data), 1)
+
+    def test_role_comes_from_the_token(self):
+        response = self.client.get("/api/auth/admin-only/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deactivated_user_token_is_revoked(self):
+        with mock.patch("users.signals.time.time", return_value=time.time() + 5):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.get("/api/tasks/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_role_change_revokes_token(self):
+        with mock.patch("users.signals.time.time", return_value=time.time() + 5):
+            self.user.role = "ADMIN"
+            self.user.save()
+        response = self.client.get("/api/tasks/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrelated_change_keeps_token(self):
+        self.user.email = "token@example.com"
+        self.user.save()
+        response = self.client.get("/api/tasks/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class AdminUserListTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(username="admin", password="adminpass", role="ADMIN")
+        self.users = [
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com", password="x", role="USER")
+            for i in range(5)
+        ]
+        for i, user in enumerate(self.users):
+            Task.objects.bulk_create(
+                Task(user=user, title=f"Task {n}", description="d", due_date="2030-01-01") for n in range(i)
+            )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_projected_rows_without_secrets(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/auth/admin-only/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[1], {"id": self.users[0].id, "username": "user0",
+                                            "email": "user0@example.com", "role": "USER"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("password", queries.captured_queries[0]["sql"])
+
+    def test_pages_follow_the_link_header(self):
+        seen = []
+        url = "/api/auth/admin-only/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [row["id"] for row in response.data]
+            links = response.headers.get("Link", "")
+            url = next((link.split(";")[0].strip(" <>") for link in links.split(",") if 'rel="next"' in link), None)
+        self.assertEqual(seen, sorted(user.id for user in [self.admin_user, *self.users]))
+
+    def test_role_filter_and_task_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/auth/admin-only/?role=USER&task_count=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["task_count"] for row in response.data], [0, 1, 2, 3, 4])
+        self.assertEqual(len(queries), 1)
+
+        response = self.client.get("/api/auth/admin-only/?role=ADMIN")
+        self.assertEqual([row["username"] for row in response.data], ["admin"])
+
+    def test_invalid_parameters(self):
+        for query in ("role=OWNER", "task_count=maybe", "is_staff=true"):
+            response = self.client.get(f"/api/auth/admin-only/?{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class PasswordHashingTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="hashed", password="hashpass", role="USER")
+
+    def login(self):
+        response = self.client.post("/api/auth/login/", {"username": "hashed", "password": "hashpass"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_login_upgrades_the_cost_without_revoking_tokens(self):
+        access = self.login()["access"]
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+        # A password change a few seconds later would revoke `access`.
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000), \
+                mock.patch("users.signals.time.time", return_value=time.time() + 5):
+            self.login()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(self.client.get("/api/tasks/").status_code, status.HTTP_200_OK)
+
+    @skipUnless(importlib.util.find_spec("argon2"), "argon2-cffi is not installed")
+    def test_login_moves_the_hash_to_the_profile_hasher(self):
+        hashers = ["users.hashers.TunedArgon2PasswordHasher", "users.hashers.TunedPBKDF2PasswordHasher"]
+        with override_settings(PASSWORD_HASHERS=hashers, PASSWORD_ARGON2_MEMORY_COST=1024):
+            self.login()
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith("argon2$argon2id$v=19$m=1024,t=2,p=1$"))
+            self.login()
+
+    def test_refresh_does_not_read_the_user(self):
+        refresh = self.login()["refresh"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/auth/token/refresh/", {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 0)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get("/api/tasks/").status_code, status.HTTP_200_OK)
+
+    def test_refresh_is_revoked_with_the_user(self):
+        refresh = self.login()["refresh"]
+        with mock.patch("users.signals.time.time", return_value=time.time() + 5):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.post("/api/auth/token/refresh/", {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        other = User.objects.create_user(username="deleted", password="x", role="USER")
+        refresh = self.client.post("/api/auth/login/", {"username": "deleted", "password": "x"}, format="json").data["refresh"]
+        with mock.patch("users.signals.time.time", return_value=time.time() + 5):
+            other.delete()
+        response = self.client.post("/api/auth/token/refresh/", {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -5,7 +5,9 @@ from rest_framework import generics, permissions
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .serializers import CustomUserSerializer, CustomTokenObtainPairSerializer
+from tasks.pagination import KeysetPagination
+from .filters import UserFilterBackend
+from .serializers import CustomUserSerializer, CustomTokenObtainPairSerializer, UserListSerializer
 
 # Initialize logger
 logger = logging.getLogger("users")
@@ -16,37 +18,52 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = CustomUserSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "register"
 
     def create(self, request, *args, **kwargs):
         try:
             response = super().create(request, *args, **kwargs)
-            logger.info(f"New user registered: {request.data.get('username')}")
+            logger.info("New user registered: %s", request.data.get('username'))
             return response
         except Exception as e:
-            logger.error(f"Error during user registration: {e}")
+            logger.error("Error during user registration: %s", e)
             return Response({"error": f"User registration failed {e}"}, status=500)
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_scope = "login"  # checked before the password is hashed
 
     def post(self, request, *args, **kwargs):
         try:
             response = super().post(request, *args, **kwargs)
-            logger.info(f"User {request.data.get('username')} logged in successfully")
+            logger.info("User %s logged in successfully", request.data.get('username'))
             return response
         except Exception as e:
-            logger.error(f"Login error for user {request.data.get('username')}: {e}")
+            logger.error("Login error for user %s: %s", request.data.get('username'), e)
             return Response({"error": "Authentication failed"}, status=401)
 
+class UserCursorPagination(KeysetPagination):
+    ordering = ("id",)
+
 class AdminOnlyView(generics.ListAPIView):
-    queryset = User.objects.all()
-    serializer_class = CustomUserSerializer
+    """
+    Keyset-paginated list of users for ADMINs. Only the columns of
+    UserListSerializer are loaded, never the password hash or permission fields.
+    """
+    queryset = User.objects.order_by("id")
+    serializer_class = UserListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserCursorPagination
+    filter_backends = [UserFilterBackend]
+    filter_params = ("role", "task_count")
+
+    def get_queryset(self):
+        return super().get_queryset().values("id", "username", "email", "role")
 
     def get(self, request, *args, **kwargs):
         if request.user.role != "ADMIN":
-            logger.warning(f"Unauthorized access attempt to AdminOnlyView by {request.user.username}")
+            logger.warning("Unauthorized access attempt to AdminOnlyView by %s", request.user.username)
             return Response({"error": "Forbidden"}, status=403)
 
-        logger.info(f"Admin user {request.user.username} accessed AdminOnlyView")
+        logger.info("Admin user %s accessed AdminOnlyView", request.user.username)
         return super().get(request, *args, **kwargs)